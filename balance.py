@@ -0,0 +1,437 @@
+"""
+Auto-balancer: searches class, weapon and boss stats for target win rates.
+
+Every role gets a target win rate and a tolerance (55% +/-3% by default).
+The stats being tuned are searched with compass search, a derivative-free
+coordinate method suited to integer stats: each round tries every stat one
+step up and one step down, takes the steps that lower the error most, and
+halves the steps of stats that could not improve it.
+
+A candidate is scored by simulating `--battles` seeded battles per class x
+weapon combination. Each combination is scored on its own and cached by the
+stats that can affect it, so trying a new Mage HP only re-simulates the
+Mage's weapons, and the candidates of a round are simulated in parallel.
+Battle i of a combination always uses the same seed (common random numbers),
+so two candidates are compared on the same dice rolls and small stat
+changes are not drowned out by noise.
+
+    python balance.py --target 0.55 --tolerance 0.03 --tune class,boss
+    python balance.py --role-target Mage=0.5 --tune weapon --json table.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import starter
+
+TUNE_GROUPS = ("class", "weapon", "boss")
+CLASS_STATS = ("hp", "attack", "defense")
+BOSS_STATS = ("hp", "attack", "defense")
+
+
+class Parameter:
+    """One tunable integer stat with its search bounds and current step."""
+
+    __slots__ = ("name", "group", "start", "low", "high", "step")
+
+    def __init__(self, name, start, low=None, high=None):
+        self.name = name  # e.g. "Mage.hp", "Mage.2.attack_bonus", "boss.attack"
+        self.group = name.partition(".")[0]  # The role it belongs to, or "boss"
+        self.start = start
+        self.low = max(0, start // 2) if low is None else low
+        self.high = max(start * 2, 10) if high is None else high
+        self.step = max(1, start // 4)
+
+
+def parameters(roles, boss_kind, groups):
+    """The Parameters of the stat groups being tuned, in a fixed order."""
+    params = []
+    if "class" in groups:
+        for role in roles:
+            character_class = starter.character_class(role)
+            for stat in CLASS_STATS:
+                start = getattr(character_class, stat)
+                params.append(
+                    Parameter(f"{role}.{stat}", start, low=max(1, start // 2))
+                )
+    if "weapon" in groups:
+        for role in roles:
+            for key, weapon in starter.WEAPON_COLLECTIONS[role].items():
+                params.append(
+                    Parameter(f"{role}.{key}.attack_bonus", weapon.attack_bonus)
+                )
+    if "boss" in groups:
+        behavior = starter.boss_behavior(boss_kind)
+        for stat in BOSS_STATS:
+            start = getattr(behavior, stat)
+            params.append(Parameter(f"boss.{stat}", start, low=max(1, start // 2)))
+    return params
+
+
+# --- Scoring ---
+
+
+def combo_spec(values, role, weapon_key, boss_kind):
+    """
+    Everything that decides the battles of one combination under `values`
+    ({parameter name: value}): the cache key of its score, and what a worker
+    needs to rebuild the combatants.
+    """
+    character_class = starter.character_class(role)
+    weapon = starter.WEAPON_COLLECTIONS[role][weapon_key]
+    behavior = starter.boss_behavior(boss_kind)
+    return (
+        role,
+        tuple(
+            values.get(f"{role}.{stat}", getattr(character_class, stat))
+            for stat in CLASS_STATS
+        ),
+        weapon_key,
+        values.get(f"{role}.{weapon_key}.attack_bonus", weapon.attack_bonus),
+        boss_kind,
+        tuple(
+            values.get(f"boss.{stat}", getattr(behavior, stat)) for stat in BOSS_STATS
+        ),
+    )
+
+
+def run_combo(spec, policy, seed, battles):
+    """Wins of `battles` seeded battles of one combination. Executed in workers."""
+    role, class_stats, weapon_key, attack_bonus, boss_kind, boss_stats = spec
+    character_class = starter.character_class(role).variant(
+        role, **dict(zip(CLASS_STATS, class_stats))
+    )
+    base = starter.WEAPON_COLLECTIONS[role][weapon_key]
+    weapon = starter.Weapon(
+        base.name, attack_bonus, base.defense_bonus, base.crit_chance, base.effect
+    )
+    behavior = starter.boss_behavior(boss_kind).variant(
+        **dict(zip(BOSS_STATS, boss_stats))
+    )
+    wins = 0
+    for index in range(battles):
+        # The same seeds for every candidate: common random numbers
+        battle_seed = starter.derive_seed(seed, role, weapon_key, index)
+        result = starter.simulate_battle(
+            character_class, weapon, policy, battle_seed, boss=behavior
+        )
+        wins += result.winner == "player"
+    return wins
+
+
+class Balancer:
+    """Scores stat tables against the targets, simulating each combination once."""
+
+    def __init__(
+        self,
+        targets,
+        tolerance=0.03,
+        boss_kind="hydra",
+        policy="greedy",
+        battles=200,
+        seed=0,
+        per_weapon=False,
+        pool=None,
+    ):
+        self.targets = targets  # role -> target win rate
+        self.tolerance = tolerance
+        self.boss_kind = boss_kind
+        self.policy = policy
+        self.battles = battles
+        self.seed = seed
+        self.per_weapon = per_weapon  # Hold every weapon to its role's target
+        self.pool = pool  # Executor for the simulations, or None to run inline
+        self.combos = [
+            (role, weapon_key)
+            for role in targets
+            for weapon_key in starter.WEAPON_COLLECTIONS[role]
+        ]
+        self.wins = {}  # combo spec -> wins, the memo of every simulation run
+        self.lookups = 0
+        self.simulated = 0
+
+    def evaluate(self, candidates):
+        """
+        Simulates every combination the stat tables in `candidates` need that
+        has not been simulated yet, in parallel. Returns their win rates.
+        """
+        specs = [
+            [combo_spec(values, *combo, self.boss_kind) for combo in self.combos]
+            for values in candidates
+        ]
+        missing = list(
+            dict.fromkeys(s for row in specs for s in row if s not in self.wins)
+        )
+        self.lookups += sum(map(len, specs))
+        self.simulated += len(missing)
+        args = (self.policy, self.seed, self.battles)
+        if self.pool is None:
+            counts = [run_combo(spec, *args) for spec in missing]
+        else:
+            counts = self.pool.map(
+                run_combo, missing, *([arg] * len(missing) for arg in args)
+            )
+        self.wins.update(zip(missing, counts))
+        return [self.win_rates(row) for row in specs]
+
+    def win_rates(self, specs):
+        """{(role, weapon_key): win rate} of one candidate's combination specs."""
+        return {
+            combo: self.wins[spec] / self.battles
+            for combo, spec in zip(self.combos, specs)
+        }
+
+    def role_rates(self, rates):
+        """Mean win rate over each role's weapons."""
+        totals = {}
+        for (role, _), rate in rates.items():
+            totals.setdefault(role, []).append(rate)
+        return {role: sum(values) / len(values) for role, values in totals.items()}
+
+    def error(self, rates):
+        """
+        Sum of squared misses beyond the tolerance: zero when every role (or,
+        when tuning weapons, every weapon) is within its target band.
+        """
+        if self.per_weapon:
+            scored = [(role, rate) for (role, _), rate in rates.items()]
+        else:
+            scored = self.role_rates(rates).items()
+        total = 0.0
+        for role, rate in scored:
+            miss = abs(rate - self.targets[role]) - self.tolerance
+            total += max(0.0, miss) ** 2
+        return total
+
+
+# --- Search ---
+
+
+def compass_search(balancer, params, max_rounds=200, progress=None):
+    """
+    Tunes `params` to minimise balancer.error(). Returns (values, rates,
+    error, rounds) for the best stat table found.
+
+    A role's stats only change that role's battles, so each round keeps the
+    best step of every role and makes them all at once; a boss step changes
+    every battle and is only taken when it beats all of them together.
+    """
+    values = {param.name: param.start for param in params}
+    (rates,) = balancer.evaluate([values])
+    error = balancer.error(rates)
+    rounds = 0
+    while error > 0 and rounds < max_rounds:
+        rounds += 1
+        candidates = []
+        for param in params:
+            for direction in (1, -1):
+                value = values[param.name] + direction * param.step
+                if param.low <= value <= param.high:
+                    candidates.append((param, value))
+        scored = balancer.evaluate(
+            [{**values, param.name: value} for param, value in candidates]
+        )
+        best = {}  # group -> (error reduction, parameter, value)
+        for (param, value), candidate_rates in zip(candidates, scored):
+            gain = error - balancer.error(candidate_rates)
+            if gain > best.get(param.group, (0.0,))[0]:
+                best[param.group] = (gain, param, value)
+
+        improved = set(best)
+        boss = best.pop("boss", None)
+        if boss and boss[0] > sum(gain for gain, _, _ in best.values()):
+            best = {"boss": boss}
+        if not best and all(param.step == 1 for param in params):
+            break  # No single step improves: a local optimum
+        for param in params:
+            if param.group not in improved:
+                param.step = max(1, param.step // 2)
+        values = {**values, **{param.name: value for _, param, value in best.values()}}
+        (rates,) = balancer.evaluate([values])  # Already simulated: all cached
+        error = balancer.error(rates)
+        if progress:
+            progress(rounds, error)
+    return values, rates, error, rounds
+
+
+# --- Reporting ---
+
+
+def stat_table(values, roles, boss_kind):
+    """The proposed stats, shaped like the game's own definitions."""
+    table = {"classes": {}, "weapons": {}, "boss": {}}
+    for role in roles:
+        character_class = starter.character_class(role)
+        table["classes"][role] = {
+            stat: values.get(f"{role}.{stat}", getattr(character_class, stat))
+            for stat in CLASS_STATS
+        }
+        table["weapons"][role] = {
+            key: {
+                "name": weapon.name,
+                "attack_bonus": values.get(
+                    f"{role}.{key}.attack_bonus", weapon.attack_bonus
+                ),
+            }
+            for key, weapon in starter.WEAPON_COLLECTIONS[role].items()
+        }
+    behavior = starter.boss_behavior(boss_kind)
+    table["boss"] = {
+        "kind": boss_kind,
+        **{
+            stat: values.get(f"boss.{stat}", getattr(behavior, stat))
+            for stat in BOSS_STATS
+        },
+    }
+    return table
+
+
+def format_report(report):
+    lines = [f"{'Role':<12} {'Target':>7} {'Before':>7} {'After':>7}"]
+    for role, target in report["targets"].items():
+        before = report["role_win_rates"]["before"][role]
+        after = report["role_win_rates"]["after"][role]
+        lines.append(
+            f"{role:<12} {target * 100:>6.1f}% {before * 100:>6.1f}% {after * 100:>6.1f}%"
+        )
+    lines.append("")
+    changes = report["changes"]
+    if changes:
+        lines.append(f"{'Stat':<28} {'Before':>7} {'After':>7}")
+        for name, (before, after) in changes.items():
+            lines.append(f"{name:<28} {before:>7} {after:>7}")
+    else:
+        lines.append("No stat changes proposed")
+    lines.append("")
+    lines.append(
+        f"Error {report['error']['before']:.5f} -> {report['error']['after']:.5f} "
+        f"in {report['rounds']} rounds; {report['battles']} battles simulated, "
+        f"{report['cache_hits']} of {report['lookups']} combination scores "
+        f"from the cache, {report['seconds']:.1f} s"
+    )
+    return "\n".join(lines)
+
+
+def _role_target(text):
+    role, _, rate = text.partition("=")
+    if role not in starter.class_names() or not rate:
+        raise argparse.ArgumentTypeError(f"expected ROLE=RATE, got {text!r}")
+    return role, float(rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--target", type=float, default=0.55, help="win rate for every role"
+    )
+    parser.add_argument(
+        "--role-target",
+        type=_role_target,
+        action="append",
+        default=[],
+        metavar="ROLE=RATE",
+        help="win rate for one role, e.g. Mage=0.5 (repeatable)",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.03)
+    parser.add_argument(
+        "--roles", help="comma-separated roles to balance (default: all)"
+    )
+    parser.add_argument(
+        "--tune",
+        default="class",
+        help=f"comma-separated stat groups to search: {', '.join(TUNE_GROUPS)}",
+    )
+    parser.add_argument(
+        "--battles", type=int, default=200, help="battles per combination"
+    )
+    parser.add_argument("--boss", default="hydra", choices=starter.boss_kinds())
+    parser.add_argument("--policy", default="greedy", choices=starter.policy_names())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    groups = args.tune.split(",")
+    for group in groups:
+        if group not in TUNE_GROUPS:
+            parser.error(f"unknown stat group {group!r}")
+    roles = args.roles.split(",") if args.roles else starter.class_names()
+    for role in roles:
+        if role not in starter.class_names():
+            parser.error(f"unknown role {role!r}")
+    targets = {role: args.target for role in roles}
+    targets.update((role, rate) for role, rate in args.role_target if role in targets)
+
+    on_tty = sys.stderr.isatty()
+
+    def progress(rounds, error):
+        if on_tty:  # One status line, rewritten in place
+            line = f"\r\033[Kround {rounds}: error {error:.5f}"
+            print(line, end="", file=sys.stderr, flush=True)
+        else:  # Logs and pipes get a line per round
+            print(f"round {rounds}: error {error:.5f}", file=sys.stderr)
+
+    began = time.perf_counter()
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        balancer = Balancer(
+            targets,
+            args.tolerance,
+            args.boss,
+            args.policy,
+            args.battles,
+            args.seed,
+            per_weapon="weapon" in groups,
+            pool=pool if workers > 1 else None,
+        )
+        params = parameters(roles, args.boss, groups)
+        (before,) = balancer.evaluate([{}])
+        values, after, error, rounds = compass_search(
+            balancer, params, args.max_rounds, progress
+        )
+    if on_tty:
+        print(file=sys.stderr)
+
+    starts = {param.name: param.start for param in params}
+    report = {
+        "targets": targets,
+        "tolerance": args.tolerance,
+        "boss": args.boss,
+        "policy": args.policy,
+        "battles_per_combination": args.battles,
+        "seed": args.seed,
+        "role_win_rates": {
+            "before": balancer.role_rates(before),
+            "after": balancer.role_rates(after),
+        },
+        "win_rates": {
+            f"{role}/{key}": {"before": before[role, key], "after": after[role, key]}
+            for role, key in balancer.combos
+        },
+        "error": {"before": balancer.error(before), "after": error},
+        "changes": {
+            name: (starts[name], value)
+            for name, value in values.items()
+            if value != starts[name]
+        },
+        "stats": stat_table(values, roles, args.boss),
+        "rounds": rounds,
+        "battles": balancer.simulated * args.battles,
+        "lookups": balancer.lookups,
+        "cache_hits": balancer.lookups - balancer.simulated,
+        "seconds": time.perf_counter() - began,
+    }
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Vectorized batch engine that steps thousands of battles in lockstep.
+
+Battle state is kept as a struct of NumPy arrays (one slot per battle) and
+each turn is a handful of array operations over the battles that are still
+running. It models the Hydra (its enrage phase and decision table come from
+starter.BOSS_DEFINITIONS) and the "attack" policy from `starter.POLICIES`:
+every turn the player makes a basic attack, so the only randomness is crit
+rolls, weapon procs and the boss's weighted ability choice.
+
+Those are the only policy and boss it models. Greedy and expectimax choose
+abilities from per-class tables whose effects (mana, cooldowns, status
+effects with their own rules) do not reduce to a few array operations, and
+the other bosses have tables and phases of their own, so their win rates
+come from the scalar engine (simulation.py, balance.py) instead. --check
+covers every class and weapon against the Hydra.
+
+NumPy is optional; the rest of the game does not need it.
+
+    python batch_engine.py --check
+"""
+
+import argparse
+import math
+import sys
+
+import starter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Weapon effect key -> proc chance
+WEAPON_PROCS = {
+    "vampiric": 0.30,
+    "burning": 0.25,
+    "frost": 0.30,
+    "poison": 0.35,
+    "stunning": 0.15,
+    "blessed": 0.20,
+}
+
+BOSS_CRIT_CHANCE = 0.10  # The boss has no weapon, so only the base crit applies
+
+POLICY = "attack"  # The only policy and boss the batch engine models
+BOSS = "hydra"
+
+WINNER_BOSS = 0
+WINNER_PLAYER = 1
+WINNER_NONE = -1
+
+
+class BatchResult:
+    """Per-battle outcomes of a batch run, as NumPy arrays."""
+
+    def __init__(self, role, weapon_key, winners, turns, player_hp):
+        self.role = role
+        self.weapon_key = weapon_key
+        self.winners = winners  # WINNER_PLAYER, WINNER_BOSS or WINNER_NONE
+        self.turns = turns
+        self.player_hp = player_hp  # Remaining player HP at the end
+
+    @property
+    def battles(self):
+        return len(self.winners)
+
+    @property
+    def win_rate(self):
+        return float(np.mean(self.winners == WINNER_PLAYER)) if self.battles else 0.0
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch engine requires NumPy (pip install numpy).")
+
+
+def _boss_ability_table(boss):
+    """The Hydra's compiled decision table: ability names and cumulative weights."""
+    indices, cumulative = boss.behavior.phases[boss.phase].table
+    names = [boss.behavior.abilities[index].__name__ for index in indices]
+    return names, np.array(cumulative)
+
+
+def simulate_batch(role, weapon_key, battles, seed=None, max_turns=500):
+    """
+    Runs `battles` attack-policy battles against the Hydra in lockstep and
+    returns a BatchResult.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+
+    player = starter.create_player(role, weapon_key=weapon_key)
+    boss = starter.create_boss(kind=BOSS)
+    proc_kind = player.weapon.effect
+    proc_chance = WEAPON_PROCS.get(proc_kind, 0.0)
+    crit_chance = player.get_total_crit_chance()
+    hit = player.attack
+    crit_hit = int(player.attack * 1.5)
+    player_defense = player.base_defense + player.weapon.defense_bonus  # Unclamped
+    enrage = boss.behavior.phases[1]  # The Hydra's only other phase
+    enrage_below = boss.max_hp * enrage.below
+    ability_names, cumulative = _boss_ability_table(boss)
+    stomp = ability_names.index("_stomp")
+    dark_breath = ability_names.index("_dark_breath")
+    roar = ability_names.index("_frightening_roar")
+
+    # Struct-of-arrays battle state
+    player_hp = np.full(battles, player.hp, dtype=np.int32)
+    boss_hp = np.full(battles, boss.hp, dtype=np.int32)
+    boss_attack = np.full(battles, boss.attack, dtype=np.int32)
+    enraged = np.zeros(battles, dtype=bool)
+    poison = np.zeros(battles, dtype=np.int8)
+    burning = np.zeros(battles, dtype=np.int8)
+    stunned = np.zeros(battles, dtype=np.int8)
+    frozen = np.zeros(battles, dtype=np.int8)
+    chill = np.zeros(battles, dtype=np.int32)  # Attack removed by the frost
+    roared = np.zeros(battles, dtype=np.int8)  # Turns left on the roar's -2 defense
+    winners = np.full(battles, WINNER_NONE, dtype=np.int8)
+    turns = np.full(battles, max_turns, dtype=np.int32)
+
+    active = np.arange(battles)
+    for turn in range(1, max_turns + 1):
+        if active.size == 0:
+            break
+        count = active.size
+
+        # --- Player turn: modifiers tick, then a basic attack ---
+        roared[active] = np.maximum(roared[active] - 1, 0)
+        defense = np.full(count, player_defense, dtype=np.int32)
+        defense -= 2 * (roared[active] > 0)
+        damage = np.where(rng.random(count) < crit_chance, crit_hit, hit)
+        if proc_kind:
+            procs = rng.random(count) < proc_chance
+            if proc_kind == "vampiric":
+                healed = active[procs]
+                player_hp[healed] = np.minimum(player.max_hp, player_hp[healed] + 3)
+            elif proc_kind == "burning":
+                lit = active[procs & (burning[active] == 0)]
+                burning[lit] = 3
+            elif proc_kind == "frost":
+                chilled = active[procs & (frozen[active] == 0)]
+                chill[chilled] = boss_attack[chilled] - np.maximum(
+                    1, boss_attack[chilled] - 2
+                )
+                boss_attack[chilled] -= chill[chilled]
+                frozen[chilled] = 3
+            elif proc_kind == "poison":
+                poisoned = active[procs & (poison[active] == 0)]
+                poison[poisoned] = 2
+            elif proc_kind == "stunning":
+                stunned[active[procs]] = 1
+            elif proc_kind == "blessed":
+                defense[procs] += 2
+        boss_hp[active] = np.maximum(
+            0, boss_hp[active] - np.maximum(0, damage - boss.defense)
+        )
+
+        alive = boss_hp[active] > 0
+        winners[active[~alive]] = WINNER_PLAYER
+        turns[active[~alive]] = turn
+        active, defense = active[alive], defense[alive]
+
+        # --- Boss turn: status effects ---
+        ticking = active[poison[active] > 0]
+        boss_hp[ticking] = np.maximum(0, boss_hp[ticking] - 5)
+        poison[ticking] -= 1
+        ticking = active[burning[active] > 0]
+        boss_hp[ticking] = np.maximum(0, boss_hp[ticking] - 4)
+        burning[ticking] -= 1
+        skipping = stunned[active] > 0
+        stunned[active[skipping]] -= 1
+        # A stun ends the tick before effects registered after it
+        thawing = active[~skipping & (frozen[active] > 0)]
+        frozen[thawing] -= 1
+        thawed = thawing[frozen[thawing] == 0]
+        boss_attack[thawed] += chill[thawed]
+
+        alive = boss_hp[active] > 0
+        winners[active[~alive]] = WINNER_PLAYER
+        turns[active[~alive]] = turn
+        active, defense, skipping = active[alive], defense[alive], skipping[alive]
+
+        # --- Boss turn: action ---
+        acting, defense = active[~skipping], defense[~skipping]
+        enraging = acting[(boss_hp[acting] < enrage_below) & ~enraged[acting]]
+        enraged[enraging] = True
+        boss_attack[enraging] += enrage.attack_bonus
+
+        count = acting.size
+        choice = np.searchsorted(
+            cumulative, rng.random(count) * cumulative[-1], side="right"
+        )
+        damage = boss_attack[acting].copy()
+        damage += np.where(
+            choice == stomp,
+            rng.integers(-3, 6, count),
+            rng.integers(5, 11, count),
+        )
+        crits = rng.random(count) < BOSS_CRIT_CHANCE
+        damage[crits] = (damage[crits] * 1.5).astype(np.int32)
+        attacks = (choice == stomp) | (choice == dark_breath)
+        defense = np.maximum(0, defense)
+        taken = np.where(attacks, np.maximum(0, damage - defense), 0)
+        player_hp[acting] = np.maximum(0, player_hp[acting] - taken)
+        # Frightening Roar lowers defense until the start of the player's
+        # second turn from now, so it weakens them against the next attack
+        roared[acting[choice == roar]] = 2
+
+        dead = acting[player_hp[acting] <= 0]
+        winners[dead] = WINNER_BOSS
+        turns[dead] = turn
+        active = active[player_hp[active] > 0]
+
+    return BatchResult(role, weapon_key, winners, turns, player_hp)
+
+
+def check_against_scalar(role, weapon_key, battles=2000, seed=0):
+    """
+    Compares the batch engine's win rate with the scalar engine's for one
+    combination. Returns (scalar_rate, batch_rate, z) where z is the
+    two-proportion z-score of the difference.
+    """
+    scalar_wins = sum(
+        starter.simulate_battle(role, weapon_key, POLICY, seed + i, boss=BOSS).winner
+        == "player"
+        for i in range(battles)
+    )
+    scalar_rate = scalar_wins / battles
+    batch_rate = simulate_batch(role, weapon_key, battles, seed).win_rate
+
+    pooled = (scalar_rate + batch_rate) / 2
+    spread = math.sqrt(2 * pooled * (1 - pooled) / battles)
+    z = (batch_rate - scalar_rate) / spread if spread else 0.0
+    return scalar_rate, batch_rate, z
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        epilog=f"Models only the {POLICY!r} policy against the {BOSS!r} boss; "
+        "use simulation.py for other policies and bosses.",
+    )
+    parser.add_argument("--battles", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="compare win rates with the scalar engine for every class and weapon "
+        f"({POLICY} policy, {BOSS} boss)",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=4.0, help="max |z| accepted by --check"
+    )
+    args = parser.parse_args(argv)
+    _require_numpy()
+
+    failures = 0
+    for role in starter.class_names():
+        for weapon_key, weapon in starter.WEAPON_COLLECTIONS[role].items():
+            if args.check:
+                scalar_rate, batch_rate, z = check_against_scalar(
+                    role, weapon_key, args.battles, args.seed
+                )
+                ok = abs(z) <= args.tolerance
+                failures += not ok
+                print(
+                    f"{role:<12} {weapon.name:<22} scalar {scalar_rate:6.1%}  "
+                    f"batch {batch_rate:6.1%}  z={z:+.2f} {'ok' if ok else 'MISMATCH'}"
+                )
+            else:
+                result = simulate_batch(role, weapon_key, args.battles, args.seed)
+                print(f"{role:<12} {weapon.name:<22} {result.win_rate:6.1%}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
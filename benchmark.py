@@ -0,0 +1,412 @@
+"""
+Benchmark suite for the game engine, renderer and startup.
+
+Every benchmark runs a fixed, seeded workload and reports a rate (higher is
+better) or a time (lower is better). Each is timed several times and the
+best run is kept, which filters out most scheduling noise. Results can be
+saved as JSON and compared against a stored baseline:
+
+    python benchmark.py --json baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+    python benchmark.py --import-budget   # startup time and engine imports
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+
+import starter
+
+BENCHMARKS = {}  # name -> Benchmark
+
+# Emoji, wide and combining characters, the way the game's UI strings mix them
+EMOJI_TEXT = (
+    "🐉 The Hydra ⚔️ strikes! 💥 Critical hit for 23 damage 🩸 — "
+    "勇者 shrugs it off, café 🧪🧪 potions left ✨ "
+) * 4
+
+
+class Benchmark:
+    """A registered benchmark: setup() builds the workload, which run() times."""
+
+    def __init__(self, name, unit, setup, higher_is_better):
+        self.name = name
+        self.unit = unit
+        self.setup = setup  # () -> (callable, operations per call)
+        self.higher_is_better = higher_is_better
+
+
+def benchmark(name, unit, higher_is_better=True):
+    """Registers a workload factory returning (callable, operations per call)."""
+
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, unit, setup, higher_is_better)
+        return setup
+
+    return register
+
+
+def measure(workload, operations, repeat=5, min_time=0.2):
+    """
+    Best rate in operations per second over `repeat` timed runs. Each run
+    calls `workload` enough times to take at least `min_time` seconds.
+    """
+    calls = 1
+    while True:  # Calibrate, like timeit's autorange
+        began = time.perf_counter()
+        for _ in range(calls):
+            workload()
+        elapsed = time.perf_counter() - began
+        if elapsed >= min_time:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed * 1.2))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        began = time.perf_counter()
+        for _ in range(calls):
+            workload()
+        best = min(best, time.perf_counter() - began)
+    return calls * operations / best
+
+
+# --- Engine ---
+
+
+def _battles(role):
+    weapon_key = next(iter(starter.WEAPON_COLLECTIONS[role]))
+
+    def run():
+        for seed in range(20):
+            starter.simulate_battle(role, weapon_key, "greedy", seed)
+
+    return run, 20
+
+
+for _role in starter.class_names():
+    benchmark(f"battles.{_role}", "battles/s")(lambda role=_role: _battles(role))
+
+
+def _encounters(kind):
+    def run():
+        for seed in range(5):
+            starter.simulate_encounter("Warrior", "1", kind, "greedy", seed)
+
+    return run, 5
+
+
+for _kind in starter.encounter_kinds():
+    benchmark(f"encounters.{_kind}", "encounters/s")(
+        lambda kind=_kind: _encounters(kind)
+    )
+
+
+@benchmark("timeline", "actions/s")
+def _timeline():
+    """Scheduling alone, for 1,000 combatants at mixed speeds."""
+    rng = starter.BattleRandom(0)
+    actors = []
+    for index in range(1000):
+        actor = starter.Character(f"Rat {index}", 8, 4, 0, rng, rng.randint(50, 200))
+        actors.append(actor)
+
+    def run():
+        timeline = starter.Timeline(actors)
+        for _ in range(10000):
+            timeline.done(timeline.pop())
+
+    return run, 10000
+
+
+@benchmark("take_damage", "calls/s")
+def _take_damage():
+    rng = starter.BattleRandom(0)
+    player = starter.create_player("Rogue", weapon_key="1", rng=rng)
+    boss = starter.create_boss(rng)
+
+    def run():
+        with starter.headless():
+            for _ in range(1000):
+                boss.hp = boss.max_hp
+                boss.take_damage(20, player.name, player)
+
+    return run, 1000
+
+
+@benchmark("process_status_effects", "calls/s")
+def _process_status_effects():
+    boss = starter.create_boss(starter.BattleRandom(0))
+    for name in ("poison", "burning", "frozen", "cursed"):
+        starter.apply_status(boss, name, 10**9)
+
+    def run():
+        with starter.headless():
+            for _ in range(1000):
+                boss.hp = boss.max_hp
+                starter.process_status_effects(boss)
+
+    return run, 1000
+
+
+# --- Rendering ---
+
+
+def _render(draw):
+    """Times `draw` writing to an in-memory screen with instant narration."""
+    stream = io.StringIO()
+    screen = starter.Screen(stream)
+    narrator = starter.Narrator("instant", skip_key=None)
+
+    def run():
+        with starter.output_to(screen, narrator):
+            for _ in range(100):
+                draw()
+        stream.seek(0)
+        stream.truncate()
+
+    return run, 100
+
+
+@benchmark("print_box", "frames/s")
+def _print_box():
+    lines = [f"⚔️ Line {index}: {EMOJI_TEXT[:40]}" for index in range(8)]
+    return _render(lambda: starter.print_box("🐉 Battle Status 🐉", lines))
+
+
+@benchmark("display_status", "frames/s")
+def _display_status():
+    player = starter.create_player("Paladin", weapon_key="1")
+    boss = starter.create_boss()
+    starter.apply_status(boss, "poison", 3)
+
+    def draw():
+        player.display_status()
+        boss.display_status()
+
+    return _render(draw)
+
+
+# --- Text ---
+
+
+def _text_pool(count=5000):
+    """
+    Distinct shuffles of EMOJI_TEXT's words. There are more of them than
+    get_display_width() caches, so cycling through them measures the width
+    computation rather than cache hits.
+    """
+    rng = random.Random(0)
+    words = EMOJI_TEXT.split()
+    pool = []
+    for index in range(count):
+        rng.shuffle(words)
+        pool.append(f"{index} " + " ".join(words))
+    return pool
+
+
+def _text_workload(function):
+    pool = _text_pool()
+
+    def run():
+        for text in pool:
+            function(text)
+
+    return run, sum(map(len, pool))
+
+
+@benchmark("get_display_width", "chars/s")
+def _display_width():
+    return _text_workload(starter.get_display_width)
+
+
+@benchmark("wrap_text", "chars/s")
+def _wrap_text():
+    return _text_workload(lambda text: starter.wrap_text(text, 40))
+
+
+# --- Startup ---
+
+IMPORT_TIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", re.M)
+
+# Most milliseconds a cold import may take, from cached bytecode
+IMPORT_BUDGETS = {"starter": 5, "evil_wizard.engine": 40}
+# Modules that importing the engine alone must not load: battles run without
+# the catalogs being built up front, and without any terminal code
+ENGINE_FORBIDDEN = (
+    "evil_wizard.cli",
+    "evil_wizard.content",
+    "evil_wizard.rendering",
+    "msvcrt",
+    "re",
+    "select",
+    "shutil",
+    "unicodedata",
+)
+
+
+def _python(*args):
+    """Runs a fresh interpreter that may write bytecode, returning its stderr."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, env=env
+    ).stderr
+
+
+def import_time(module):
+    """Milliseconds a fresh interpreter takes to import `module` (-X importtime)."""
+    output = _python("-X", "importtime", "-c", f"import {module}")
+    for microseconds, name in IMPORT_TIME.findall(output):
+        if name == module:
+            return int(microseconds) / 1000
+    raise ValueError(f"{module} was not imported")
+
+
+def new_modules(module):
+    """Names of the modules importing `module` loads into a fresh interpreter."""
+    return _python(
+        "-c",
+        "import sys; before = set(sys.modules); "
+        f"import {module}; "
+        "print(*sorted(set(sys.modules) - before), file=sys.stderr)",
+    ).split()
+
+
+def check_import_budget(repeat=5):
+    """
+    Problems with startup as a list of strings: imports over their budget
+    (best of `repeat` runs) and forbidden modules loaded by the engine.
+    """
+    _python("-c", "import evil_wizard.cli")  # Write the bytecode first
+    problems = []
+    for module, budget in IMPORT_BUDGETS.items():
+        best = min(import_time(module) for _ in range(repeat))
+        if best > budget:
+            problems.append(f"import {module}: {best:.1f} ms > {budget} ms")
+    loaded = set(new_modules("evil_wizard.engine"))
+    for module in ENGINE_FORBIDDEN:
+        if module in loaded:
+            problems.append(f"import evil_wizard.engine loads {module}")
+    return problems
+
+
+def _import(module):
+    _python("-c", f"import {module}")
+
+    def run():
+        return import_time(module)
+
+    return run, None
+
+
+for _module in IMPORT_BUDGETS:
+    benchmark(f"import.{_module}", "ms", higher_is_better=False)(
+        lambda module=_module: _import(module)
+    )
+
+
+def run_benchmark(bench, repeat=5, min_time=0.2):
+    workload, operations = bench.setup()
+    if operations is None:  # The workload reports its own measurement
+        return min(workload() for _ in range(repeat))
+    return measure(workload, operations, repeat, min_time)
+
+
+def run_suite(pattern="*", repeat=5, min_time=0.2):
+    """Runs the benchmarks matching `pattern` and returns a results dict."""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if fnmatch.fnmatch(name, pattern):
+            results[name] = {
+                "value": run_benchmark(bench, repeat, min_time),
+                "unit": bench.unit,
+                "higher_is_better": bench.higher_is_better,
+            }
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(run, baseline, threshold=0.10):
+    """
+    Changes from `baseline` to `run` as (name, change, regressed) tuples,
+    where change is the relative difference in the "better" direction
+    (negative means slower) and regressed is True past `threshold`.
+    """
+    changes = []
+    for name, result in run["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before["value"]:
+            continue
+        change = result["value"] / before["value"] - 1
+        if not result["higher_is_better"]:
+            change = before["value"] / result["value"] - 1
+        changes.append((name, change, change < -threshold))
+    return changes
+
+
+def format_results(run, changes=None):
+    changes = {name: (change, regressed) for name, change, regressed in changes or ()}
+    lines = []
+    for name, result in run["results"].items():
+        line = f"{name:<28} {result['value']:>14,.1f} {result['unit']:<10}"
+        if name in changes:
+            change, regressed = changes[name]
+            line += f" {change:+7.1%}" + ("  SLOWER" if regressed else "")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--only", default="*", metavar="PATTERN", help="e.g. 'battles.*'"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="seconds per timed run"
+    )
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="baseline results JSON")
+    parser.add_argument(
+        "--import-budget",
+        action="store_true",
+        help="only check import times and the engine's imports against budget",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="slowdown flagged by --compare (default: 0.10 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_budget:
+        problems = check_import_budget(args.repeat)
+        print("\n".join(problems) or "Imports are within budget")
+        return 1 if problems else 0
+
+    run = run_suite(args.only, args.repeat, args.min_time)
+    changes = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            changes = compare(run, json.load(handle), args.threshold)
+    print(format_results(run, changes))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(run, handle, indent=2)
+    return 1 if changes and any(regressed for _, _, regressed in changes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Search-based player for automated playtesting.
+
+ExpectimaxPolicy looks a few half-turns ahead: it maximises over the
+player's actions (attack, defend, each affordable ability, potion) and
+averages over every random outcome of the player's action and of
+Boss.choose_action, using the real game code run under solver's
+EnumeratingRandom. Positions found during a search go into a transposition
+table keyed on the compact battle state, so later moves of the same battle
+mostly hit the table. Iterative deepening stops at a per-move time budget.
+
+Importing this module registers the "expectimax" policy:
+
+    python simulation.py --policy expectimax --battles 200
+    python starter.py --autopilot expectimax
+    python bot.py --battles 20
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+import starter
+from solver import BOSS_PHASE, LOSS, PLAYER_PHASE, WIN, BattleSolver, check_alternation
+
+# Phase tag for a player whose status effects have ticked and who is about to act
+DECISION = 2
+
+POTION_VALUE = 40  # HP restored by use_potion()
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class SearchModel(BattleSolver):
+    """
+    The battle of one role/weapon, split into the steps the search branches on.
+    `role`, `weapon_key` and `boss` may also be a CharacterClass, Weapon and
+    BossBehavior, as taken from live combatants.
+    """
+
+    def __init__(self, role, weapon_key, boss="hydra"):
+        super().__init__(role, weapon_key, policy="attack", boss=boss)
+        self._player_hp = self._player_fields.index("hp")
+        self._mana = self._player_fields.index("mana")
+        self._potions = self._player_fields.index("potions")
+        self._boss_hp = self._boss_fields.index("hp")
+        self.table = {}  # Transposition table: state key -> (searched depth, value)
+        self.outcome_cache = {}  # (state key[, action]) -> outcomes
+        self.deadline = None  # perf_counter() time at which a search gives up
+
+    def check_time(self):
+        """Raises _OutOfTime once the deadline has passed."""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _OutOfTime
+
+    def live_key(self, player, boss):
+        """
+        State key of a live battle, taken when the player is about to act.
+        Raises ValueError if a combatant's speed breaks strict alternation.
+        """
+        check_alternation(player, boss)
+        return (
+            DECISION,
+            self._snapshot(player, self._get_player),
+            self._snapshot(boss, self._get_boss),
+        )
+
+    def actions(self, key):
+        """(action, ability_key) pairs available in a DECISION state."""
+        player_state = key[1]
+        actions = [("1", None), ("2", None)]
+        actions.extend(
+            ("3", ability_key)
+            for ability_key, ability in self.player.abilities.items()
+            if ability.cost <= player_state[self._mana]
+        )
+        if player_state[self._potions] > 0:
+            actions.append(("4", None))
+        return actions
+
+    def evaluate(self, node):
+        """Heuristic chance of winning from a state, between 0 and 1."""
+        if node == WIN:
+            return 1.0
+        if node == LOSS:
+            return 0.0
+        _, player_state, boss_state = node
+        player = (
+            player_state[self._player_hp] + POTION_VALUE * player_state[self._potions]
+        ) / self.player.max_hp
+        boss = boss_state[self._boss_hp] / self.boss.max_hp
+        return player / (player + boss)
+
+    # Each step runs once per random path, so a long enumeration is cut short
+    # as soon as the deadline passes rather than when it finishes
+
+    def _tick(self):
+        self.check_time()
+        player = self.player
+        stunned = starter.process_status_effects(player)
+        if not player.is_alive():
+            return LOSS
+        if stunned:
+            return self._key(BOSS_PHASE)
+        return self._key(DECISION)
+
+    def _act(self, action, ability_key):
+        self.check_time()
+        player, boss = self.player, self.boss
+        if not starter.perform_action(player, boss, action, ability_key):
+            starter.player_attack(player, boss)
+        if not boss.is_alive():
+            return WIN
+        return self._key(BOSS_PHASE)
+
+    def tick_outcomes(self, key):
+        return tuple(self.enumerate(key, self._tick).items())
+
+    def action_outcomes(self, key, action):
+        return tuple(self.enumerate(key, self._act, *action).items())
+
+    def _boss_turn(self):
+        self.check_time()
+        return self._boss_phase()
+
+    def boss_outcomes(self, key):
+        return tuple(
+            (node, probability)
+            for (node, _), probability in self.enumerate(key, self._boss_turn).items()
+        )
+
+
+class ExpectimaxPolicy:
+    """
+    A policy `(player, boss) -> (action, ability_key)` that searches up to
+    `depth` half-turns ahead within `budget` seconds per move.
+
+    The deepest search that finishes within the budget decides the move, so
+    on a slow machine the bot may play a shallower (and different) game. The
+    deadline is checked on every random path a search plays out, and if not
+    even one half-turn was searched in time, `fallback` picks the move.
+    Pass budget=None for fully reproducible, depth-limited play.
+
+    The search assumes the player and boss strictly alternate. While a
+    combatant is faster or slower than DEFAULT_SPEED (or hasted or slowed),
+    moves are picked by `fallback` instead.
+    """
+
+    def __init__(self, depth=3, budget=0.006, table_size=100_000, fallback="greedy"):
+        self.depth = depth
+        self.budget = budget
+        self.table_size = table_size
+        self.fallback = starter.get_policy(fallback)
+        self._models = {}  # (class, weapon, boss behavior) -> SearchModel
+
+    def __call__(self, player, boss):
+        # Garbage collection waits until the move is over. It is paused before
+        # anything else is allocated: even entering a context manager can set
+        # off a collection the game's own allocations have made due.
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with starter.headless():
+                return self._move(player, boss)
+        finally:
+            if was_enabled:
+                gc.enable()
+
+    def _move(self, player, boss):
+        try:
+            model = self._model(player, boss)
+            root = model.live_key(player, boss)
+        except ValueError:  # The turn order is not one the search can model
+            return self.fallback(player, boss)
+        if len(model.table) > self.table_size:
+            model.table.clear()
+        if len(model.outcome_cache) > self.table_size:
+            model.outcome_cache.clear()
+
+        best = None
+        model.deadline = (
+            time.perf_counter() + self.budget if self.budget is not None else None
+        )
+        for depth in range(1, self.depth + 1):
+            try:
+                best = self._best_action(model, root, depth)[0]
+            except _OutOfTime:
+                break
+            except ValueError:  # The search reached a change of speed
+                best = None
+                break
+        model.deadline = None
+        # Out of time before even one ply was searched: play the fallback's move
+        return best if best is not None else self.fallback(player, boss)
+
+    def _model(self, player, boss):
+        # Keyed on the live definitions, so balance variants and encounter
+        # minions (which have no registry entry of their own) get a model too
+        key = (player.character_class, player.weapon, boss.behavior)
+        model = self._models.get(key)
+        if model is None:
+            model = self._models[key] = SearchModel(*key)
+        return model
+
+    def _cached(self, model, key, compute, *args):
+        found = model.outcome_cache.get(key)
+        if found is None:
+            model.check_time()
+            found = model.outcome_cache[key] = compute(*args)
+        return found
+
+    def _best_action(self, model, key, depth):
+        best_action, best_value = None, -1.0
+        for action in model.actions(key):
+            outcomes = self._cached(
+                model, (key, action), model.action_outcomes, key, action
+            )
+            value = sum(
+                probability * self._value(model, node, depth - 1)
+                for node, probability in outcomes
+            )
+            if value > best_value:
+                best_action, best_value = action, value
+        return best_action, best_value
+
+    def _value(self, model, node, depth):
+        if depth == 0 or node == WIN or node == LOSS:
+            return model.evaluate(node)
+        entry = model.table.get(node)
+        if entry is not None and entry[0] >= depth:
+            return entry[1]
+
+        phase = node[0]
+        if phase == DECISION:
+            value = self._best_action(model, node, depth)[1]
+        elif phase == BOSS_PHASE:
+            outcomes = self._cached(model, node, model.boss_outcomes, node)
+            value = sum(
+                probability * self._value(model, successor, depth - 1)
+                for successor, probability in outcomes
+            )
+        else:  # PLAYER_PHASE: status effects tick, which costs no search depth
+            outcomes = self._cached(model, node, model.tick_outcomes, node)
+            value = sum(
+                probability * self._value(model, successor, depth)
+                for successor, probability in outcomes
+            )
+        model.table[node] = (depth, value)
+        return value
+
+
+expectimax_policy = ExpectimaxPolicy()
+starter.POLICIES["expectimax"] = expectimax_policy
+
+
+class _TimedPolicy:
+    """Wraps a policy and records how long each move took."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.move_times = []
+
+    def __call__(self, player, boss):
+        began = time.perf_counter()
+        move = self.policy(player, boss)
+        self.move_times.append(time.perf_counter() - began)
+        return move
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--battles", type=int, default=20, help="battles per combination"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument(
+        "--budget", type=float, default=0.006, help="seconds per move (0: no limit)"
+    )
+    args = parser.parse_args(argv)
+
+    timed = _TimedPolicy(ExpectimaxPolicy(args.depth, args.budget or None))
+    print(f"{'Role':<12} {'Weapon':<22} {'Win %':>6}")
+    for role in starter.class_names():
+        for weapon_key, weapon in starter.WEAPON_COLLECTIONS[role].items():
+            wins = sum(
+                starter.simulate_battle(role, weapon_key, timed, args.seed + i).winner
+                == "player"
+                for i in range(args.battles)
+            )
+            print(f"{role:<12} {weapon.name:<22} {wins / args.battles:6.1%}")
+
+    times = sorted(timed.move_times)
+    p99 = times[int(len(times) * 0.99)]
+    print(
+        f"\n{len(times)} moves: p50 {times[len(times) // 2] * 1000:.2f} ms, "
+        f"p99 {p99 * 1000:.2f} ms, max {times[-1] * 1000:.2f} ms"
+    )
+    return 0 if p99 < 0.010 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+pytest configuration. Its presence puts the repository root on sys.path, so
+the tests in tests/ can import starter and the other root-level tools.
+"""
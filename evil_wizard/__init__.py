@@ -0,0 +1,14 @@
+"""
+Evil Wizard: a turn-based boss battle for the terminal.
+
+The game is split so that each process loads only what it uses:
+
+- engine: the battle rules and the headless battle loop (no terminal code)
+- content: class stats, weapon effects and the boss roster, loaded on first use
+- catalog: the indexed weapon catalog, read from data/weapons.json
+- rendering: text layout, the Screen and the Narrator, loaded on first output
+- cli: the interactive game (python -m evil_wizard)
+- script: scripted, non-interactive play for batch runs
+
+The `starter` module re-exports all of them for existing scripts.
+"""
@@ -0,0 +1,180 @@
+"""
+The weapon catalog: every weapon of every role, loaded from a JSON file.
+
+A catalog file maps each role to its weapons in menu order, keyed by menu
+key. Special effects are named by their key in WEAPON_EFFECTS:
+
+    {"Warrior": {"1": {"name": "Iron Sword", "attack_bonus": 5,
+                       "defense_bonus": 2, "crit_chance": 0.05,
+                       "effect": null}, ...}, ...}
+
+A WeaponCatalog is immutable and indexed when it is built, so looking up a
+role's weapons, the weapons with an effect or the weapons in a stat range
+does not scan the catalog. Large generated catalogs for balance sweeps can be
+written with:
+
+    python -m evil_wizard.catalog --generate 500 --seed 1 big.json
+"""
+
+import argparse
+import bisect
+import json
+import random
+import sys
+import types
+
+from .engine import WEAPON_EFFECTS, Weapon
+
+# Stats that in_range() can search
+WEAPON_STATS = ("attack_bonus", "defense_bonus", "crit_chance")
+
+
+class CatalogEntry:
+    """A weapon together with the role and menu key it is listed under."""
+
+    __slots__ = ("role", "key", "weapon")
+
+    def __init__(self, role, key, weapon):
+        self.role = role
+        self.key = key
+        self.weapon = weapon
+
+    def __repr__(self):
+        return f"CatalogEntry({self.role!r}, {self.key!r}, {self.weapon!r})"
+
+
+class WeaponCatalog:
+    """An immutable, indexed set of weapons by role (see load_weapon_catalog())."""
+
+    def __init__(self, collections):
+        # role -> read-only {menu key: Weapon}, in menu order
+        self.collections = {
+            role: types.MappingProxyType(dict(weapons))
+            for role, weapons in collections.items()
+        }
+        self._entries = tuple(
+            CatalogEntry(role, key, weapon)
+            for role, weapons in self.collections.items()
+            for key, weapon in weapons.items()
+        )
+        self._by_effect = {}
+        for entry in self._entries:
+            self._by_effect.setdefault(entry.weapon.effect, []).append(entry)
+        self._by_effect = {
+            effect: tuple(entries) for effect, entries in self._by_effect.items()
+        }
+        # stat -> (sorted values, entries in the same order), for bisecting
+        self._by_stat = {}
+        for stat in WEAPON_STATS:
+            ordered = sorted(
+                self._entries, key=lambda entry: getattr(entry.weapon, stat)
+            )
+            values = [getattr(entry.weapon, stat) for entry in ordered]
+            self._by_stat[stat] = (values, tuple(ordered))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def roles(self):
+        return list(self.collections)
+
+    def for_role(self, role):
+        """The role's weapons as a read-only {menu key: Weapon} mapping."""
+        return self.collections[role]
+
+    def with_effect(self, effect):
+        """Entries whose weapon has the effect key `effect` (None: no effect)."""
+        return self._by_effect.get(effect, ())
+
+    def in_range(self, stat, low=None, high=None):
+        """Entries with low <= weapon.<stat> <= high, in ascending stat order."""
+        values, entries = self._by_stat[stat]
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = len(values) if high is None else bisect.bisect_right(values, high)
+        return entries[start:end]
+
+
+def _weapon(role, key, spec):
+    if not isinstance(spec, dict):
+        raise ValueError(f"{role} weapon {key}: expected an object, got {spec!r}")
+    missing = [field for field in ("name", *WEAPON_STATS) if field not in spec]
+    if missing:
+        raise ValueError(f"{role} weapon {key}: missing {', '.join(missing)}")
+    for stat in WEAPON_STATS:
+        value = spec[stat]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{role} weapon {key}: bad {stat} {value!r}")
+    effect = spec.get("effect")
+    if effect is not None and effect not in WEAPON_EFFECTS:
+        raise ValueError(f"{role} weapon {key}: unknown effect {effect!r}")
+    return Weapon(
+        spec["name"],
+        spec["attack_bonus"],
+        spec["defense_bonus"],
+        spec["crit_chance"],
+        effect,
+    )
+
+
+def catalog_from_data(data):
+    """Builds a WeaponCatalog from parsed catalog data (see the module docstring)."""
+    if not isinstance(data, dict) or not all(
+        isinstance(weapons, dict) for weapons in data.values()
+    ):
+        raise ValueError("a weapon catalog maps each role to {menu key: weapon}")
+    return WeaponCatalog(
+        {
+            role: {key: _weapon(role, key, spec) for key, spec in weapons.items()}
+            for role, weapons in data.items()
+        }
+    )
+
+
+def load_weapon_catalog(path):
+    """Reads a catalog file. Raises ValueError if it is not a valid catalog."""
+    with open(path, encoding="utf-8") as handle:
+        return catalog_from_data(json.load(handle))
+
+
+def generate_catalog_data(roles, per_role, seed=None):
+    """Catalog data with `per_role` random weapons for each role, for sweeps."""
+    rng = random.Random(seed)
+    effects = [None, *WEAPON_EFFECTS]
+    return {
+        role: {
+            str(index): {
+                "name": f"{role} Weapon {index}",
+                "attack_bonus": rng.randint(1, 8),
+                "defense_bonus": rng.randint(-2, 7),
+                "crit_chance": round(rng.uniform(0.0, 0.25), 2),
+                "effect": rng.choice(effects),
+            }
+            for index in range(1, per_role + 1)
+        }
+        for role in roles
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="catalog file to write")
+    parser.add_argument(
+        "--generate", type=int, metavar="N", required=True, help="weapons per role"
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    from .content import CLASS_DEFINITIONS
+
+    data = generate_catalog_data(list(CLASS_DEFINITIONS), args.generate, args.seed)
+    with open(args.path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=1)
+    print(f"Wrote {len(CLASS_DEFINITIONS) * args.generate} weapons to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
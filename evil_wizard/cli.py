@@ -0,0 +1,625 @@
+"""
+The interactive game: class and weapon menus, the Game flow and the command
+line (python -m evil_wizard, or python starter.py).
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib
+import json
+import os
+import sys
+
+from .colors import Colors, colorize
+from .content import weapon_catalog
+from .engine import (
+    TARGETING,
+    WEAPON_EFFECTS,
+    Encounter,
+    Timeline,
+    boss_kinds,
+    cast_ability,
+    class_registry,
+    create_boss,
+    create_player,
+    encounter_kinds,
+    get_class_color,
+    get_policy,
+    import_tool,
+    pause,
+    player_attack,
+    player_defend,
+    policy_names,
+    print_blank,
+    print_section_break,
+    print_slow,
+    print_with_spacing,
+    process_status_effects,
+    reset_player_state,
+    use_potion,
+    write_lines,
+)
+from .rendering import (
+    NARRATION_SPEEDS,
+    Narrator,
+    Screen,
+    clear_screen,
+    get_display_width,
+    get_screen,
+    output_to,
+    pad_to_width,
+    print_box,
+    print_header,
+    render_box,
+    render_header,
+    render_section_break,
+    run_dialog,
+    set_narration_speed,
+)
+
+# --- Character Creation ---
+
+
+def choose_class():
+    """Lets the player select their character class."""
+    return run_dialog(choose_class_dialog())
+
+
+def choose_class_dialog():
+    """Dialog version of choose_class() (see run_dialog())."""
+    print_header("Choose Your Class")
+
+    # Display classes with their themed colors in a nice formatted table
+    choices = {
+        str(number): character_class
+        for number, character_class in enumerate(class_registry().values(), 1)
+    }
+    class_lines = []
+    for num, character_class in choices.items():
+        color = getattr(Colors, character_class.color)
+        name_block = colorize(character_class.name, Colors.BOLD + color)
+        class_lines.append(f"{num}: {name_block} - {character_class.description}")
+
+    print_box(colorize("Available Classes", Colors.BOLD), class_lines, width=90)
+    print_blank()
+
+    choice = ""
+    while choice not in choices:
+        choice = yield f"Enter your choice (1-{len(choices)}): "
+
+    player_name = yield "Enter your hero's name: "
+    if not player_name:
+        player_name = "Hero"
+
+    # Create player based on choice
+    player = create_player(choices[choice], player_name)
+
+    # Now let player choose weapon
+    yield from choose_weapon_dialog(player)
+    return player
+
+
+def choose_weapon(player):
+    """Lets the player choose their weapon with enhanced display."""
+    run_dialog(choose_weapon_dialog(player))
+
+
+@functools.lru_cache(maxsize=None)
+def weapon_menu(catalog, role):
+    """The rows of a role's weapon menu box, rendered once per catalog."""
+    class_color = get_class_color(role)
+    weapon_lines = []
+    for key, weapon in catalog.for_role(role).items():
+        attack_text = colorize(f"ATK+{weapon.attack_bonus}", Colors.RED)
+        defense_text = colorize(f"DEF+{weapon.defense_bonus}", Colors.BLUE)
+        crit_text = colorize(f"CRIT+{weapon.crit_chance*100:.0f}%", Colors.YELLOW)
+
+        name_block = pad_to_width(colorize(weapon.name, Colors.BOLD + class_color), 22)
+        stats_segments = f"{attack_text}  {defense_text}  {crit_text}"
+        if weapon.effect:
+            effect = WEAPON_EFFECTS[weapon.effect]
+            special_text = colorize(effect.label, getattr(Colors, effect.color))
+            stats_segments = f"{stats_segments}  [{special_text}]"
+
+        weapon_lines.append(f"{key}: {name_block}{stats_segments}")
+
+    width_hint = max((get_display_width(line) for line in weapon_lines), default=0)
+    frame_width = max(70, width_hint + 3)
+    return tuple(
+        render_box(
+            colorize("Available Weapons", Colors.BOLD),
+            weapon_lines,
+            width=frame_width + 2,
+        )
+    )
+
+
+def choose_weapon_dialog(player):
+    """Dialog version of choose_weapon() (see run_dialog())."""
+    class_color = get_class_color(player.role)
+    print_header(f"Choose Your {player.role} Weapon", class_color)
+
+    catalog = weapon_catalog()
+    pool = player.character_class.weapon_pool
+    weapons = catalog.for_role(pool)
+    write_lines(weapon_menu(catalog, pool))
+    print_blank()
+
+    choice = ""
+    while choice not in weapons.keys():
+        choice = (yield f"Choose weapon (1-{len(weapons)}): ").strip()
+
+    chosen_weapon = weapons[choice]
+    player.equip_weapon(chosen_weapon)
+
+    print_blank()
+    print_slow(f"⚔️  {player.name} equips the {chosen_weapon.name}!", color=class_color)
+    print_section_break()
+    pause(1)
+
+
+# --- Game ---
+
+ACTION_NAMES = {
+    "1": "Basic Attack",
+    "2": "Defend",
+    "3": "Use Ability",
+    "4": "Health Potion",
+}
+
+
+class Game:
+    """Coordinates the flow of the boss battle."""
+
+    def __init__(self, autopilot=None, boss="hydra", journal=None, encounter=None):
+        self.player = None
+        self.boss = None
+        self.boss_kind = boss
+        self.encounter_kind = encounter  # Fight an encounter instead of one boss
+        self.encounter = None
+        self.journal = journal  # journal.JournalWriter recording the battle, if any
+        self.recorder = None
+        self.timeline = None  # Who acts next, once the battle has begun
+        self.turn = 1
+        # Policy that picks the player's actions instead of prompting, if any
+        self.autopilot = get_policy(autopilot) if autopilot else None
+
+    def setup(self):
+        """Intro, class and weapon selection (a dialog, see run_dialog())."""
+        clear_screen()
+        print_header("🐉 BOSS BATTLE 🐉", Colors.BRIGHT_RED)
+
+        print_with_spacing(
+            "⚠️  A fearsome beast emerges from the shadows!",
+            Colors.BRIGHT_RED,
+            spacing_before=1,
+            spacing_after=2,
+        )
+        pause(1.5)
+
+        self.player = yield from choose_class_dialog()
+        if self.encounter_kind:
+            self.encounter = Encounter(self.encounter_kind)
+            self.boss = self.encounter.boss
+            description = self.encounter.description
+        else:
+            self.boss = create_boss(kind=self.boss_kind)
+            description = self.boss.behavior.description
+        if self.journal:
+            self.recorder = self.journal.start_battle(self.player, self.boss)
+            if self.encounter:
+                for minion in self.encounter.roster.members[1:]:
+                    self.recorder.add_enemy(minion)
+
+        print_header(f"🐉 THE {self.boss.name.upper()} AWAKENS 🐉", Colors.BRIGHT_RED)
+        print_with_spacing(description, Colors.GRAY, spacing_before=1)
+        print_with_spacing(
+            "Prepare for the battle of your life!",
+            Colors.BRIGHT_YELLOW,
+            spacing_after=2,
+        )
+
+        print_with_spacing(
+            "🎮 Battle begins!", Colors.BRIGHT_CYAN, spacing_before=1, spacing_after=1
+        )
+        pause(2)
+
+    def run(self):
+        """Plays the whole game on the current screen."""
+        run_dialog(self.play())
+
+    def play(self):
+        """The whole game as a dialog: yields prompts, receives answers."""
+        yield from self.setup()
+        enemies = self.encounter.roster.members if self.encounter else [self.boss]
+        timeline = self.timeline = Timeline((self.player, *enemies))
+        while self.player.is_alive() and self.enemies_remain():
+            actor = timeline.pop()
+            self._end_rounds()
+            if actor is self.player:
+                if self.recorder and self.recorder.turn != self.turn:
+                    self.recorder.begin_turn(self.turn)
+                self._reset_player_state()
+                acted = yield from self._player_turn()
+            else:
+                acted = self._boss_turn(actor)
+            if acted:
+                timeline.done(actor)
+                self._end_rounds()
+        if self.recorder:
+            winner = "player" if self.player.is_alive() else "boss"
+            self.recorder.finish(winner, self.turn)
+        self._end_game()
+
+    def _end_rounds(self):
+        """Catches the turn counter up with the timeline, summoning reinforcements."""
+        while self.turn < self.timeline.round:
+            if self.encounter and self.player.is_alive():
+                minion = self.encounter.end_round(self.turn)
+                if minion is not None:
+                    self.timeline.add(minion)
+                    if self.recorder:
+                        self.recorder.add_enemy(minion)
+            self.turn += 1
+
+    def _player_turn(self):
+        # Status effects tick first so the turn screen shows up-to-date HP
+        had_effects = bool(self.player.status_effects)
+        skip_turn = process_status_effects(self.player)
+        if skip_turn:  # Player is stunned
+            get_screen().present(self._render_status_frame())
+            print_slow(
+                f"💫 {self.player.name} is stunned and loses their turn!",
+                color=Colors.YELLOW,
+            )
+            pause(2)
+            return True
+        if not self.player.is_alive():
+            return False
+        if had_effects:
+            pause(1)
+
+        if self.autopilot:
+            yield from self._autopilot_action()
+        else:
+            while True:
+                action = yield from self._prompt_player_action()
+                if (yield from self._handle_player_action(action)):
+                    break
+        pause(1.5)
+        return True
+
+    def enemies_remain(self):
+        if self.encounter:
+            return not self.encounter.roster.defeated()
+        return self.boss.is_alive()
+
+    def _reset_player_state(self):
+        reset_player_state(self.player)
+
+    def _render_status_frame(self):
+        """Turn header plus the player's and boss's status boxes."""
+        return [
+            *render_header(f"Turn {self.turn}", Colors.CYAN),
+            "",
+            *self.player.render_status(),
+            "",
+            *self.boss.render_status(),
+            *self._render_enemy_list(),
+            *render_section_break(),
+        ]
+
+    def _render_enemy_list(self, shown=10):
+        """In an encounter, the living enemies numbered as targets."""
+        if not self.encounter or len(self.encounter.roster) < 2:
+            return []
+        enemies = self.encounter.roster.living()
+        lines = [
+            f"{number}: {enemy.name:<20} HP {enemy.hp:3d}/{enemy.max_hp}"
+            for number, enemy in enumerate(enemies[:shown], 1)
+        ]
+        if len(enemies) > shown:
+            lines.append(colorize(f"... and {len(enemies) - shown} more", Colors.GRAY))
+        return ["", *render_box(colorize("Enemies", Colors.BOLD), lines)]
+
+    def _choose_target(self):
+        """
+        The enemy to attack: the boss, or in an encounter the one the player
+        picks (the autopilot picks the newest minion).
+        """
+        if not self.encounter:
+            return self.boss
+        roster = self.encounter.roster
+        if len(roster) == 1 or self.autopilot:
+            return TARGETING["last"](roster, self.player.rng)
+        enemies = roster.living()
+        choice = ""
+        while not (choice.isdigit() and 1 <= int(choice) <= len(enemies)):
+            choice = (yield f"Choose target (1-{len(enemies)}): ").strip()
+        return enemies[int(choice) - 1]
+
+    def _render_action_menu(self):
+        potion_color = Colors.GREEN if self.player.potions > 0 else Colors.GRAY
+        potion_text = colorize(
+            f"🧪 Use Health Potion ({self.player.potions} left)", potion_color
+        )
+
+        options = [
+            f"1: {colorize('⚔️  Basic Attack', Colors.RED)}",
+            f"2: {colorize('🛡️  Defend', Colors.BLUE)}",
+            f"3: {colorize('✨ Use Ability', Colors.PURPLE)}",
+            f"4: {potion_text}",
+        ]
+
+        return render_box(colorize("Combat Actions", Colors.BOLD), options)
+
+    def _render_turn_frame(self):
+        turn_color = get_class_color(self.player.role)
+        return [
+            *self._render_status_frame(),
+            "",
+            colorize(f"⚔️  Your turn, {self.player.name}!", turn_color),
+            "",
+            "",
+            *self._render_action_menu(),
+        ]
+
+    def _prompt_player_action(self):
+        get_screen().present(self._render_turn_frame())
+        action = (yield f"\n{colorize('>', Colors.BOLD)} ").strip()
+        return action
+
+    def _autopilot_action(self):
+        """Lets the autopilot policy choose and perform this turn's action."""
+        get_screen().present(self._render_turn_frame())
+        target = yield from self._choose_target()
+        action, ability_key = self.autopilot(self.player, target)
+        name = self._action_name(action, ability_key)
+        print_slow(f"🤖 Autopilot chooses {name}.", color=Colors.GRAY)
+        if not (yield from self._handle_player_action(action, ability_key, target)):
+            player_attack(self.player, target)
+
+    def _action_name(self, action, ability_key=None):
+        """The menu name of an action code, or the ability it casts."""
+        ability = self.player.abilities.get(ability_key) if action == "3" else None
+        if ability:
+            return ability.name
+        return ACTION_NAMES.get(action, action)
+
+    def _handle_player_action(self, action, ability_key=None, target=None):
+        if action == "1":
+            player_attack(self.player, target or (yield from self._choose_target()))
+            return True
+        elif action == "2":
+            player_defend(self.player)
+            return True
+        elif action == "3":
+            return (yield from self._handle_ability_choice(ability_key, target))
+        elif action == "4":
+            return self._use_potion()
+        print_slow("Invalid action. Please choose again.", color=Colors.RED)
+        return False
+
+    def _handle_ability_choice(self, ability_key=None, target=None):
+        if not self.player.abilities:
+            print_slow("🚫 You have no abilities available.", color=Colors.GRAY)
+            return False
+        enemies = self.encounter.roster if self.encounter else None
+        if ability_key is not None:  # Already chosen, e.g. by the autopilot
+            return cast_ability(self.player, ability_key, target, enemies)
+
+        lines = [
+            "",
+            f"┌─ {colorize('Available Abilities', Colors.BOLD)} {'─' * 47}┐",
+        ]
+
+        for key, ability in self.player.abilities.items():
+            mana_color = Colors.BLUE if self.player.mana >= ability.cost else Colors.RED
+            ability_name = colorize(
+                f"{ability.name:<18}", get_class_color(self.player.role)
+            )
+            mana_cost = colorize(f"Cost: {ability.cost} MP", mana_color)
+
+            # Add icon for ability affordability
+            icon = "✨" if self.player.mana >= ability.cost else "❌"
+
+            lines.append(f"│ {key}: {icon} {ability_name} {mana_cost:<15} │")
+
+        lines.append(f"└{'─' * 47}┘")
+        write_lines(lines)
+
+        ability_choice = (
+            yield f"\n{colorize('Choose ability >', Colors.BOLD)} "
+        ).strip()
+
+        chosen = self.player.abilities.get(ability_choice)
+        target = self.boss
+        if chosen and chosen.targeted and not chosen.area:
+            target = yield from self._choose_target()
+        return cast_ability(self.player, ability_choice, target, enemies)
+
+    def _use_potion(self):
+        return use_potion(self.player)
+
+    def _boss_turn(self, enemy=None):
+        """
+        An enemy's turn, the boss's by default. Returns False if its status
+        effects killed it before it could act.
+        """
+        enemy = enemy or self.boss
+        skip_turn = process_status_effects(enemy)
+        if not enemy.is_alive():
+            return False
+        if skip_turn:  # Enemy is stunned
+            print_slow(f"{enemy.name} is stunned and loses their turn!")
+        else:
+            enemy.choose_action(self.player)
+        pause(1 if self.encounter else 2)
+        return True
+
+    def _end_game(self):
+        clear_screen()
+        if self.player.is_alive():
+            print_header("🎉 VICTORY! 🎉", Colors.BRIGHT_GREEN)
+            print_blank()
+            print_slow(
+                f"🎊 Congratulations! You have defeated the {self.boss.name}! 🎊",
+                color=Colors.BRIGHT_GREEN,
+            )
+            print_slow(
+                "🏆 The realm is safe once more thanks to your heroic deeds! 🏆",
+                color=Colors.BRIGHT_YELLOW,
+            )
+            print_blank()
+            print_section_break()
+            print_with_spacing("📊 Final Status:", Colors.BOLD, spacing_before=1)
+            self.player.display_status()
+            print_blank()
+            print_with_spacing(
+                "✨ Thank you for playing! ✨",
+                Colors.BRIGHT_CYAN,
+                spacing_before=1,
+                spacing_after=2,
+            )
+        else:
+            print_header("💀 DEFEAT 💀", Colors.BRIGHT_RED)
+            print_blank()
+            print_slow(
+                "⚰️  You have been defeated... The world is shrouded in darkness.",
+                color=Colors.GRAY,
+            )
+            print_slow(
+                f"🌑 The {self.boss.name}'s reign of terror continues...",
+                color=Colors.RED,
+            )
+            print_blank()
+            print_section_break()
+            print_with_spacing("📊 Final Status:", Colors.BOLD, spacing_before=1)
+            self.boss.display_status()
+            print_blank()
+            print_with_spacing(
+                "💪 Better luck next time, hero! 💪",
+                Colors.YELLOW,
+                spacing_before=1,
+                spacing_after=2,
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Boss battle against the Hydra.")
+    parser.add_argument(
+        "--boss",
+        default="hydra",
+        choices=boss_kinds(),
+        metavar="KIND",
+        help="boss to fight (default: hydra; e.g. lich, elder-fire_giant)",
+    )
+    parser.add_argument(
+        "--encounter",
+        choices=encounter_kinds(),
+        metavar="KIND",
+        help="fight a boss and its minions instead (%(choices)s)",
+    )
+    parser.add_argument(
+        "--speed",
+        choices=list(NARRATION_SPEEDS),
+        help="narration speed (default: $EVIL_WIZARD_SPEED or cinematic)",
+    )
+    parser.add_argument(
+        "--autopilot",
+        metavar="POLICY",
+        choices=policy_names(),
+        help="let a policy fight for you (%(choices)s)",
+    )
+    parser.add_argument(
+        "--journal", metavar="PATH", help="append a record of the battle to PATH"
+    )
+    parser.add_argument(
+        "--instrument",
+        metavar="PATH",
+        help="write timing and event statistics to PATH (.prom: Prometheus, else JSON)",
+    )
+    parser.add_argument(
+        "--color",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="color output (default: auto, off unless writing to a terminal "
+        "or if $NO_COLOR is set)",
+    )
+    scripted = parser.add_argument_group(
+        "scripted play", "answer every prompt from a file, for batch and soak runs"
+    )
+    scripted.add_argument(
+        "--script", metavar="PATH", help="answers, one per line ('-': stdin)"
+    )
+    scripted.add_argument(
+        "--games", type=int, default=1, help="play the script this many times"
+    )
+    scripted.add_argument("--seed", type=int, help="seed the dice of every game")
+    scripted.add_argument(
+        "--summary",
+        metavar="PATH",
+        help="write the JSON summary to PATH (default: standard error)",
+    )
+    scripted.add_argument(
+        "--quiet", action="store_true", help="discard the games' output"
+    )
+    args = parser.parse_args(argv)
+    try:
+        if args.autopilot:
+            get_policy(args.autopilot)
+        journal = import_tool("journal") if args.journal else None
+        instrument = import_tool("instrument") if args.instrument else None
+    except ImportError as error:
+        parser.error(str(error))
+
+    # Piped or redirected output gets no colors or delays unless asked for
+    interactive = sys.stdout.isatty()
+    if args.speed:
+        set_narration_speed(args.speed)
+    elif not interactive and "EVIL_WIZARD_SPEED" not in os.environ:
+        set_narration_speed("instant")
+    if args.color == "never" or (
+        args.color == "auto" and (not interactive or "NO_COLOR" in os.environ)
+    ):
+        get_screen().color = False
+
+    with contextlib.ExitStack() as stack:
+        if args.quiet:
+            devnull = stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            narrator = Narrator("instant", skip_key=None)
+            stack.enter_context(output_to(Screen(devnull, color=False), narrator))
+        writer = None
+        if journal:
+            writer = stack.enter_context(journal.JournalWriter(args.journal))
+        if instrument:
+            instrumentation = stack.enter_context(instrument.Instrumentation())
+            stack.callback(instrumentation.write, args.instrument)
+        if not args.script:
+            Game(args.autopilot, args.boss, writer, args.encounter).run()
+            return 0
+
+        script = importlib.import_module("evil_wizard.script")
+        if args.script == "-":
+            answers = script.read_script(sys.stdin)
+        else:
+            with open(args.script, encoding="utf-8") as handle:
+                answers = script.read_script(handle)
+        summary = script.run_games(
+            answers,
+            args.games,
+            args.seed,
+            args.autopilot,
+            args.boss,
+            writer,
+            args.encounter,
+        )
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text, file=sys.stderr)
+    return 1 if summary["incomplete"] else 0
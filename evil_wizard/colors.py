@@ -0,0 +1,69 @@
+"""ANSI colors and the game's color themes."""
+
+
+# --- Color System ---
+class Colors:
+    """ANSI color codes for terminal output."""
+
+    # Basic colors
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    PURPLE = "\033[95m"
+    CYAN = "\033[96m"
+    WHITE = "\033[97m"
+    GRAY = "\033[90m"
+
+    # Bright colors
+    BRIGHT_RED = "\033[91;1m"
+    BRIGHT_GREEN = "\033[92;1m"
+    BRIGHT_YELLOW = "\033[93;1m"
+    BRIGHT_BLUE = "\033[94;1m"
+    BRIGHT_PURPLE = "\033[95;1m"
+    BRIGHT_CYAN = "\033[96;1m"
+
+    # Special formatting
+    BOLD = "\033[1m"
+    UNDERLINE = "\033[4m"
+    BLINK = "\033[5m"
+
+    # Background colors
+    BG_RED = "\033[101m"
+    BG_GREEN = "\033[102m"
+    BG_YELLOW = "\033[103m"
+    BG_BLUE = "\033[104m"
+
+    # Reset
+    RESET = "\033[0m"
+
+    @staticmethod
+    def disable():
+        """Disable colors (useful for Windows compatibility issues)."""
+        for attr in dir(Colors):
+            if not attr.startswith("_") and attr != "disable" and attr != "enable":
+                setattr(Colors, attr, "")
+
+    @staticmethod
+    def enable():
+        """Re-enable colors."""
+        Colors.__init__()
+
+
+def colorize(text, color):
+    """Apply color to text."""
+    return f"{color}{text}{Colors.RESET}"
+
+
+def get_damage_color(damage_type):
+    """Get color for different damage types."""
+    damage_colors = {
+        "physical": Colors.RED,
+        "fire": Colors.BRIGHT_RED,
+        "ice": Colors.BRIGHT_CYAN,
+        "poison": Colors.GREEN,
+        "holy": Colors.BRIGHT_YELLOW,
+        "dark": Colors.PURPLE,
+        "healing": Colors.BRIGHT_GREEN,
+    }
+    return damage_colors.get(damage_type, Colors.WHITE)
@@ -0,0 +1,465 @@
+"""
+Game content: class stats, the weapon special effects and catalog (loaded
+from data/weapons.json), and the boss roster. evil_wizard.engine loads it
+the first time a combatant is created.
+"""
+
+import os
+
+from .colors import Colors
+from .engine import apply_status, print_slow, weapon_effect
+
+# --- Classes ---
+
+# Every playable class, in menu order. Stats are the class's base hp, attack,
+# defense and mana; color names a Colors attribute. "abilities" and "weapons"
+# name the ability table and weapon pool to use and default to the class
+# name. An optional "speed" (default DEFAULT_SPEED) sets how often the class
+# acts. Checked when the engine's class_registry() is first built.
+CLASS_DEFINITIONS = {
+    "Warrior": {
+        "hp": 120,
+        "attack": 12,
+        "defense": 8,
+        "mana": 50,
+        "color": "RED",
+        "description": "A sturdy fighter with high defense and reliable damage.",
+    },
+    "Mage": {
+        "hp": 80,
+        "attack": 5,  # Mages hit hard with spells, not staves
+        "defense": 4,
+        "mana": 100,
+        "color": "BLUE",
+        "description": "A powerful spellcaster with high damage and healing abilities.",
+    },
+    "Archer": {
+        "hp": 100,
+        "attack": 15,
+        "defense": 6,
+        "mana": 70,
+        "color": "GREEN",
+        "description": "A nimble marksman who uses precision and status effects.",
+    },
+    "Paladin": {
+        "hp": 130,
+        "attack": 11,
+        "defense": 10,
+        "mana": 80,
+        "color": "YELLOW",
+        "description": "A holy knight with strong defenses and supportive magic.",
+    },
+    "Rogue": {
+        "hp": 90,
+        "attack": 17,
+        "defense": 4,
+        "mana": 60,
+        "color": "PURPLE",
+        "description": "A swift striker specializing in burst damage and evasion.",
+    },
+    "Necromancer": {
+        "hp": 85,
+        "attack": 13,
+        "defense": 5,
+        "mana": 90,
+        "color": "GRAY",
+        "description": "A dark mage who drains life and curses enemies.",
+    },
+    "Monk": {
+        "hp": 110,
+        "attack": 14,
+        "defense": 7,
+        "mana": 75,
+        "color": "CYAN",
+        "description": "A martial artist balancing offense and spiritual power.",
+    },
+    "Barbarian": {
+        "hp": 140,
+        "attack": 18,
+        "defense": 3,
+        "mana": 40,
+        "color": "BRIGHT_RED",
+        "description": "A fierce warrior trading defense for overwhelming offense.",
+    },
+    "Druid": {
+        "hp": 105,
+        "attack": 12,
+        "defense": 6,
+        "mana": 85,
+        "color": "BRIGHT_GREEN",
+        "description": "A nature wielder with versatile elemental abilities.",
+    },
+}
+
+
+# --- Weapon Special Effects ---
+
+
+@weapon_effect("vampiric", "Vampiric", "PURPLE")
+def vampiric_effect(wielder, target):
+    """Vampiric weapons heal the wielder."""
+    if wielder.rng.chance(0.3):  # 30% chance
+        heal_amount = 3
+        wielder.heal(heal_amount)
+        print_slow(
+            f"{wielder.name}'s weapon drains life, healing for {heal_amount} HP!",
+            color=Colors.PURPLE,
+        )
+        return True
+    return False
+
+
+@weapon_effect("burning", "Burning", "RED")
+def burning_effect(wielder, target):
+    """Burning weapons can set enemies on fire."""
+    if wielder.rng.chance(0.25):  # 25% chance
+        if apply_status(target, "burning", 3):
+            print_slow(f"{target.name} catches fire!", color=Colors.BRIGHT_RED)
+        return True
+    return False
+
+
+@weapon_effect("frost", "Frost", "CYAN")
+def frost_effect(wielder, target):
+    """Frost weapons can chill enemies, lowering their attack for a while."""
+    if wielder.rng.chance(0.30):  # 30% chance
+        if apply_status(target, "frozen", 3, magnitude=2):
+            print_slow(
+                f"{target.name} is chilled, reducing their attack!",
+                color=Colors.BRIGHT_CYAN,
+            )
+        return True
+    return False
+
+
+@weapon_effect("poison", "Poison", "GREEN")
+def poison_effect(wielder, target):
+    """Poison weapons can poison enemies."""
+    if wielder.rng.chance(0.35):  # 35% chance
+        if apply_status(target, "poison", 2):
+            print_slow(f"{target.name} is poisoned by the weapon!", color=Colors.GREEN)
+        return True
+    return False
+
+
+@weapon_effect("stunning", "Stunning", "BRIGHT_YELLOW")
+def stunning_effect(wielder, target):
+    """Stunning weapons can stun enemies."""
+    if wielder.rng.chance(0.15):  # 15% chance
+        apply_status(target, "stunned", 1)
+        print_slow(
+            f"{target.name} is stunned and will lose their next turn!",
+            color=Colors.YELLOW,
+        )
+        return True
+    return False
+
+
+@weapon_effect("blessed", "Blessed", "YELLOW")
+def blessed_effect(wielder, target):
+    """Blessed weapons provide protection."""
+    if wielder.rng.chance(0.20):  # 20% chance
+        wielder.add_modifier("blessed", "defense", 2, turns=1)
+        print_slow(
+            f"{wielder.name} is blessed with divine protection!",
+            color=Colors.BRIGHT_YELLOW,
+        )
+        return True
+    return False
+
+
+# --- Weapon Catalog ---
+# The weapons themselves are data (data/weapons.json), loaded on first use.
+# Set $EVIL_WIZARD_WEAPONS to play or simulate with another catalog file.
+
+WEAPONS_PATH = os.path.join(os.path.dirname(__file__), "data", "weapons.json")
+_weapon_catalog = None
+
+
+def weapon_catalog():
+    """The WeaponCatalog in use, loaded the first time it is needed."""
+    global _weapon_catalog
+    if _weapon_catalog is None:
+        from .catalog import load_weapon_catalog
+
+        path = os.environ.get("EVIL_WIZARD_WEAPONS") or WEAPONS_PATH
+        _weapon_catalog = load_weapon_catalog(path)
+    return _weapon_catalog
+
+
+def __getattr__(name):
+    if name == "WEAPON_COLLECTIONS":  # role -> {menu key: Weapon}
+        return weapon_catalog().collections
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# --- Boss Roster ---
+# Ability entries are a weight, or a dict with a "weight", an optional
+# "cooldown" (boss turns before it can be used again) and an optional "when"
+# condition from BOSS_CONDITIONS. A phase starts once HP drops below `below`
+# of max HP and keeps the previous phase's abilities unless it lists its own.
+# An optional "speed" works as for classes.
+BOSS_DEFINITIONS = {
+    "hydra": {
+        "name": "Gargantuan Hydra",
+        "description": "A massive three-headed dragon blocks your path!",
+        "hp": 250,
+        "attack": 15,
+        "defense": 5,
+        "phases": [
+            {"abilities": {"stomp": 0.5, "dark_breath": 0.3, "frightening_roar": 0.2}},
+            {
+                "below": 0.3,
+                "attack_bonus": 5,
+                "message": "💀 {name} becomes ENRAGED! Its attack power has increased!",
+            },
+        ],
+    },
+    "lich": {
+        "name": "Lich King",
+        "description": "A crowned skeleton rises from a throne of bones!",
+        "hp": 210,
+        "attack": 14,
+        "defense": 6,
+        "phases": [
+            {
+                "abilities": {
+                    "dark_breath": 0.4,
+                    "hex": {
+                        "weight": 0.3,
+                        "cooldown": 2,
+                        "when": "target_lacks:cursed",
+                    },
+                    "regenerate": {
+                        "weight": 0.3,
+                        "cooldown": 3,
+                        "when": "self_wounded",
+                    },
+                }
+            },
+            {
+                "below": 0.4,
+                "attack_bonus": 4,
+                "message": "☠️  {name} draws on the souls of the fallen!",
+                "abilities": {
+                    "dark_breath": 0.4,
+                    "frost_breath": 0.3,
+                    "hex": {
+                        "weight": 0.3,
+                        "cooldown": 2,
+                        "when": "target_lacks:cursed",
+                    },
+                },
+            },
+        ],
+    },
+    "frost_wyrm": {
+        "name": "Frost Wyrm",
+        "description": "Ice cracks as a pale serpent uncoils before you!",
+        "hp": 230,
+        "attack": 14,
+        "defense": 6,
+        "phases": [
+            {
+                "abilities": {
+                    "bite": 0.4,
+                    "frost_breath": {"weight": 0.35, "when": "target_lacks:frozen"},
+                    "tail_sweep": 0.25,
+                }
+            },
+            {
+                "below": 0.35,
+                "attack_bonus": 5,
+                "message": "❄️  {name} howls and the air turns to ice!",
+            },
+        ],
+    },
+    "stone_golem": {
+        "name": "Stone Golem",
+        "description": "A hulking figure of living rock grinds to life!",
+        "hp": 300,
+        "attack": 12,
+        "defense": 9,
+        "phases": [
+            {
+                "abilities": {
+                    "stomp": 0.5,
+                    "stun_slam": {"weight": 0.2, "cooldown": 3},
+                    "crushing_blow": {"weight": 0.3, "when": "target_defending"},
+                }
+            },
+            {
+                "below": 0.5,
+                "attack_bonus": 6,
+                "defense_bonus": -4,
+                "message": "🪨 {name} cracks open, exposing a molten core!",
+            },
+        ],
+    },
+    "rat_king": {
+        "name": "Plague Rat King",
+        "description": "A writhing mass of rats swarms out of the sewers!",
+        "hp": 180,
+        "attack": 13,
+        "defense": 4,
+        "phases": [
+            {
+                "abilities": {
+                    "bite": 0.5,
+                    "venom_spit": {"weight": 0.5, "when": "target_lacks:poison"},
+                }
+            },
+            {
+                "below": 0.5,
+                "attack_bonus": 3,
+                "message": "🐀 {name} whips the swarm into a frenzy!",
+            },
+        ],
+    },
+    "fire_giant": {
+        "name": "Fire Giant",
+        "description": "The ground scorches beneath a towering giant!",
+        "hp": 280,
+        "attack": 17,
+        "defense": 5,
+        "phases": [
+            {
+                "abilities": {
+                    "stomp": 0.4,
+                    "crushing_blow": {"weight": 0.3, "cooldown": 2},
+                    "ignite": {"weight": 0.3, "when": "target_lacks:burning"},
+                }
+            },
+            {
+                "below": 0.25,
+                "attack_bonus": 6,
+                "message": "🔥 {name} erupts in a blazing fury!",
+            },
+        ],
+    },
+    "shadow_stalker": {
+        "name": "Shadow Stalker",
+        "description": "Something moves in the darkness, just out of sight...",
+        "hp": 170,
+        "attack": 18,
+        "defense": 3,
+        "phases": [
+            {
+                "abilities": {
+                    "bite": 0.5,
+                    "crushing_blow": {"weight": 0.3, "when": "target_wounded"},
+                    "frightening_roar": 0.2,
+                }
+            },
+        ],
+    },
+    "treant": {
+        "name": "Ancient Treant",
+        "description": "An enormous tree tears its roots from the earth!",
+        "hp": 320,
+        "attack": 11,
+        "defense": 7,
+        "phases": [
+            {
+                "abilities": {
+                    "stomp": 0.4,
+                    "regenerate": {
+                        "weight": 0.3,
+                        "cooldown": 2,
+                        "when": "self_wounded",
+                    },
+                    "tail_sweep": 0.3,
+                }
+            },
+            {
+                "below": 0.3,
+                "attack_bonus": 4,
+                "message": "🌳 {name} thrashes wildly, splintering everything nearby!",
+            },
+        ],
+    },
+}
+
+# Stronger variants of every boss: kind prefix -> (name prefix, HP multiplier,
+# attack bonus, defense bonus)
+BOSS_TIERS = {
+    "": ("", 1.0, 0, 0),
+    "elder": ("Elder ", 1.25, 2, 1),
+    "ancient": ("Ancient ", 1.5, 4, 2),
+}
+
+
+# --- Encounters ---
+# Minions are defined like bosses but only appear in encounters.
+MINION_DEFINITIONS = {
+    "hydra_head": {
+        "name": "Hydra Head",
+        "hp": 20,
+        "attack": 8,
+        "defense": 2,
+        "phases": [
+            {
+                "abilities": {
+                    "bite": 0.6,
+                    "venom_spit": {"weight": 0.25, "when": "target_lacks:poison"},
+                    "constrict": {"weight": 0.15, "when": "target_lacks:slowed"},
+                }
+            }
+        ],
+    },
+    "skeleton": {
+        "name": "Skeleton",
+        "hp": 25,
+        "attack": 8,
+        "defense": 3,
+        "phases": [
+            {
+                "abilities": {
+                    "slash": 0.8,
+                    "frenzy": {"weight": 0.2, "when": "self_lacks:hasted"},
+                }
+            }
+        ],
+    },
+    "rat": {
+        "name": "Plague Rat",
+        "hp": 8,
+        "attack": 4,
+        "defense": 0,
+        "speed": 125,  # Rats act five times for every four of the player's turns
+        "phases": [{"abilities": {"bite": 1}}],
+    },
+}
+
+# A boss with the minions it starts with and, optionally, the minions it
+# summons: one more every `every` rounds while the boss lives, up to `max`
+# living minions.
+ENCOUNTER_DEFINITIONS = {
+    "hydra-brood": {
+        "description": "The Hydra guards its nest, and its severed heads grow back!",
+        "boss": "hydra",
+        "minions": {"hydra_head": 2},
+        "summon": {
+            "minion": "hydra_head",
+            "every": 4,
+            "max": 3,
+            "message": "🐍 {name} sprouts a new head: {minion}!",
+        },
+    },
+    "lich-court": {
+        "description": "The Lich King holds court among the restless dead.",
+        "boss": "lich",
+        "minions": {"skeleton": 3},
+        "summon": {
+            "minion": "skeleton",
+            "every": 4,
+            "max": 5,
+            "message": "☠️  {name} raises {minion} from the bones!",
+        },
+    },
+    "rat-swarm": {
+        "description": "The Plague Rat King and his endless swarm.",
+        "boss": "rat_king",
+        "minions": {"rat": 50},
+    },
+}
@@ -0,0 +1,2593 @@
+"""
+Battle rules: combatants, weapons, status effects, abilities, bosses,
+encounters, the initiative timeline, the battle actions and the headless
+battle loops.
+
+Nothing in here draws to a terminal (see the Output section). Class stats,
+weapons and the boss roster live in evil_wizard.content, which is loaded the
+first time a combatant is created.
+"""
+
+import bisect
+import contextlib
+import copy
+import contextvars
+import hashlib
+import heapq
+import importlib
+import itertools
+import random
+
+from .colors import Colors, colorize
+
+# --- Headless Mode ---
+_headless = contextvars.ContextVar("headless", default=False)
+
+
+@contextlib.contextmanager
+def headless():
+    """Suppress all printing and pauses for the duration of the block."""
+    token = _headless.set(True)
+    try:
+        yield
+    finally:
+        _headless.reset(token)
+
+
+def is_headless():
+    """Check whether output is currently suppressed."""
+    return _headless.get()
+
+
+# --- Output ---
+# The rules narrate through these. Headless they return at once; otherwise
+# they hand over to evil_wizard.rendering, imported the first time anything
+# is shown, so simulations never load the terminal code.
+
+_rendering_module = None
+
+
+def _rendering():
+    global _rendering_module
+    if _rendering_module is None:
+        _rendering_module = importlib.import_module("evil_wizard.rendering")
+    return _rendering_module
+
+
+def pause(seconds):
+    """Waits for dramatic effect, unless running headless."""
+    if not _headless.get():
+        _rendering().get_narrator().pause(seconds)
+
+
+def print_slow(text, delay=0.03, color=None):
+    """Narrates a line of text (see rendering.print_slow), unless running headless."""
+    if not _headless.get():
+        _rendering().print_slow(text, delay, color)
+
+
+def write_lines(lines):
+    """Writes rows of text to the current screen, unless running headless."""
+    if not _headless.get():
+        _rendering().write_lines(lines)
+
+
+def print_blank(lines=1):
+    """Prints empty lines for spacing."""
+    write_lines([""] * lines)
+
+
+def print_section_break():
+    """Prints a visual break between sections."""
+    if not _headless.get():
+        _rendering().print_section_break()
+
+
+def print_with_spacing(text, color=None, spacing_before=0, spacing_after=1):
+    """Print text with customizable spacing before and after."""
+    if not _headless.get():
+        _rendering().print_with_spacing(text, color, spacing_before, spacing_after)
+
+
+def render_box(title, lines, width=54):
+    """Build the rows of a framed box (see rendering.render_box)."""
+    return _rendering().render_box(title, lines, width)
+
+
+# --- Randomness ---
+
+
+class BattleRandom(random.Random):
+    """A random stream owned by a single battle and shared by its combatants."""
+
+    def chance(self, probability):
+        """Returns True with the given probability."""
+        return self.random() < probability
+
+    def weighted_index(self, cumulative):
+        """
+        Index drawn from a table of cumulative weights. Consumes the stream
+        exactly like random.choices(population, weights, k=1) would.
+        """
+        return bisect.bisect(
+            cumulative, self.random() * cumulative[-1], 0, len(cumulative) - 1
+        )
+
+
+def derive_seed(root_seed, *keys):
+    """
+    Derives an independent stream seed from a root seed and battle identifiers,
+    e.g. derive_seed(root, "Rogue", "2", 41). Stable across runs and processes.
+    """
+    digest = hashlib.blake2b(repr((root_seed, *keys)).encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+# Stream for combatants created outside a seeded battle (e.g. interactive play)
+default_rng = BattleRandom()
+
+# --- Weapon System ---
+
+
+class WeaponEffect:
+    """A weapon special effect that weapon definitions refer to by key."""
+
+    __slots__ = ("key", "label", "color", "function")
+
+    def __init__(self, key, label, color, function):
+        self.key = key
+        self.label = label  # Shown in the weapon menu
+        self.color = color  # Name of a Colors attribute, looked up when rendering
+        self.function = function  # (wielder, target) -> True if it triggered
+
+
+WEAPON_EFFECTS = {}  # effect key -> WeaponEffect
+
+
+def weapon_effect(key, label, color="WHITE"):
+    """Registers a function as the weapon special effect `key`."""
+
+    def register(function):
+        WEAPON_EFFECTS[key] = WeaponEffect(key, label, color, function)
+        return function
+
+    return register
+
+
+def _effect_function(key):
+    if key not in WEAPON_EFFECTS:  # The effects are defined with the content
+        importlib.import_module("evil_wizard.content")
+    return WEAPON_EFFECTS[key].function
+
+
+class Weapon:
+    """An immutable weapon definition, shared by everyone who equips it."""
+
+    __slots__ = (
+        "name",
+        "attack_bonus",
+        "defense_bonus",
+        "crit_chance",  # Additional crit chance beyond base 10%
+        "effect",  # Key of its special effect in WEAPON_EFFECTS, or None
+        "special_effect",  # The effect's function, called on attack
+    )
+
+    def __init__(self, name, attack_bonus, defense_bonus, crit_chance, effect=None):
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "attack_bonus", attack_bonus)
+        set_field(self, "defense_bonus", defense_bonus)
+        set_field(self, "crit_chance", crit_chance)
+        set_field(self, "effect", effect)
+        set_field(self, "special_effect", _effect_function(effect) if effect else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Weapon definitions are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Weapon definitions are immutable")
+
+    def __reduce__(self):
+        return (
+            Weapon,
+            (
+                self.name,
+                self.attack_bonus,
+                self.defense_bonus,
+                self.crit_chance,
+                self.effect,
+            ),
+        )
+
+    def __repr__(self):
+        return f"Weapon({self.name!r})"
+
+    def apply_special_effect(self, wielder, target):
+        """
+        Apply the weapon's special effect if it has one. Returns True if it
+        triggered: effect functions return whether their proc chance hit.
+        """
+        if self.special_effect:
+            return self.special_effect(wielder, target)
+        return False
+
+
+# --- Initiative ---
+# Who acts when. Every combatant is queued in a Timeline at the time of its
+# next action and acts TURN_TICKS * DEFAULT_SPEED // speed ticks after its
+# previous one, so at equal speeds everyone acts once per round, in the
+# order they joined the battle.
+
+DEFAULT_SPEED = 100
+MIN_SPEED = 10
+TURN_TICKS = 1_000_000  # Length of a round: one action at the default speed
+
+
+def action_interval(character):
+    """Ticks between the character's actions at its current speed."""
+    return TURN_TICKS * DEFAULT_SPEED // character.speed
+
+
+class Timeline:
+    """
+    A priority queue of combatants keyed on the time of their next action.
+
+    pop() returns the next combatant due to act; when it has taken its turn,
+    done() queues its next action. Both cost O(log n) in the number of
+    combatants. Rescheduling a queued combatant (shift()) leaves its old
+    entry in the heap, marked dead, to be dropped when it surfaces; the same
+    happens to combatants that die.
+
+    `round` counts rounds of TURN_TICKS from 1. A round ends when a
+    combatant finishes its turn and nothing else is due before the next
+    round, like the boss's turn ending a round of the one-on-one fight.
+    """
+
+    __slots__ = ("now", "round", "_heap", "_entries", "_orders", "_sequence")
+
+    def __init__(self, actors=()):
+        self.now = 0
+        self.round = 1
+        self._heap = []  # [time, join order, sequence, actor or None]
+        self._entries = {}  # actor -> its live heap entry
+        self._orders = {}  # actor -> join order, which breaks ties
+        self._sequence = itertools.count()
+        for actor in actors:
+            self.add(actor)
+
+    def add(self, actor):
+        """
+        Queues a combatant joining the battle. It acts at the start of the
+        current round (now, if that has passed), after those already queued
+        for the same time.
+        """
+        self._orders[actor] = len(self._orders)
+        actor.timeline = self
+        self._push(actor, max(self.now, (self.round - 1) * TURN_TICKS))
+
+    def _push(self, actor, time):
+        entry = self._entries.get(actor)
+        if entry is not None:
+            entry[3] = None  # Superseded: skipped when it surfaces
+        entry = [time, self._orders[actor], next(self._sequence), actor]
+        self._entries[actor] = entry
+        heapq.heappush(self._heap, entry)
+
+    def __len__(self):
+        """How many combatants are queued."""
+        return len(self._entries)
+
+    def pop(self):
+        """
+        Advances time to the next living combatant's action and returns it,
+        or None if no one is left. Rounds it skips past are ended.
+        """
+        heap = self._heap
+        while heap:
+            time, _, _, actor = heapq.heappop(heap)
+            if actor is None:
+                continue
+            del self._entries[actor]
+            if not actor.is_alive():
+                continue
+            self.now = time
+            while time >= self.round * TURN_TICKS:
+                self.round += 1
+            return actor
+        return None
+
+    def done(self, actor):
+        """
+        Queues `actor`'s next action after it has taken its turn, and ends the
+        round if it was the last due in it. Not called for a combatant that
+        died on its own turn, so its turn does not end the round.
+        """
+        self._push(actor, self.now + action_interval(actor))
+        heap = self._heap
+        while heap[0][3] is None:  # Drop superseded entries to see what's next
+            heapq.heappop(heap)
+        if heap[0][0] >= self.round * TURN_TICKS:
+            self.round += 1
+
+    def shift(self, actor, ticks):
+        """
+        Delays a queued combatant's next action by `ticks` (or brings it
+        forward, if negative, but not before now).
+        """
+        entry = self._entries.get(actor)
+        if entry is not None:
+            self._push(actor, max(self.now, entry[0] + ticks))
+
+
+class _Alternation:
+    """
+    Stands in for the Timeline of a one-on-one battle at DEFAULT_SPEED, where
+    the player and boss strictly alternate, one round each. The first speed
+    change builds the Timeline the battle would have had by then, with
+    `actor` mid-turn, and hands the change (and the battle) over to it.
+    """
+
+    __slots__ = ("player", "boss", "round", "actor", "timeline")
+
+    def __init__(self, player, boss):
+        self.player = player
+        self.boss = boss
+        self.round = 1
+        self.actor = player
+        self.timeline = None
+        player.timeline = boss.timeline = self
+
+    def shift(self, actor, ticks):
+        timeline = self.timeline
+        if timeline is None:
+            timeline = self.timeline = Timeline()
+            timeline.round = self.round
+            timeline.now = (self.round - 1) * TURN_TICKS
+            timeline.add(self.player)
+            timeline.add(self.boss)
+            timeline.pop()
+            if self.actor is self.boss:
+                # The player's turn is over: queue its next one a round on,
+                # at the speed it had then (done() would see the new one)
+                timeline._push(self.player, timeline.now + TURN_TICKS)
+                timeline.pop()
+        timeline.shift(actor, ticks)
+
+
+def delay_actor(character, ticks):
+    """Delays (or with negative ticks, hastens) the character's next action."""
+    if character.timeline is not None:
+        character.timeline.shift(character, ticks)
+
+
+# --- Battle Events ---
+
+# Events reported to a combatant's listener, called as
+# listener(character, event, code, value, critical) after the event happened.
+EVENT_ACTION = 1  # code: action_id(), value: mana left
+EVENT_DAMAGE = 2  # value: damage taken, critical: it was a critical hit
+EVENT_HEAL = 3  # value: HP restored
+EVENT_EFFECT_APPLIED = 4  # code: effect order, value: turns
+EVENT_EFFECT_TICK = 5  # code: effect order, value: turns left
+EVENT_EFFECT_EXPIRED = 6  # code: effect order
+EVENT_PHASE = 7  # code: index of the boss phase entered
+
+
+def emit(character, event, code=0, value=0, critical=False):
+    """Reports an event to the character's listener, if it has one."""
+    listener = character.listener
+    if listener is not None:
+        listener(character, event, code, value, critical)
+
+
+class Listeners(list):
+    """Several listeners of one character, called in the order they were added."""
+
+    __slots__ = ()
+
+    def __call__(self, character, event, code, value, critical):
+        for listener in self:
+            listener(character, event, code, value, critical)
+
+
+def add_listener(character, listener):
+    """Adds a listener to the character's, so that each receives every event."""
+    current = character.listener
+    if current is None:
+        character.listener = listener
+    elif type(current) is Listeners:
+        current.append(listener)
+    else:
+        character.listener = Listeners((current, listener))
+
+
+def remove_listener(character, listener):
+    """Stops a listener added with add_listener() from receiving events."""
+    current = character.listener
+    if current is listener:
+        character.listener = None
+    elif type(current) is Listeners and listener in current:
+        current.remove(listener)
+        if len(current) == 1:
+            character.listener = current[0]
+
+
+def action_id(action, ability_key=None):
+    """
+    Compact id of a player action: its combat menu code, or "3" followed by
+    the ability key for abilities (e.g. 31 for ability 1).
+    """
+    return int(action + ability_key) if action == "3" else int(action)
+
+
+# --- Status Effects ---
+
+
+class StatusEffectType:
+    """Definition of a status effect: how it ticks and what happens when it ends."""
+
+    __slots__ = (
+        "name",
+        "color",
+        "order",
+        "refresh",
+        "skips_turn",
+        "on_apply",
+        "on_tick",
+        "on_expire",
+    )
+
+    def __init__(
+        self, name, color, order, refresh, skips_turn, on_apply, on_tick, on_expire
+    ):
+        self.name = name
+        self.color = color  # Name of a Colors attribute, looked up when rendering
+        self.order = order  # Effects tick in registration order
+        self.refresh = refresh  # Re-applying resets the duration instead of no-op
+        self.skips_turn = skips_turn  # Ends the turn and the tick early
+        self.on_apply = on_apply  # (character, effect) when first applied
+        self.on_tick = on_tick  # (character, effect) at the start of each turn
+        self.on_expire = on_expire  # (character, effect) when it wears off
+
+
+class StatusEffect:
+    """An effect currently active on a combatant."""
+
+    __slots__ = ("kind", "turns", "magnitude")
+
+    def __init__(self, kind, turns, magnitude=0):
+        self.kind = kind
+        self.turns = turns
+        self.magnitude = magnitude  # e.g. how much attack a debuff removes
+
+
+class StatusEffects:
+    """
+    A combatant's active status effects. Stored as a short list kept in tick
+    order rather than a dict, with a dict-like interface keyed by effect name.
+    """
+
+    __slots__ = ("_active",)
+
+    def __init__(self):
+        self._active = []
+
+    def __len__(self):
+        return len(self._active)
+
+    def __iter__(self):
+        return iter([effect.kind.name for effect in self._active])
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def get(self, name, default=None):
+        for effect in self._active:
+            if effect.kind.name == name:
+                return effect
+        return default
+
+    def __getitem__(self, name):
+        effect = self.get(name)
+        if effect is None:
+            raise KeyError(name)
+        return effect
+
+    def __setitem__(self, name, effect):
+        self.pop(name, None)
+        order = effect.kind.order
+        index = len(self._active)
+        while index and self._active[index - 1].kind.order > order:
+            index -= 1
+        self._active.insert(index, effect)
+
+    def __delitem__(self, name):
+        if self.pop(name, None) is None:
+            raise KeyError(name)
+
+    def pop(self, name, default=None):
+        for index, effect in enumerate(self._active):
+            if effect.kind.name == name:
+                del self._active[index]
+                return effect
+        return default
+
+    def values(self):
+        """Active effects in tick order (a copy, safe to modify the store while iterating)."""
+        return list(self._active)
+
+    def items(self):
+        return [(effect.kind.name, effect) for effect in self._active]
+
+    def __repr__(self):
+        return f"StatusEffects({dict(self.items())!r})"
+
+
+STATUS_EFFECTS = {}
+
+
+def register_status_effect(
+    name,
+    color="PURPLE",
+    refresh=False,
+    skips_turn=False,
+    on_apply=None,
+    on_tick=None,
+    on_expire=None,
+):
+    """Adds a status effect type to the registry."""
+    kind = StatusEffectType(
+        name,
+        color,
+        len(STATUS_EFFECTS),
+        refresh,
+        skips_turn,
+        on_apply,
+        on_tick,
+        on_expire,
+    )
+    STATUS_EFFECTS[name] = kind
+    return kind
+
+
+def apply_status(target, name, turns, magnitude=0):
+    """
+    Applies a status effect. Returns True if it was applied (or its duration
+    refreshed), False if the target already had it.
+    """
+    kind = STATUS_EFFECTS[name]
+    active = target.status_effects.get(name)
+    if active is not None:
+        if not kind.refresh:
+            return False
+        active.turns = turns
+        emit(target, EVENT_EFFECT_APPLIED, kind.order, turns)
+        return True
+    effect = StatusEffect(kind, turns, magnitude)
+    target.status_effects[name] = effect
+    if kind.on_apply:
+        kind.on_apply(target, effect)
+    emit(target, EVENT_EFFECT_APPLIED, kind.order, turns)
+    return True
+
+
+def remove_status(target, name):
+    """Ends a status effect early, running its expiry handler."""
+    effect = target.status_effects.pop(name, None)
+    if effect is None:
+        return False
+    if effect.kind.on_expire:
+        effect.kind.on_expire(target, effect)
+    emit(target, EVENT_EFFECT_EXPIRED, effect.kind.order)
+    return True
+
+
+def process_status_effects(character):
+    """Applies and removes status effects at the start of a turn."""
+    if character.timed_modifiers:
+        character.tick_modifiers()
+    effects = character.status_effects
+    if not effects:
+        return False
+
+    for effect in effects.values():
+        kind = effect.kind
+        if kind.on_tick:
+            kind.on_tick(character, effect)
+        effect.turns -= 1
+        if effect.turns <= 0:
+            del effects[kind.name]
+            if kind.on_expire:
+                kind.on_expire(character, effect)
+            emit(character, EVENT_EFFECT_EXPIRED, kind.order)
+        else:
+            emit(character, EVENT_EFFECT_TICK, kind.order, effect.turns)
+        if kind.skips_turn:
+            return True  # Skip the turn; later effects don't tick
+
+    return False  # Normal turn
+
+
+def _lower_attack(character, effect):
+    """Lowers attack by the effect's magnitude for as long as the effect lasts."""
+    character.add_modifier(effect.kind.name, "attack", -effect.magnitude)
+
+
+def _restore_attack(character, effect):
+    character.remove_modifiers(effect.kind.name)
+
+
+def _poison_tick(character, effect):
+    print_slow(f"{character.name} takes 5 damage from poison!", color=Colors.GREEN)
+    character.hp = max(0, character.hp - 5)
+
+
+def _poison_expire(character, effect):
+    print_slow(f"{character.name} is no longer poisoned.", color=Colors.GREEN)
+
+
+def _burning_tick(character, effect):
+    print_slow(
+        f"{character.name} takes 4 damage from burning!", color=Colors.BRIGHT_RED
+    )
+    character.hp = max(0, character.hp - 4)
+
+
+def _burning_expire(character, effect):
+    print_slow(f"{character.name} is no longer burning.", color=Colors.BRIGHT_RED)
+
+
+def _stunned_tick(character, effect):
+    print_slow(f"{character.name} is stunned and loses their turn!")
+
+
+def _cursed_expire(character, effect):
+    print_slow(f"{character.name} is no longer cursed.")
+    _restore_attack(character, effect)
+
+
+def _intimidated_expire(character, effect):
+    print_slow(f"{character.name} is no longer intimidated.")
+    _restore_attack(character, effect)
+
+
+def _entangled_tick(character, effect):
+    print_slow(f"{character.name} is entangled and struggles to move!")
+
+
+def _entangled_expire(character, effect):
+    print_slow(f"{character.name} breaks free from the entanglement.")
+
+
+def _frozen_expire(character, effect):
+    print_slow(f"{character.name} thaws out.", color=Colors.BRIGHT_CYAN)
+    _restore_attack(character, effect)
+
+
+def _change_speed(character, name, change):
+    """
+    Changes speed by `change` under the modifier source `name` (None removes
+    it) and moves the character's next action to match its new speed.
+    """
+    before = action_interval(character)
+    if change is None:
+        character.remove_modifiers(name)
+    else:
+        character.add_modifier(name, "speed", change)
+    delay_actor(character, action_interval(character) - before)
+
+
+def _hasted_apply(character, effect):
+    _change_speed(character, effect.kind.name, effect.magnitude)
+
+
+def _slowed_apply(character, effect):
+    _change_speed(character, effect.kind.name, -effect.magnitude)
+
+
+def _hasted_expire(character, effect):
+    print_slow(f"{character.name} is no longer hasted.", color=Colors.BRIGHT_YELLOW)
+    _change_speed(character, effect.kind.name, None)
+
+
+def _slowed_expire(character, effect):
+    print_slow(f"{character.name} is no longer slowed.", color=Colors.BRIGHT_BLUE)
+    _change_speed(character, effect.kind.name, None)
+
+
+register_status_effect(
+    "poison", "GREEN", on_tick=_poison_tick, on_expire=_poison_expire
+)
+register_status_effect(
+    "burning", "RED", on_tick=_burning_tick, on_expire=_burning_expire
+)
+register_status_effect(
+    "stunned", "YELLOW", refresh=True, skips_turn=True, on_tick=_stunned_tick
+)
+register_status_effect("cursed", on_apply=_lower_attack, on_expire=_cursed_expire)
+register_status_effect(
+    "intimidated", on_apply=_lower_attack, on_expire=_intimidated_expire
+)
+register_status_effect(
+    "entangled",
+    refresh=True,
+    on_tick=_entangled_tick,
+    on_expire=_entangled_expire,
+)
+register_status_effect(
+    "frozen", "CYAN", on_apply=_lower_attack, on_expire=_frozen_expire
+)
+# Registered after the original effects to keep their journal codes
+register_status_effect(
+    "hasted", "YELLOW", on_apply=_hasted_apply, on_expire=_hasted_expire
+)
+register_status_effect(
+    "slowed", "BLUE", on_apply=_slowed_apply, on_expire=_slowed_expire
+)
+
+
+# --- Abilities ---
+
+
+class Ability:
+    """A castable player ability, resolved once when its class is defined."""
+
+    __slots__ = ("key", "name", "cost", "handler", "targeted", "area", "value")
+
+    def __init__(self, key, name, cost, handler, targeted, area=False, value=None):
+        self.key = key
+        self.name = name
+        self.cost = cost
+        self.handler = handler
+        self.targeted = targeted  # True if it acts on the enemy, False if on self
+        self.area = area  # True if it hits every enemy (handler gets a list)
+        # (caster, target) -> rough worth of a cast in HP, damage dealt plus
+        # damage prevented, for policies to weigh against a basic attack
+        self.value = value
+
+    def cast(self, caster, target, enemies=None):
+        """
+        Casts the ability on `target`; area abilities hit every living enemy
+        in `enemies` (a Roster) instead, or just `target` without one.
+        """
+        if self.area:
+            targets = [target] if enemies is None else enemies.living()
+            self.handler(caster, targets)
+        elif self.targeted:
+            self.handler(caster, target)
+        else:
+            self.handler(caster)
+
+
+ABILITY_TABLES = {}  # role -> {menu key: Ability}
+
+
+def ability(role, key, name, cost, area=False, value=None):
+    """
+    Registers a Player method as an ability of `role` under menu `key`.
+    `value` estimates what a cast is worth (see Ability.value).
+    """
+
+    def register(handler):
+        # Handlers take (self, target) for enemy abilities, (self) for
+        # self-buffs and (self, targets) for area abilities
+        targeted = handler.__code__.co_argcount > 1
+        ABILITY_TABLES.setdefault(role, {})[key] = Ability(
+            key, name, cost, handler, targeted, area, value
+        )
+        return handler
+
+    return register
+
+
+def expected_hit(damage, target, chance=1.0):
+    """Average HP a hit of `damage` that lands with `chance` takes off `target`."""
+    return chance * max(0, damage - target.defense)
+
+
+def status_worth(target, name, worth):
+    """`worth` if applying status `name` to `target` would take, else 0."""
+    return 0 if name in target.status_effects else worth
+
+
+# --- Character and Boss Blueprints (Classes) ---
+
+
+class Character:
+    """Base class for all characters, including the player."""
+
+    __slots__ = (
+        "name",
+        "max_hp",
+        "hp",
+        "base_attack",
+        "attack",  # Derived: base + weapon + modifiers (see _update_stats())
+        "base_defense",
+        "defense",  # Derived, like attack
+        "base_speed",
+        "speed",  # Derived, like attack; sets how often it acts (see Timeline)
+        "modifiers",
+        "timed_modifiers",  # How many modifiers have a duration
+        "is_defending",
+        "status_effects",
+        "weapon",
+        "rng",
+        "listener",  # Receives battle events (see emit()), or None
+        "timeline",  # The Timeline it is queued in, or None
+    )
+
+    abilities = {}
+
+    def __init__(self, name, hp, attack, defense, rng=None, speed=DEFAULT_SPEED):
+        self.name = name
+        self.max_hp = hp
+        self.hp = hp
+        self.base_attack = attack
+        self.base_defense = defense
+        self.base_speed = speed
+        # (source, stat, value, turns left or None) buffs and debuffs; a
+        # tuple, so a battle state snapshot can share it
+        self.modifiers = ()
+        self.timed_modifiers = 0
+        self.is_defending = False
+        self.status_effects = StatusEffects()
+        self.weapon = None
+        self.rng = rng or default_rng
+        self.listener = None
+        self.timeline = None
+        self._update_stats()
+
+    def equip_weapon(self, weapon):
+        """Equip a weapon and apply its bonuses."""
+        self.weapon = weapon
+        self._update_stats()
+
+    # --- Stat Modifiers ---
+    def add_modifier(self, source, stat, value, turns=None):
+        """
+        Modifies "attack", "defense" or "speed" by `value` until the start of this
+        character's `turns`-th turn from now (None: until removed). A source
+        holds one modifier per stat, so applying it again replaces the old one
+        instead of stacking.
+        """
+        modifiers = [
+            modifier
+            for modifier in self.modifiers
+            if modifier[0] != source or modifier[1] != stat
+        ]
+        modifiers.append((source, stat, value, turns))
+        self.modifiers = tuple(modifiers)
+        self._update_stats()
+
+    def remove_modifiers(self, source):
+        """Removes every modifier from `source`."""
+        modifiers = tuple(
+            modifier for modifier in self.modifiers if modifier[0] != source
+        )
+        if len(modifiers) != len(self.modifiers):
+            self.modifiers = modifiers
+            self._update_stats()
+
+    def tick_modifiers(self):
+        """Counts down timed modifiers at the start of a turn, dropping expired ones."""
+        modifiers = []
+        for modifier in self.modifiers:
+            source, stat, value, turns = modifier
+            if turns is None:
+                modifiers.append(modifier)
+            elif turns > 1:
+                modifiers.append((source, stat, value, turns - 1))
+        expired = len(modifiers) != len(self.modifiers)
+        self.modifiers = tuple(modifiers)
+        if expired:
+            self._update_stats()
+
+    def _update_stats(self):
+        """
+        Recomputes the derived attack, defense and speed. They only change with the
+        weapon or the modifiers, so reading them is a plain attribute access.
+        """
+        attack, defense = self.base_attack, self.base_defense
+        speed = self.base_speed
+        if self.weapon:
+            attack += self.weapon.attack_bonus
+            defense += self.weapon.defense_bonus
+        timed = 0
+        for _, stat, value, turns in self.modifiers:
+            if stat == "attack":
+                attack += value
+            elif stat == "defense":
+                defense += value
+            else:
+                speed += value
+            timed += turns is not None
+        self.attack = max(1, attack)
+        self.defense = max(0, defense)
+        self.speed = max(MIN_SPEED, speed)
+        self.timed_modifiers = timed
+
+    def get_total_crit_chance(self):
+        """Calculate total critical hit chance."""
+        base_crit = 0.10  # 10% base
+        weapon_crit = self.weapon.crit_chance if self.weapon else 0
+        return base_crit + weapon_crit
+
+    def is_alive(self):
+        """Check if the character's HP is above 0."""
+        return self.hp > 0
+
+    def take_damage(self, damage, attacker_name="An opponent", attacker=None):
+        """Calculates and applies damage to the character, with a chance for a critical hit."""
+        # Critical Hit Chance
+        crit_chance = attacker.get_total_crit_chance() if attacker else 0.10
+        is_critical = self.rng.chance(crit_chance)
+        if is_critical:
+            damage = int(damage * 1.5)
+            print_slow(
+                f"*** CRITICAL HIT from {attacker_name}! ***",
+                color=Colors.BRIGHT_RED + Colors.BLINK,
+            )
+
+        # Apply weapon special effects if attacker has a weapon
+        if attacker and attacker.weapon:
+            attacker.weapon.apply_special_effect(attacker, self)
+
+        actual_defense = self.defense * 2 if self.is_defending else self.defense
+        damage_taken = max(0, damage - actual_defense)
+        self.hp -= damage_taken
+        self.hp = max(0, self.hp)  # Can't have negative HP
+        if self.is_defending:
+            print_slow(
+                f"{self.name} defends and mitigates some damage!", color=Colors.BLUE
+            )
+        print_slow(f"{self.name} takes {damage_taken} damage!", color=Colors.RED)
+        emit(self, EVENT_DAMAGE, 0, damage_taken, is_critical)
+        return damage_taken
+
+    def heal(self, amount):
+        """Heals the character."""
+        self.hp += amount
+        self.hp = min(self.max_hp, self.hp)
+        print_slow(f"{self.name} heals for {amount} HP!", color=Colors.BRIGHT_GREEN)
+        emit(self, EVENT_HEAL, 0, amount)
+
+    def display_status(self):
+        """Shows the character's current status."""
+        write_lines(self.render_status())
+
+    def render_status(self):
+        """Builds the character's status box with colored HP bars and nice formatting."""
+        # Calculate HP percentage for color coding
+        hp_percentage = self.hp / self.max_hp
+        if hp_percentage > 0.6:
+            hp_color = Colors.GREEN
+        elif hp_percentage > 0.3:
+            hp_color = Colors.YELLOW
+        else:
+            hp_color = Colors.RED
+
+        # Create colored HP bar with better visual design
+        filled_blocks = int((self.hp / self.max_hp) * 25)
+        empty_blocks = 25 - filled_blocks
+        hp_bar = f"[{colorize('█' * filled_blocks, hp_color)}{colorize('░' * empty_blocks, Colors.GRAY)}]"
+
+        name_color = get_class_color(getattr(self, "role", "default"))
+
+        lines = [
+            f"HP: {colorize(f'{self.hp:3d}', hp_color)}/{self.max_hp:<3d} {hp_bar}"
+        ]
+
+        if self.status_effects:
+            effects = []
+            for name, effect in self.status_effects.items():
+                effect_color = getattr(Colors, effect.kind.color)
+                effects.append(
+                    f"{colorize(name.capitalize(), effect_color)} ({effect.turns})"
+                )
+            lines.append(f"Status: {', '.join(effects)}")
+
+        return render_box(colorize(self.name, Colors.BOLD + name_color), lines)
+
+
+class Player(Character):
+    """Player character class with specific abilities based on their role."""
+
+    __slots__ = (
+        "character_class",
+        "role",
+        "max_mana",
+        "mana",
+        "potions",
+        "abilities",
+    )
+
+    def __init__(self, name, character_class, rng=None):
+        super().__init__(
+            name,
+            character_class.hp,
+            character_class.attack,
+            character_class.defense,
+            rng,
+            character_class.speed,
+        )
+        self.character_class = character_class
+        self.role = character_class.name
+        self.max_mana = character_class.mana
+        self.mana = character_class.mana
+        self.potions = 3
+        # Shared per-role table built once by the @ability decorators below
+        self.abilities = character_class.abilities
+
+    def render_status(self):
+        """Builds the player's status box with enhanced formatting including mana and potions."""
+        # Calculate HP percentage for color coding
+        hp_percentage = self.hp / self.max_hp
+        if hp_percentage > 0.6:
+            hp_color = Colors.GREEN
+        elif hp_percentage > 0.3:
+            hp_color = Colors.YELLOW
+        else:
+            hp_color = Colors.RED
+
+        # Create colored HP bar with better visual design
+        filled_blocks = int((self.hp / self.max_hp) * 25)
+        empty_blocks = 25 - filled_blocks
+        hp_bar = f"[{colorize('█' * filled_blocks, hp_color)}{colorize('░' * empty_blocks, Colors.GRAY)}]"
+
+        # Colored mana bar
+        mana_percentage = self.mana / self.max_mana
+        if mana_percentage > 0.6:
+            mana_color = Colors.BRIGHT_BLUE
+        elif mana_percentage > 0.3:
+            mana_color = Colors.BLUE
+        else:
+            mana_color = Colors.PURPLE
+
+        filled_mana = int((self.mana / self.max_mana) * 15)
+        empty_mana = 15 - filled_mana
+        mana_bar = f"[{colorize('▓' * filled_mana, mana_color)}{colorize('░' * empty_mana, Colors.GRAY)}]"
+
+        # Colored potion count
+        potion_color = Colors.GREEN if self.potions > 0 else Colors.RED
+
+        name_color = get_class_color(self.role)
+
+        potion_icons = "🧪" * self.potions
+        potions_line = (
+            f"Potions: {colorize(str(self.potions), potion_color)} {potion_icons}"
+        ).rstrip()
+
+        lines = [
+            f"HP: {colorize(f'{self.hp:3d}', hp_color)}/{self.max_hp:<3d} {hp_bar}",
+            f"MP: {colorize(f'{self.mana:3d}', mana_color)}/{self.max_mana:<3d} {mana_bar}",
+            potions_line,
+        ]
+
+        if self.status_effects:
+            effects = []
+            for name, effect in self.status_effects.items():
+                effect_color = getattr(Colors, effect.kind.color)
+                effects.append(
+                    f"{colorize(name.capitalize(), effect_color)} ({effect.turns})"
+                )
+            lines.append(f"Status: {', '.join(effects)}")
+
+        return render_box(
+            colorize(f"{self.name} ({self.role})", Colors.BOLD + name_color), lines
+        )
+
+    def regenerate_mana(self):
+        """Regenerate a small amount of mana each turn."""
+        mana_regen = 5
+        self.mana = min(self.max_mana, self.mana + mana_regen)
+
+    # --- Centralized Damage Calculation Methods ---
+    def deal_basic_damage(self, target, multiplier=1.0, bonus_min=0, bonus_max=0):
+        """Deal basic attack damage with optional multiplier and random bonus."""
+        base_damage = int(self.attack * multiplier)
+        if bonus_min or bonus_max:
+            base_damage += self.rng.randint(bonus_min, bonus_max)
+        target.take_damage(base_damage, self.name, self)
+
+    def deal_enhanced_damage(self, target, multiplier=1.5):
+        """Deal enhanced damage (common 1.5x multiplier pattern)."""
+        damage = int(self.attack * multiplier)
+        target.take_damage(damage, self.name, self)
+
+    def deal_random_bonus_damage(self, target, min_bonus=8, max_bonus=15):
+        """Deal attack + random bonus damage (common pattern)."""
+        damage = self.attack + self.rng.randint(min_bonus, max_bonus)
+        target.take_damage(damage, self.name, self)
+
+    def apply_status_effect(
+        self, target, effect_name, duration, message=None, magnitude=0
+    ):
+        """Apply a status effect to target with optional message."""
+        if apply_status(target, effect_name, duration, magnitude):
+            color = getattr(Colors, STATUS_EFFECTS[effect_name].color)
+            print_slow(
+                message or f"{target.name} is affected by {effect_name}!", color=color
+            )
+
+    # --- Warrior Abilities ---
+    @ability(
+        "Warrior",
+        "1",
+        "Power Strike",
+        cost=10,
+        value=lambda self, target: expected_hit(int(self.attack * 1.5), target),
+    )
+    def _power_strike(self, target):
+        print_slow(f"{self.name} uses Power Strike!", color=Colors.RED)
+        self.deal_enhanced_damage(target, 1.5)
+
+    @ability("Warrior", "2", "Shield Wall", cost=5)
+    def _shield_wall(self):
+        print_slow(
+            f"{self.name} raises their shield, preparing for the next attack!",
+            color=Colors.BLUE,
+        )
+        self.is_defending = True  # Handled in the main game loop
+
+    @ability(
+        "Warrior",
+        "3",
+        "Reckless Swing",
+        cost=20,
+        value=lambda self, target: expected_hit(self.attack * 2, target),
+    )
+    def _reckless_swing(self, target):
+        print_slow(
+            f"{self.name} throws caution to the wind with a Reckless Swing!",
+            color=Colors.BRIGHT_RED,
+        )
+        self.add_modifier("reckless_swing", "defense", -3, turns=1)
+        print_slow(
+            f"{self.name}'s defense is temporarily lowered!", color=Colors.YELLOW
+        )
+        self.deal_basic_damage(target, 2.0)
+
+    # --- Mage Abilities ---
+    @ability(
+        "Mage",
+        "1",
+        "Fireball",
+        cost=15,
+        area=True,
+        value=lambda self, target: expected_hit(20, target),
+    )
+    def _fireball(self, targets):
+        print_slow(f"{self.name} casts Fireball!", color=Colors.BRIGHT_RED)
+        for target in targets:
+            damage = self.rng.randint(15, 25)
+            target.take_damage(damage, self.name, self)
+
+    @ability("Mage", "2", "Heal", cost=20)
+    def _heal_spell(self):
+        print_slow(f"{self.name} casts a healing spell!", color=Colors.BRIGHT_GREEN)
+        heal_amount = self.rng.randint(20, 30)
+        self.heal(heal_amount)
+
+    @ability("Mage", "3", "Arcane Shield", cost=25)
+    def _arcane_shield(self):
+        print_slow(f"{self.name} conjures an Arcane Shield!", color=Colors.BRIGHT_BLUE)
+        self.add_modifier("arcane_shield", "defense", 5, turns=1)
+        print_slow(f"{self.name}'s defense is temporarily boosted!", color=Colors.CYAN)
+
+    # --- Archer Abilities ---
+    @ability(
+        "Archer",
+        "1",
+        "Aimed Shot",
+        cost=10,
+        value=lambda self, target: expected_hit(self.attack + 11.5, target, 0.85),
+    )
+    def _aimed_shot(self, target):
+        print_slow(f"{self.name} takes careful aim for an Aimed Shot!")
+        if self.rng.chance(0.85):
+            self.deal_random_bonus_damage(target, 8, 15)
+        else:
+            print_slow(f"{self.name}'s arrow misses!")
+
+    @ability(
+        "Archer",
+        "2",
+        "Poison Arrow",
+        cost=15,
+        value=lambda self, target: expected_hit(self.attack, target)
+        + status_worth(target, "poison", 15),
+    )
+    def _poison_arrow(self, target):
+        print_slow(f"{self.name} fires a Poison Arrow!")
+        target.take_damage(self.attack, self.name, self)
+        self.apply_status_effect(
+            target, "poison", 3, f"{target.name} has been poisoned!"
+        )
+
+    @ability(
+        "Archer",
+        "3",
+        "Double Shot",
+        cost=20,
+        value=lambda self, target: 2 * expected_hit(self.attack, target),
+    )
+    def _double_shot(self, target):
+        print_slow(f"{self.name} fires two arrows in quick succession!")
+        target.take_damage(self.attack, self.name, self)
+        pause(0.5)
+        target.take_damage(self.attack, self.name, self)
+
+    # --- Paladin Abilities ---
+    @ability(
+        "Paladin",
+        "1",
+        "Holy Strike",
+        cost=15,
+        value=lambda self, target: expected_hit(self.attack + 14, target),
+    )
+    def _paladin_holy_strike(self, target):
+        print_slow(
+            f"{self.name} delivers a radiant Holy Strike!", color=Colors.BRIGHT_YELLOW
+        )
+        self.deal_random_bonus_damage(target, 10, 18)
+
+    @ability("Paladin", "2", "Divine Shield", cost=15)
+    def _divine_shield(self):
+        print_slow(
+            f"{self.name} is blessed with a Divine Shield!", color=Colors.BRIGHT_YELLOW
+        )
+        self.is_defending = True
+        self.add_modifier("divine_shield", "defense", 6, turns=1)
+        print_slow(f"{self.name}'s defense surges temporarily!", color=Colors.YELLOW)
+
+    @ability("Paladin", "3", "Lay on Hands", cost=30)
+    def _lay_on_hands(self):
+        print_slow(
+            f"{self.name} uses Lay on Hands to heal wounds!", color=Colors.BRIGHT_GREEN
+        )
+        heal_amount = self.rng.randint(25, 35)
+        self.heal(heal_amount)
+
+    # --- Rogue Abilities ---
+    @ability(
+        "Rogue",
+        "1",
+        "Backstab",
+        cost=15,
+        value=lambda self, target: expected_hit(
+            int(self.attack * 1.6) + 7.5, target, 0.8
+        ),
+    )
+    def _rogue_backstab(self, target):
+        print_slow(f"{self.name} attempts a deadly Backstab!")
+        if self.rng.chance(0.2):
+            print_slow(f"{self.name} misses the mark!")
+            return
+        self.deal_basic_damage(target, 1.6, 5, 10)
+
+    @ability("Rogue", "2", "Evasion", cost=10)
+    def _evasion(self):
+        print_slow(f"{self.name} focuses on Evasion, ready to slip past attacks!")
+        self.is_defending = True
+        self.add_modifier("evasion", "defense", 3, turns=1)
+        print_slow(f"{self.name}'s agility increases defense temporarily!")
+
+    @ability(
+        "Rogue",
+        "3",
+        "Flurry",
+        cost=25,
+        value=lambda self, target: 3 * expected_hit(max(1, self.attack - 2), target),
+    )
+    def _flurry(self, target):
+        print_slow(f"{self.name} unleashes a Flurry of strikes!")
+        for _ in range(3):
+            target.take_damage(max(1, self.attack - 2), self.name, self)
+            pause(0.3)
+
+    # --- Necromancer Abilities ---
+    @ability(
+        "Necromancer",
+        "1",
+        "Drain Life",
+        cost=20,
+        value=lambda self, target: expected_hit(14, target) * 1.5,
+    )
+    def _drain_life(self, target):
+        print_slow(f"{self.name} drains the life force from {target.name}!")
+        damage = self.rng.randint(10, 18)
+        actual_damage = target.take_damage(damage, self.name, self)
+        heal_amount = actual_damage // 2
+        self.heal(heal_amount)
+        print_slow(f"{self.name} absorbs {heal_amount} HP!")
+
+    @ability("Necromancer", "2", "Bone Armor", cost=15)
+    def _bone_armor(self):
+        print_slow(f"{self.name} conjures protective bone armor!")
+        self.add_modifier("bone_armor", "defense", 8, turns=1)
+        print_slow(f"{self.name}'s defense is significantly boosted!")
+
+    @ability(
+        "Necromancer",
+        "3",
+        "Curse",
+        cost=25,
+        value=lambda self, target: status_worth(target, "cursed", 20),
+    )
+    def _curse(self, target):
+        print_slow(f"{self.name} places a dark curse on {target.name}!")
+        self.apply_status_effect(
+            target,
+            "cursed",
+            4,
+            f"{target.name} feels weakened by the curse!",
+            magnitude=5,
+        )
+
+    # --- Monk Abilities ---
+    @ability(
+        "Monk",
+        "1",
+        "Chi Strike",
+        cost=15,
+        value=lambda self, target: expected_hit(self.attack + 11.5, target),
+    )
+    def _chi_strike(self, target):
+        print_slow(f"{self.name} focuses chi energy into a powerful strike!")
+        self.deal_random_bonus_damage(target, 8, 15)
+        # Chi strike restores some mana
+        self.mana = min(self.max_mana, self.mana + 5)
+        print_slow(f"{self.name} regains 5 mana through meditation!")
+
+    @ability("Monk", "2", "Inner Peace", cost=10)
+    def _inner_peace(self):
+        print_slow(f"{self.name} achieves inner peace, restoring body and mind!")
+        heal_amount = self.rng.randint(15, 25)
+        mana_restore = self.rng.randint(10, 20)
+        self.heal(heal_amount)
+        self.mana = min(self.max_mana, self.mana + mana_restore)
+        print_slow(f"{self.name} restores {mana_restore} mana!")
+
+    @ability(
+        "Monk",
+        "3",
+        "Flurry of Blows",
+        cost=20,
+        value=lambda self, target: sum(
+            expected_hit(max(1, self.attack - 3 + hit), target) for hit in range(4)
+        ),
+    )
+    def _flurry_of_blows(self, target):
+        print_slow(f"{self.name} unleashes a disciplined flurry of blows!")
+        for i in range(4):
+            damage = max(1, self.attack - 3 + i)  # Each hit gets slightly stronger
+            target.take_damage(damage, self.name, self)
+            pause(0.2)
+
+    # --- Barbarian Abilities ---
+    @ability("Barbarian", "1", "Rage", cost=10)
+    def _rage(self):
+        print_slow(f"{self.name} enters a berserker RAGE!")
+        self.add_modifier("rage", "attack", 8, turns=3)
+        self.add_modifier("rage", "defense", -2, turns=3)  # Trade defense for offense
+        print_slow(f"{self.name}'s attack increases but defense drops!")
+
+    @ability(
+        "Barbarian",
+        "2",
+        "Intimidate",
+        cost=5,
+        area=True,
+        value=lambda self, target: status_worth(target, "intimidated", 12),
+    )
+    def _intimidate(self, targets):
+        print_slow(f"{self.name} lets out a terrifying war cry!")
+        for target in targets:
+            self.apply_status_effect(
+                target,
+                "intimidated",
+                3,
+                f"{target.name} is intimidated and deals less damage!",
+                magnitude=4,
+            )
+
+    @ability(
+        "Barbarian",
+        "3",
+        "Berserker Strike",
+        cost=25,
+        value=lambda self, target: expected_hit(self.attack * 2 + 10, target, 0.75),
+    )
+    def _berserker_strike(self, target):
+        print_slow(f"{self.name} strikes with wild, uncontrolled fury!")
+        # High damage but chance to miss
+        if self.rng.chance(0.75):
+            self.deal_basic_damage(target, 2.0, 5, 15)
+        else:
+            print_slow(f"{self.name}'s wild swing misses completely!")
+
+    # --- Druid Abilities ---
+    @ability(
+        "Druid",
+        "1",
+        "Nature's Wrath",
+        cost=15,
+        value=lambda self, target: expected_hit(18, target),
+    )
+    def _natures_wrath(self, target):
+        print_slow(f"{self.name} calls upon nature's wrath!")
+        # Random nature effect
+        effects = ["thorns", "lightning", "earthquake"]
+        effect = self.rng.choice(effects)
+        if effect == "thorns":
+            print_slow("Thorny vines erupt from the ground!")
+            damage = self.rng.randint(12, 20)
+            target.take_damage(damage, "Nature", self)
+            apply_status(target, "entangled", 2)
+        elif effect == "lightning":
+            print_slow("Lightning strikes from above!")
+            damage = self.rng.randint(15, 25)
+            target.take_damage(damage, "Lightning", self)
+        else:  # earthquake
+            print_slow("The ground shakes violently!")
+            damage = self.rng.randint(10, 18)
+            target.take_damage(damage, "Earthquake", self)
+            target.add_modifier("earthquake", "defense", -3, turns=3)
+
+    @ability("Druid", "2", "Wild Shape", cost=20)
+    def _wild_shape(self):
+        print_slow(f"{self.name} transforms into a powerful bear!")
+        self.add_modifier("wild_shape", "attack", 6, turns=3)
+        self.add_modifier("wild_shape", "defense", 4, turns=3)
+        self.hp = min(self.max_hp, self.hp + 15)
+        print_slow(f"{self.name}'s combat stats increase in bear form!")
+
+    @ability("Druid", "3", "Healing Spring", cost=25)
+    def _healing_spring(self):
+        print_slow(f"{self.name} creates a magical healing spring!")
+        heal_amount = self.rng.randint(30, 45)
+        self.heal(heal_amount)
+        # Remove negative status effects
+        if remove_status(self, "poison"):
+            print_slow(f"{self.name} is cleansed of poison!")
+        if remove_status(self, "cursed"):
+            print_slow(f"{self.name} is freed from the curse!")
+
+
+# --- Boss Behaviors ---
+# Bosses are defined as data (BOSS_DEFINITIONS) and compiled on first use into
+# phases with cumulative-weight decision tables, so picking an action is a
+# single bisect over a prebuilt tuple.
+
+BOSS_ABILITIES = {}  # ability name -> handler(boss, target)
+
+
+def boss_ability(name):
+    """Registers a Boss method as an ability that boss definitions can name."""
+
+    def register(handler):
+        BOSS_ABILITIES[name] = handler
+        return handler
+
+    return register
+
+
+# Conditions an ability can require, as "name" or "name:argument"
+BOSS_CONDITIONS = {
+    "target_defending": lambda boss, target, arg: target.is_defending,
+    "target_wounded": lambda boss, target, arg: target.hp < target.max_hp * 0.5,
+    "self_wounded": lambda boss, target, arg: boss.hp < boss.max_hp * 0.5,
+    "target_has": lambda boss, target, arg: arg in target.status_effects,
+    "target_lacks": lambda boss, target, arg: arg not in target.status_effects,
+    "self_lacks": lambda boss, target, arg: arg not in boss.status_effects,
+}
+
+
+class BossPhase:
+    """One compiled phase of a boss fight and its decision tables."""
+
+    __slots__ = (
+        "below",
+        "attack_bonus",
+        "defense_bonus",
+        "message",
+        "weights",
+        "conditions",
+        "all_available",
+        "table",
+        "_tables",
+    )
+
+    def __init__(
+        self, below, attack_bonus, defense_bonus, message, weights, conditions
+    ):
+        self.below = below  # Entered once HP drops below this fraction of max HP
+        self.attack_bonus = attack_bonus
+        self.defense_bonus = defense_bonus
+        self.message = message  # Announced on entry; "{name}" is the boss's name
+        self.weights = weights  # Per BossBehavior.abilities entry, 0 if unused
+        self.conditions = conditions  # (ability index, predicate, argument)
+        self.all_available = sum(
+            1 << index for index, weight in enumerate(weights) if weight
+        )
+        self._tables = {}  # availability bitmask -> (indices, cumulative weights)
+        self.table = self.decision_table(self.all_available)
+
+    def decision_table(self, available):
+        """(ability indices, cumulative weights) over the abilities in a bitmask."""
+        table = self._tables.get(available)
+        if table is None:
+            indices = tuple(
+                index for index in range(len(self.weights)) if available >> index & 1
+            )
+            cumulative = tuple(
+                itertools.accumulate(self.weights[index] for index in indices)
+            )
+            table = self._tables[available] = (indices, cumulative)
+        return table
+
+
+class BossBehavior:
+    """A boss definition compiled into phases, shared by every boss of its kind."""
+
+    __slots__ = (
+        "kind",
+        "name",
+        "description",
+        "hp",
+        "attack",
+        "defense",
+        "speed",
+        "abilities",
+        "cooldowns",
+        "phases",
+    )
+
+    def __init__(self, kind, definition):
+        self.kind = kind
+        self.name = definition["name"]
+        self.description = definition.get("description", "")
+        self.hp = definition["hp"]
+        self.attack = definition["attack"]
+        self.defense = definition["defense"]
+        self.speed = definition.get("speed", DEFAULT_SPEED)
+
+        # Every ability any phase uses, in first-seen order
+        specs = {}
+        for phase in definition["phases"]:
+            for name, spec in phase.get("abilities", {}).items():
+                specs.setdefault(name, spec if isinstance(spec, dict) else {})
+        names = list(specs)
+        self.abilities = tuple(BOSS_ABILITIES[name] for name in names)
+        self.cooldowns = tuple(specs[name].get("cooldown", 0) for name in names)
+
+        phases = []
+        abilities = {}
+        for phase in definition["phases"]:
+            abilities = phase.get("abilities", abilities)  # Inherit if not given
+            weights = [0] * len(names)
+            conditions = []
+            for name, spec in abilities.items():
+                index = names.index(name)
+                weights[index] = spec["weight"] if isinstance(spec, dict) else spec
+                if isinstance(spec, dict) and "when" in spec:
+                    condition, _, argument = spec["when"].partition(":")
+                    conditions.append((index, BOSS_CONDITIONS[condition], argument))
+            phases.append(
+                BossPhase(
+                    phase.get("below", 1.0),
+                    phase.get("attack_bonus", 0),
+                    phase.get("defense_bonus", 0),
+                    phase.get("message"),
+                    tuple(weights),
+                    tuple(conditions),
+                )
+            )
+        self.phases = tuple(phases)
+
+    def choose(self, boss, target):
+        """Index into `abilities` of the ability the boss uses this turn."""
+        phase = self.phases[boss.phase]
+        if not boss.cooldowns and not phase.conditions:
+            indices, cumulative = phase.table
+            return indices[boss.rng.weighted_index(cumulative)]
+
+        available = phase.all_available
+        for index, turns in enumerate(boss.cooldowns):
+            if turns:
+                available &= ~(1 << index)
+        for index, predicate, argument in phase.conditions:
+            if available >> index & 1 and not predicate(boss, target, argument):
+                available &= ~(1 << index)
+        indices, cumulative = phase.decision_table(available or phase.all_available)
+        chosen = indices[boss.rng.weighted_index(cumulative)]
+
+        if boss.cooldowns:
+            boss.cooldowns = tuple(
+                self.cooldowns[index] if index == chosen else max(0, turns - 1)
+                for index, turns in enumerate(boss.cooldowns)
+            )
+        return chosen
+
+    def variant(self, **stats):
+        """
+        A copy with some of hp, attack, defense and speed changed, e.g.
+        variant(hp=300), for balance sweeps. Pass it to create_boss().
+        """
+        unknown = set(stats) - {"hp", "attack", "defense", "speed"}
+        if unknown:
+            raise TypeError(f"unknown boss stats: {', '.join(sorted(unknown))}")
+        behavior = copy.copy(self)
+        for stat, value in stats.items():
+            setattr(behavior, stat, value)
+        return behavior
+
+
+_boss_behaviors = {}  # kind -> BossBehavior, compiled on first use
+
+
+def boss_kinds():
+    """Every boss in the roster, e.g. "hydra", "elder-hydra", "ancient-lich"."""
+    from .content import BOSS_DEFINITIONS, BOSS_TIERS
+
+    return [
+        f"{tier}-{base}" if tier else base
+        for tier in BOSS_TIERS
+        for base in BOSS_DEFINITIONS
+    ]
+
+
+def boss_behavior(kind):
+    """The compiled behavior of a boss kind from boss_kinds()."""
+    behavior = _boss_behaviors.get(kind)
+    if behavior is None:
+        from .content import BOSS_DEFINITIONS, BOSS_TIERS
+
+        tier, _, base = kind.rpartition("-")
+        if tier not in BOSS_TIERS or base not in BOSS_DEFINITIONS:
+            raise KeyError(kind)
+        prefix, hp_scale, attack_bonus, defense_bonus = BOSS_TIERS[tier]
+        definition = dict(BOSS_DEFINITIONS[base])
+        definition["name"] = prefix + definition["name"]
+        definition["hp"] = round(definition["hp"] * hp_scale)
+        definition["attack"] += attack_bonus
+        definition["defense"] += defense_bonus
+        behavior = _boss_behaviors[kind] = BossBehavior(kind, definition)
+    return behavior
+
+
+class Boss(Character):
+    """The main antagonist, driven by a compiled BossBehavior."""
+
+    __slots__ = ("kind", "behavior", "phase", "cooldowns")
+
+    def __init__(self, name, hp, attack, defense, rng=None, behavior=None):
+        behavior = behavior or boss_behavior("hydra")
+        super().__init__(name, hp, attack, defense, rng, behavior.speed)
+        self.behavior = behavior
+        self.kind = self.behavior.kind
+        self.phase = 0  # Index into behavior.phases
+        # Boss turns left before each ability can be used again; empty if
+        # none of this boss's abilities have a cooldown.
+        self.cooldowns = (
+            (0,) * len(self.behavior.abilities) if any(self.behavior.cooldowns) else ()
+        )
+
+    def choose_action(self, target):
+        """Boss AI: enters any phase its HP has reached, then picks an ability."""
+        print_section_break()
+        print_with_spacing(
+            f"🐉 {self.name}'s turn...", Colors.BRIGHT_RED, spacing_before=1
+        )
+        pause(1)
+
+        phases = self.behavior.phases
+        while (
+            self.phase + 1 < len(phases)
+            and self.hp < self.max_hp * phases[self.phase + 1].below
+        ):
+            self._enter_phase(self.phase + 1)
+
+        chosen = self.behavior.choose(self, target)
+        emit(self, EVENT_ACTION, chosen)
+        self.behavior.abilities[chosen](self, target)
+
+    def _enter_phase(self, index):
+        self.phase = index
+        phase = self.behavior.phases[index]
+        if phase.attack_bonus:
+            self.add_modifier(f"phase {index}", "attack", phase.attack_bonus)
+        if phase.defense_bonus:
+            self.add_modifier(f"phase {index}", "defense", phase.defense_bonus)
+        emit(self, EVENT_PHASE, index)
+        if phase.message:
+            print_blank()
+            print_slow(
+                phase.message.format(name=self.name),
+                color=Colors.BRIGHT_RED + Colors.BLINK,
+            )
+            print_blank()
+            pause(1)
+
+    # --- Boss Abilities ---
+    @boss_ability("stomp")
+    def _stomp(self, target):
+        print_slow(
+            f"{self.name} rears back and STOMPS the ground!", color=Colors.BRIGHT_RED
+        )
+        damage = self.attack + self.rng.randint(-3, 5)
+        target.take_damage(damage, self.name, self)
+
+    @boss_ability("dark_breath")
+    def _dark_breath(self, target):
+        print_slow(
+            f"{self.name} unleashes a torrent of dark energy!", color=Colors.PURPLE
+        )
+        damage = self.attack + self.rng.randint(5, 10)
+        target.take_damage(damage, self.name, self)
+
+    @boss_ability("frightening_roar")
+    def _frightening_roar(self, target):
+        print_slow(f"{self.name} lets out a Frightening Roar!", color=Colors.GRAY)
+        print_slow(f"{target.name}'s defense is lowered!", color=Colors.YELLOW)
+        target.add_modifier("frightening_roar", "defense", -2, turns=2)
+
+    @boss_ability("bite")
+    def _bite(self, target):
+        print_slow(f"{self.name} lunges and bites!", color=Colors.RED)
+        damage = self.attack + self.rng.randint(0, 4)
+        target.take_damage(damage, self.name, self)
+
+    @boss_ability("crushing_blow")
+    def _crushing_blow(self, target):
+        print_slow(f"{self.name} winds up a CRUSHING BLOW!", color=Colors.BRIGHT_RED)
+        damage = self.attack + self.rng.randint(8, 14)
+        target.take_damage(damage, self.name, self)
+
+    @boss_ability("tail_sweep")
+    def _tail_sweep(self, target):
+        print_slow(f"{self.name} sweeps its tail low!", color=Colors.YELLOW)
+        damage = self.attack + self.rng.randint(-2, 3)
+        target.take_damage(damage, self.name, self)
+        target.add_modifier("tail_sweep", "defense", -1, turns=2)
+
+    @boss_ability("venom_spit")
+    def _venom_spit(self, target):
+        print_slow(f"{self.name} spits venom!", color=Colors.GREEN)
+        damage = self.attack + self.rng.randint(-5, 0)
+        target.take_damage(damage, self.name, self)
+        if apply_status(target, "poison", 3):
+            print_slow(f"{target.name} has been poisoned!", color=Colors.GREEN)
+
+    @boss_ability("frost_breath")
+    def _frost_breath(self, target):
+        print_slow(f"{self.name} exhales a freezing gale!", color=Colors.CYAN)
+        damage = self.attack + self.rng.randint(0, 6)
+        target.take_damage(damage, self.name, self)
+        if apply_status(target, "frozen", 2, magnitude=2):
+            print_slow(
+                f"{target.name} is chilled, reducing their attack!",
+                color=Colors.BRIGHT_CYAN,
+            )
+
+    @boss_ability("ignite")
+    def _ignite(self, target):
+        print_slow(f"{self.name} hurls a ball of fire!", color=Colors.BRIGHT_RED)
+        damage = self.attack + self.rng.randint(-4, 2)
+        target.take_damage(damage, self.name, self)
+        if apply_status(target, "burning", 3):
+            print_slow(f"{target.name} catches fire!", color=Colors.BRIGHT_RED)
+
+    @boss_ability("hex")
+    def _hex(self, target):
+        print_slow(f"{self.name} places a hex on {target.name}!", color=Colors.PURPLE)
+        if apply_status(target, "cursed", 3, magnitude=3):
+            print_slow(f"{target.name}'s attack is weakened!", color=Colors.PURPLE)
+
+    @boss_ability("stun_slam")
+    def _stun_slam(self, target):
+        print_slow(f"{self.name} slams down with stunning force!", color=Colors.YELLOW)
+        damage = self.attack + self.rng.randint(-4, 2)
+        target.take_damage(damage, self.name, self)
+        apply_status(target, "stunned", 1)
+        print_slow(
+            f"{target.name} is stunned and will lose their next turn!",
+            color=Colors.YELLOW,
+        )
+
+    @boss_ability("slash")
+    def _slash(self, target):
+        print_slow(f"{self.name} slashes at {target.name}!", color=Colors.RED)
+        damage = self.attack + self.rng.randint(-2, 2)
+        target.take_damage(damage, self.name, self)
+
+    @boss_ability("constrict")
+    def _constrict(self, target):
+        print_slow(f"{self.name} coils around {target.name}!", color=Colors.BLUE)
+        damage = self.attack + self.rng.randint(-4, 0)
+        target.take_damage(damage, self.name, self)
+        if apply_status(target, "slowed", 2, magnitude=40):
+            print_slow(f"{target.name} is slowed!", color=Colors.BRIGHT_BLUE)
+
+    @boss_ability("frenzy")
+    def _frenzy(self, target):
+        if apply_status(self, "hasted", 2, magnitude=50):
+            print_slow(f"{self.name} flies into a frenzy!", color=Colors.BRIGHT_YELLOW)
+
+    @boss_ability("regenerate")
+    def _regenerate(self, target):
+        print_slow(f"{self.name} regenerates!", color=Colors.BRIGHT_GREEN)
+        self.heal(self.rng.randint(10, 20))
+
+
+# --- Character Classes ---
+
+CLASS_STAT_FIELDS = ("hp", "attack", "defense", "mana")
+
+
+class CharacterClass:
+    """A playable class: base stats, theme and where its abilities and weapons come from."""
+
+    __slots__ = (
+        "name",
+        "hp",
+        "attack",
+        "defense",
+        "mana",
+        "speed",
+        "color",
+        "description",
+        "abilities",
+        "weapon_pool",
+    )
+
+    def __init__(
+        self,
+        name,
+        hp,
+        attack,
+        defense,
+        mana,
+        color,
+        description,
+        abilities,
+        pool,
+        speed=DEFAULT_SPEED,
+    ):
+        self.name = name
+        self.hp = hp
+        self.attack = attack
+        self.defense = defense
+        self.mana = mana
+        self.speed = speed
+        self.color = color  # Name of a Colors attribute, looked up when rendering
+        self.description = description
+        self.abilities = abilities  # {menu key: Ability}, shared with the base role
+        self.weapon_pool = pool  # Role whose weapons it can equip in the catalog
+
+    @classmethod
+    def from_definition(cls, name, definition):
+        """Builds and validates a class from a CLASS_DEFINITIONS entry."""
+        for field in CLASS_STAT_FIELDS:
+            value = definition.get(field)
+            lowest = 0 if field == "defense" else 1
+            if type(value) is not int or value < lowest:  # bool is no stat
+                raise ValueError(f"class {name}: bad {field} {value!r}")
+        speed = definition.get("speed", DEFAULT_SPEED)
+        if type(speed) is not int or speed < MIN_SPEED:
+            raise ValueError(f"class {name}: bad speed {speed!r}")
+        color = definition.get("color", "WHITE")
+        if not isinstance(getattr(Colors, color, None), str):
+            raise ValueError(f"class {name}: unknown color {color!r}")
+        abilities = definition.get("abilities", name)
+        if abilities not in ABILITY_TABLES:
+            raise ValueError(f"class {name}: no ability table {abilities!r}")
+        return cls(
+            name,
+            *(definition[field] for field in CLASS_STAT_FIELDS),
+            color,
+            definition.get("description", ""),
+            ABILITY_TABLES[abilities],
+            definition.get("weapons", name),
+            speed,
+        )
+
+    def variant(self, name, **stats):
+        """
+        A copy under a new name with some base stats changed, e.g.
+        variant("Warrior+10", hp=130). Cheap enough to make hundreds of for
+        balance sweeps; pass it to create_player() or register_class().
+        """
+        unknown = set(stats) - {*CLASS_STAT_FIELDS, "speed"}
+        if unknown:
+            raise TypeError(f"unknown class stats: {', '.join(sorted(unknown))}")
+        values = {field: getattr(self, field) for field in CLASS_STAT_FIELDS}
+        values.update(stats)
+        return CharacterClass(
+            name,
+            *(values[field] for field in CLASS_STAT_FIELDS),
+            self.color,
+            self.description,
+            self.abilities,
+            self.weapon_pool,
+            values.get("speed", self.speed),
+        )
+
+    def __repr__(self):
+        return f"CharacterClass({self.name!r})"
+
+
+_class_registry = None  # name -> CharacterClass, built on first use
+
+
+def class_registry():
+    """
+    Every playable class by name, in menu order. Built from CLASS_DEFINITIONS
+    and validated (stats, color, ability table, weapon pool) on first use.
+    """
+    global _class_registry
+    if _class_registry is None:
+        from .content import CLASS_DEFINITIONS, weapon_catalog
+
+        registry = {}
+        pools = weapon_catalog().collections
+        for name, definition in CLASS_DEFINITIONS.items():
+            character_class = CharacterClass.from_definition(name, definition)
+            if character_class.weapon_pool not in pools:
+                raise ValueError(
+                    f"class {name}: no weapons for {character_class.weapon_pool!r}"
+                )
+            registry[name] = character_class
+        _class_registry = registry
+    return _class_registry
+
+
+def class_names():
+    """Names of the playable classes, in menu order."""
+    return list(class_registry())
+
+
+def character_class(name):
+    """The CharacterClass registered under `name`."""
+    return class_registry()[name]
+
+
+def register_class(character_class):
+    """Adds a class (e.g. a generated variant) to the registry and returns it."""
+    class_registry()[character_class.name] = character_class
+    return character_class
+
+
+def get_class_color(class_name):
+    """Get thematic color for character classes."""
+    character_class = class_registry().get(class_name)
+    return getattr(Colors, character_class.color) if character_class else Colors.WHITE
+
+
+# --- Creating Combatants ---
+
+
+def create_player(role, name="Hero", weapon_key=None, rng=None):
+    """
+    Creates a player of the given role (a class name or a CharacterClass),
+    optionally equipping a weapon by menu key (or a Weapon itself).
+    """
+    from .content import WEAPON_COLLECTIONS
+
+    if isinstance(role, str):
+        role = character_class(role)
+    player = Player(name, role, rng)
+    if isinstance(weapon_key, Weapon):
+        player.equip_weapon(weapon_key)
+    elif weapon_key is not None:
+        player.equip_weapon(WEAPON_COLLECTIONS[role.weapon_pool][weapon_key])
+    return player
+
+
+def create_boss(rng=None, kind="hydra"):
+    """
+    Creates a boss from the roster (see boss_kinds()), or from a BossBehavior;
+    the Gargantuan Hydra by default.
+    """
+    behavior = boss_behavior(kind) if isinstance(kind, str) else kind
+    return Boss(
+        behavior.name,
+        behavior.hp,
+        behavior.attack,
+        behavior.defense,
+        rng=rng,
+        behavior=behavior,
+    )
+
+
+# --- Encounters ---
+# An encounter is a boss fought together with its minions (see
+# ENCOUNTER_DEFINITIONS). Minions are bosses in all but name: they are
+# defined like bosses and compiled into BossBehaviors, but are not part of
+# the boss roster.
+
+
+class Roster:
+    """
+    The enemies of an encounter, in the order they joined it. `alive` holds
+    the indexes of the living ones and is kept up to date as they die: the
+    roster listens to every member and drops a member when an event
+    leaves it at 0 HP. Picking targets, hitting every enemy and checking for
+    victory therefore never look at the dead.
+    """
+
+    __slots__ = ("members", "alive", "_indexes")
+
+    def __init__(self, members=()):
+        self.members = []
+        self.alive = []  # Indexes into members, ascending
+        self._indexes = {}  # member -> index
+        for member in members:
+            self.add(member)
+
+    def add(self, member):
+        """Adds an enemy, listening to it alongside its other listeners."""
+        index = len(self.members)
+        self.members.append(member)
+        self._indexes[member] = index
+        add_listener(member, self)
+        if member.is_alive():
+            self.alive.append(index)  # The highest index, so still sorted
+
+    def __call__(self, character, event, code, value, critical):
+        if character.hp <= 0:
+            index = self._indexes[character]
+            position = bisect.bisect_left(self.alive, index)
+            if position < len(self.alive) and self.alive[position] == index:
+                del self.alive[position]
+
+    def __len__(self):
+        """How many enemies are still alive."""
+        return len(self.alive)
+
+    def defeated(self):
+        return not self.alive
+
+    def living(self):
+        """The living enemies, as a list that is safe to keep while they die."""
+        members = self.members
+        return [members[index] for index in self.alive]
+
+
+def target_last(roster, rng):
+    """The enemy that joined last: minions before the boss that leads them."""
+    return roster.members[roster.alive[-1]]
+
+
+def target_first(roster, rng):
+    """The enemy that joined first, which is the boss while it lives."""
+    return roster.members[roster.alive[0]]
+
+
+def target_weakest(roster, rng):
+    """The living enemy with the least HP."""
+    return min(roster.living(), key=lambda enemy: enemy.hp)
+
+
+def target_random(roster, rng):
+    return roster.members[rng.choice(roster.alive)]
+
+
+# How the autopilot and the headless engine pick whom to attack
+TARGETING = {
+    "last": target_last,
+    "first": target_first,
+    "weakest": target_weakest,
+    "random": target_random,
+}
+
+_minion_behaviors = {}  # kind -> BossBehavior, compiled on first use
+
+
+def minion_behavior(kind):
+    """The compiled behavior of a minion kind from MINION_DEFINITIONS."""
+    behavior = _minion_behaviors.get(kind)
+    if behavior is None:
+        from .content import MINION_DEFINITIONS
+
+        behavior = BossBehavior(kind, MINION_DEFINITIONS[kind])
+        _minion_behaviors[kind] = behavior
+    return behavior
+
+
+def encounter_kinds():
+    """Every encounter, e.g. "hydra-brood"."""
+    from .content import ENCOUNTER_DEFINITIONS
+
+    return list(ENCOUNTER_DEFINITIONS)
+
+
+class Encounter:
+    """A boss, its minions and the reinforcements it summons, as one battle."""
+
+    __slots__ = ("kind", "description", "boss", "roster", "summon", "rng", "_counts")
+
+    def __init__(self, kind, rng=None):
+        from .content import ENCOUNTER_DEFINITIONS
+
+        definition = ENCOUNTER_DEFINITIONS[kind]
+        self.kind = kind
+        self.description = definition.get("description", "")
+        self.rng = rng
+        self.boss = create_boss(rng, definition["boss"])
+        self.roster = Roster([self.boss])
+        self.summon = definition.get("summon")
+        self._counts = {}  # minion kind -> how many have joined, for their names
+        for minion_kind, count in definition.get("minions", {}).items():
+            for _ in range(count):
+                self.add_minion(minion_kind)
+
+    def add_minion(self, kind):
+        """Creates a minion, numbered among those of its kind, and adds it."""
+        behavior = minion_behavior(kind)
+        number = self._counts[kind] = self._counts.get(kind, 0) + 1
+        minion = Boss(
+            f"{behavior.name} {number}",
+            behavior.hp,
+            behavior.attack,
+            behavior.defense,
+            rng=self.rng,
+            behavior=behavior,
+        )
+        self.roster.add(minion)
+        return minion
+
+    def end_round(self, turn):
+        """
+        Brings in the boss's reinforcements if `turn` is a summoning turn, the
+        boss still lives and it has fewer than the maximum minions.
+        Returns the new minion, or None.
+        """
+        summon = self.summon
+        if not summon or turn % summon["every"] or not self.boss.is_alive():
+            return None
+        limit = summon.get("max")
+        if limit is not None and len(self.roster) - 1 >= limit:
+            return None
+        minion = self.add_minion(summon["minion"])
+        print_slow(
+            summon["message"].format(name=self.boss.name, minion=minion.name),
+            color=Colors.BRIGHT_RED,
+        )
+        return minion
+
+
+# --- Battle Actions ---
+# Shared by the interactive Game and the headless engine so both play by the same rules.
+
+
+def reset_player_state(player):
+    """Clears last turn's defensive stance, then regenerates mana."""
+    player.is_defending = False
+    player.regenerate_mana()
+
+
+def player_attack(player, target):
+    """Performs a basic weapon attack."""
+    print_slow(f"{player.name} attacks!", color=get_class_color(player.role))
+    emit(player, EVENT_ACTION, 1, player.mana)
+    target.take_damage(player.attack, player.name, player)
+
+
+def player_defend(player):
+    """Takes a defensive stance, doubling defense until the next turn."""
+    player.is_defending = True
+    print_slow(f"{player.name} takes a defensive stance.", color=Colors.BLUE)
+    emit(player, EVENT_ACTION, 2, player.mana)
+
+
+def cast_ability(player, ability_key, target, enemies=None):
+    """
+    Spends mana and casts an ability. Returns False if it could not be cast.
+    In an encounter, `enemies` is its Roster, which area abilities hit.
+    """
+    chosen_ability = player.abilities.get(ability_key)
+    if chosen_ability is None:
+        print_slow("❌ Invalid choice.", color=Colors.RED)
+        return False
+
+    if player.mana < chosen_ability.cost:
+        print_slow("💧 Not enough mana!", color=Colors.RED)
+        pause(1)
+        return False
+
+    player.mana -= chosen_ability.cost
+    emit(player, EVENT_ACTION, action_id("3", ability_key), player.mana)
+    print_blank()  # Add spacing before ability execution
+    chosen_ability.cast(player, target, enemies)
+    return True
+
+
+def use_potion(player):
+    """Drinks a health potion. Returns False if none are left."""
+    if player.potions <= 0:
+        print_slow("You are out of health potions!", color=Colors.RED)
+        pause(1)
+        return False
+    player.potions -= 1
+    emit(player, EVENT_ACTION, 4, player.mana)
+    heal_amount = 40
+    player.heal(heal_amount)
+    print_slow(
+        f"You used a health potion and recovered {heal_amount} HP.",
+        color=Colors.BRIGHT_GREEN,
+    )
+    return True
+
+
+def perform_action(player, target, action, ability_key=None, enemies=None):
+    """Performs a combat menu action ("1"-"4"). Returns False if it was not possible."""
+    if action == "1":
+        player_attack(player, target)
+        return True
+    elif action == "2":
+        player_defend(player)
+        return True
+    elif action == "3":
+        return cast_ability(player, ability_key, target, enemies)
+    elif action == "4":
+        return use_potion(player)
+    return False
+
+
+# --- Headless Battle Engine ---
+
+
+def attack_policy(player, boss):
+    """Always uses a basic attack."""
+    return "1", None
+
+
+def greedy_policy(player, boss):
+    """
+    Drinks a potion when low, otherwise casts the priciest affordable ability
+    that is worth more than a basic attack (see Ability.value), so statuses
+    the boss already has are not recast. Self-targeted abilities (heals,
+    shields) are only used below half HP.
+    """
+    if player.hp < player.max_hp * 0.35 and player.potions > 0:
+        return "4", None
+    wounded = player.hp < player.max_hp * 0.5
+    attack = expected_hit(player.attack, boss)
+    affordable = [
+        (ability.cost, key)
+        for key, ability in player.abilities.items()
+        if ability.cost <= player.mana
+        and (
+            wounded
+            if not ability.targeted
+            else ability.value is None or ability.value(player, boss) > attack
+        )
+    ]
+    if affordable:
+        return "3", max(affordable)[1]
+    return "1", None
+
+
+def random_policy(player, boss):
+    """Picks uniformly among the actions that are currently possible."""
+    options = [("1", None), ("2", None)]
+    options.extend(
+        ("3", key)
+        for key, ability in player.abilities.items()
+        if ability.cost <= player.mana
+    )
+    if player.potions > 0:
+        options.append(("4", None))
+    return player.rng.choice(options)
+
+
+POLICIES = {
+    "attack": attack_policy,
+    "greedy": greedy_policy,
+    "random": random_policy,
+}
+
+# Policies defined in other modules, imported the first time they are asked for
+EXTERNAL_POLICIES = {
+    "expectimax": "bot",  # bot.py, beside the package in a checkout
+}
+
+
+def import_tool(name):
+    """
+    Imports one of the tools that sit beside the package in a checkout
+    (bot.py, journal.py, instrument.py). Raises ImportError saying so if it
+    is not on sys.path, as when the package is used on its own.
+    """
+    try:
+        return importlib.import_module(name)
+    except ModuleNotFoundError as error:
+        if error.name != name:
+            raise
+        raise ImportError(
+            f"{name}.py is not importable: it lives beside the evil_wizard "
+            "package in the repository, so run from the repository root"
+        ) from None
+
+
+def get_policy(policy):
+    """Resolves a policy name to its callable; callables are returned as-is."""
+    if not isinstance(policy, str):
+        return policy
+    if policy not in POLICIES and policy in EXTERNAL_POLICIES:
+        import_tool(EXTERNAL_POLICIES[policy])
+    return POLICIES[policy]
+
+
+def policy_names():
+    """Every policy name get_policy() accepts."""
+    return sorted(set(POLICIES) | set(EXTERNAL_POLICIES))
+
+
+def take_policy_action(player, boss, policy, enemies=None):
+    """Performs the action `policy` picks, falling back to a basic attack."""
+    action, ability_key = policy(player, boss)
+    if not perform_action(player, boss, action, ability_key, enemies):
+        player_attack(player, boss)
+
+
+class BattleResult:
+    """Structured outcome of a single headless battle."""
+
+    def __init__(self, role, weapon_key, seed, boss="hydra"):
+        self.role = role
+        self.weapon_key = weapon_key
+        self.seed = seed
+        self.boss = boss
+        self.winner = None  # "player", "boss", or None if the turn limit was hit
+        self.turns = 0
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.effects_applied = {}  # effect name -> times it landed on the boss
+        self.effects_received = {}  # effect name -> times it landed on the player
+
+    def as_dict(self):
+        """Returns the result as a plain dict (e.g. for JSON export)."""
+        return {
+            "role": self.role,
+            "weapon_key": self.weapon_key,
+            "boss": self.boss,
+            "seed": self.seed,
+            "winner": self.winner,
+            "turns": self.turns,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+            "effects_applied": dict(self.effects_applied),
+            "effects_received": dict(self.effects_received),
+        }
+
+
+def _count_new_effects(before, character, counts):
+    for effect in character.status_effects:
+        if effect not in before:
+            counts[effect] = counts.get(effect, 0) + 1
+
+
+def simulate_battle(
+    role,
+    weapon_key,
+    policy="greedy",
+    seed=None,
+    max_turns=500,
+    boss="hydra",
+    journal=None,
+):
+    """
+    Runs one complete battle with no printing, sleeping or prompting.
+
+    `policy` is a name from POLICIES or a callable `(player, boss) -> (action,
+    ability_key)` using the combat menu codes. Actions that can't be performed
+    (e.g. not enough mana) fall back to a basic attack.
+
+    Every random decision draws from a BattleRandom seeded with `seed`, so the
+    same arguments always replay the same battle. `boss` is a kind from
+    boss_kinds(). `role`, `weapon_key` and `boss` may instead be a
+    CharacterClass, Weapon and BossBehavior, such as the variants balance.py
+    tries. If `journal` (a journal.JournalWriter) is given, the battle is
+    recorded to it.
+
+    The combatants act in Timeline order, so the faster one acts more often;
+    at equal speeds they alternate, the player first, one round per turn.
+    While both act at DEFAULT_SPEED that order is fixed, and the battle runs
+    without a Timeline until haste or slow changes a speed.
+    """
+    policy = get_policy(policy)
+    rng = BattleRandom(seed)
+    player = create_player(role, weapon_key=weapon_key, rng=rng)
+    boss = create_boss(rng, boss)
+    weapon_key = getattr(weapon_key, "name", weapon_key)
+    result = BattleResult(player.role, weapon_key, seed, boss.kind)
+    recorder = journal.start_battle(player, boss) if journal else None
+
+    def run_phase(step, *args):
+        player_hp, boss_hp = player.hp, boss.hp
+        player_effects = set(player.status_effects)
+        boss_effects = set(boss.status_effects)
+        outcome = step(*args)
+        result.damage_taken += max(0, player_hp - player.hp)
+        result.damage_dealt += max(0, boss_hp - boss.hp)
+        _count_new_effects(player_effects, player, result.effects_received)
+        _count_new_effects(boss_effects, boss, result.effects_applied)
+        return outcome
+
+    def take_turn(actor):
+        """One combatant's turn. Returns False if its status effects killed it."""
+        if actor is player:
+            reset_player_state(player)
+            stunned = run_phase(process_status_effects, player)
+            if not player.is_alive():
+                return False
+            if not stunned:
+                run_phase(take_policy_action, player, boss, policy)
+            return True
+        stunned = run_phase(process_status_effects, boss)
+        if not boss.is_alive():
+            return False
+        if not stunned:
+            run_phase(boss.choose_action, player)
+        return True
+
+    with headless():
+        timeline = None
+        if player.speed == DEFAULT_SPEED and boss.speed == DEFAULT_SPEED:
+            # Fast path: the two strictly alternate until a speed changes
+            alternation = _Alternation(player, boss)
+            while alternation.round <= max_turns:
+                if recorder:
+                    recorder.begin_turn(alternation.round)
+                alternation.actor = player
+                if not take_turn(player) or not boss.is_alive():
+                    break
+                if alternation.timeline is None:
+                    alternation.actor = boss
+                    if not take_turn(boss):
+                        break
+                    if alternation.timeline is None:
+                        alternation.round += 1
+                        if player.is_alive():
+                            continue
+                        break
+                # A speed changed: the Timeline takes over from here
+                timeline = alternation.timeline
+                timeline.done(alternation.actor)
+                break
+            rounds = alternation.round
+        else:
+            timeline = Timeline((player, boss))
+        if timeline is not None:
+            while player.is_alive() and boss.is_alive() and timeline.round <= max_turns:
+                actor = timeline.pop()
+                if actor is player and recorder and recorder.turn != timeline.round:
+                    recorder.begin_turn(timeline.round)
+                if not take_turn(actor):
+                    break
+                timeline.done(actor)
+            rounds = timeline.round
+
+    result.turns = min(rounds, max_turns)
+    if not boss.is_alive():
+        result.winner = "player"
+    elif not player.is_alive():
+        result.winner = "boss"
+    if recorder:
+        recorder.finish(result.winner, result.turns)
+    return result
+
+
+class EncounterResult:
+    """Structured outcome of a single headless encounter."""
+
+    def __init__(self, role, weapon_key, seed, encounter, targeting):
+        self.role = role
+        self.weapon_key = weapon_key
+        self.seed = seed
+        self.encounter = encounter
+        self.targeting = targeting
+        self.winner = None  # "player", "enemies", or None if the turn limit was hit
+        self.turns = 0
+        self.enemies = 0  # Enemies that took part, summoned ones included
+        self.kills = 0
+        self.damage_taken = 0
+
+    def as_dict(self):
+        return {
+            "role": self.role,
+            "weapon_key": self.weapon_key,
+            "encounter": self.encounter,
+            "targeting": self.targeting,
+            "seed": self.seed,
+            "winner": self.winner,
+            "turns": self.turns,
+            "enemies": self.enemies,
+            "kills": self.kills,
+            "damage_taken": self.damage_taken,
+        }
+
+
+def simulate_encounter(
+    role,
+    weapon_key,
+    encounter="hydra-brood",
+    policy="greedy",
+    seed=None,
+    max_turns=500,
+    targeting="last",
+    journal=None,
+):
+    """
+    Runs one complete encounter (see encounter_kinds()) with no printing,
+    sleeping or prompting, like simulate_battle(). Combatants act in Timeline
+    order: at equal speeds, each round the player acts against the enemy
+    `targeting` (a name from TARGETING) picks, then every living enemy takes
+    its turn in the order it joined, and then the boss may summon
+    reinforcements. If `journal` is given, the encounter is recorded to it,
+    minions included.
+    """
+    policy = get_policy(policy)
+    choose_target = TARGETING[targeting]
+    rng = BattleRandom(seed)
+    player = create_player(role, weapon_key=weapon_key, rng=rng)
+    result = EncounterResult(player.role, weapon_key, seed, encounter, targeting)
+
+    with headless():
+        fight = Encounter(encounter, rng)
+        roster = fight.roster
+        members = roster.members
+        timeline = Timeline((player, *members))
+        recorder = journal.start_battle(player, fight.boss) if journal else None
+        if recorder:
+            for minion in members[1:]:
+                recorder.add_enemy(minion)
+
+        def end_rounds(turn):
+            """Ends the rounds before the timeline's current one, from `turn`."""
+            while turn < timeline.round and player.is_alive():
+                minion = fight.end_round(turn)  # Reinforcements may arrive
+                if minion is not None:
+                    timeline.add(minion)
+                    if recorder:
+                        recorder.add_enemy(minion)
+                turn += 1
+            return turn
+
+        turn = 1
+        while player.is_alive() and roster.alive and timeline.round <= max_turns:
+            actor = timeline.pop()
+            if turn < timeline.round:  # Nobody's turn ended the last round
+                turn = end_rounds(turn)
+            player_hp = player.hp
+            if actor is player:
+                if recorder and recorder.turn != timeline.round:
+                    recorder.begin_turn(timeline.round)
+                reset_player_state(player)
+                stunned = process_status_effects(player)
+                if player.is_alive() and not stunned:
+                    target = choose_target(roster, rng)
+                    take_policy_action(player, target, policy, roster)
+            else:
+                stunned = process_status_effects(actor)
+                if actor.is_alive() and not stunned:
+                    actor.choose_action(player)
+            result.damage_taken += max(0, player_hp - player.hp)
+            if actor.is_alive():
+                timeline.done(actor)
+                if turn < timeline.round:
+                    turn = end_rounds(turn)
+
+    result.turns = min(timeline.round, max_turns)
+    result.enemies = len(members)
+    result.kills = len(members) - len(roster)
+    if not roster.alive:
+        result.winner = "player"
+    elif not player.is_alive():
+        result.winner = "enemies"
+    if recorder:
+        winner = "boss" if result.winner == "enemies" else result.winner
+        recorder.finish(winner, result.turns)
+    return result
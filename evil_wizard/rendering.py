@@ -0,0 +1,468 @@
+"""
+Terminal output: measuring and laying out text, the Screen that composes
+frames, and the Narrator that paces them. Imported the first time anything
+is shown (see the Output section of evil_wizard.engine).
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import os
+import re
+import shutil
+import sys
+import time
+import unicodedata
+
+from .colors import Colors, colorize
+from .engine import is_headless
+
+# Enable colors for Windows terminal
+if sys.platform == "win32":
+    try:
+        import colorama
+
+        colorama.init()
+    except ImportError:
+        # If colorama isn't available, try to enable ANSI support
+        os.system("color")
+
+# Keypress detection for skipping narration
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import select
+
+# --- Utility Functions ---
+ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+
+def strip_ansi(text):
+    """Remove ANSI escape sequences from a string."""
+    return ANSI_ESCAPE.sub("", text)
+
+
+def _char_width(char):
+    """Display width of a single character: 0 (combining/format), 1 or 2 (wide)."""
+    if unicodedata.combining(char) or unicodedata.category(char) == "Cf":
+        return 0
+    if unicodedata.east_asian_width(char) in {"F", "W"}:
+        return 2
+    return 1
+
+
+# Codepoint-range width table, built lazily one block at a time:
+# block index -> (range start codepoints, width of each range)
+_WIDTH_BLOCK_BITS = 12
+_width_blocks = {}
+
+
+def _width_block(block):
+    """Builds the run-length width table for one block of codepoints."""
+    starts, widths = [], []
+    first = block << _WIDTH_BLOCK_BITS
+    for codepoint in range(first, first + (1 << _WIDTH_BLOCK_BITS)):
+        width = _char_width(chr(codepoint))
+        if not widths or widths[-1] != width:
+            starts.append(codepoint)
+            widths.append(width)
+    _width_blocks[block] = (starts, widths)
+    return starts, widths
+
+
+@functools.lru_cache(maxsize=4096)
+def get_display_width(text):
+    """Calculate rendered width, accounting for ANSI codes and wide Unicode chars."""
+    clean_text = strip_ansi(text) if "\x1b" in text else text
+    if clean_text.isascii():
+        return len(clean_text)
+
+    width = 0
+    for char in clean_text:
+        codepoint = ord(char)
+        if codepoint < 0x80:
+            width += 1
+            continue
+        block = codepoint >> _WIDTH_BLOCK_BITS
+        starts, widths = _width_blocks.get(block) or _width_block(block)
+        width += widths[bisect.bisect_right(starts, codepoint) - 1]
+    return width
+
+
+def pad_to_width(text, target_width):
+    """Right-pad a string with spaces until it reaches the desired display width."""
+    padding_needed = max(0, target_width - get_display_width(text))
+    return f"{text}{' ' * padding_needed}"
+
+
+def wrap_text(text, width):
+    """Wrap text based on rendered width, preserving color codes."""
+    if width <= 0 or get_display_width(text) <= width:
+        return [text]
+
+    words = text.split()
+    if not words:
+        return [text]
+
+    # Widths add up across words, so measure each word once and keep a running total
+    lines = []
+    current_line = words[0]
+    current_width = get_display_width(current_line)
+    for word in words[1:]:
+        word_width = get_display_width(word)
+        if current_width + 1 + word_width > width:
+            lines.append(current_line)
+            current_line = word
+            current_width = word_width
+        else:
+            current_line = f"{current_line} {word}"
+            current_width += 1 + word_width
+
+    lines.append(current_line)
+    return lines
+
+
+def render_box(title, lines, width=54):
+    """Build the rows of a framed box, aligned for colored and emoji text."""
+    inner_width = width - 2
+
+    content_width = (
+        max((get_display_width(line) for line in lines), default=0) + 1
+    )  # +1 for left padding inside the box
+
+    title_segment = f"─ {title} "
+    title_width = get_display_width(title_segment)
+
+    inner_width = max(inner_width, content_width, title_width)
+
+    rows = [f"┌{title_segment}{'─' * max(0, inner_width - title_width)}┐"]
+
+    if not lines:
+        lines = [""]
+
+    for line in lines:
+        for segment in wrap_text(line, inner_width - 1):
+            padded_line = pad_to_width(f" {segment}", inner_width)
+            rows.append(f"│{padded_line}│")
+
+    rows.append(f"└{'─' * inner_width}┘")
+    return rows
+
+
+def render_header(title, color=Colors.BRIGHT_CYAN):
+    """Build the rows of a styled header, including the spacing around it."""
+    border = colorize("=" * 50, color)
+    return ["", border, colorize(f"{title:^50}", Colors.BOLD + color), border, ""]
+
+
+def render_section_break():
+    """Build the rows of a visual break between sections."""
+    return [colorize("-" * 50, Colors.GRAY), ""]
+
+
+# --- Screen Output ---
+
+
+class Screen:
+    """
+    Composes output into whole frames written with a single flush.
+
+    On a TTY, present() redraws only the frame lines that changed since the
+    last frame using cursor addressing, then clears whatever was printed below
+    it. Other streams (pipes, files) just get each frame appended once. With
+    color off, ANSI color codes are stripped from everything written.
+    """
+
+    def __init__(self, stream=None, color=True):
+        self.stream = stream  # None means whatever sys.stdout is at write time
+        self.color = color
+        self._frame = []  # Lines of the frame currently on screen
+        self._lines_below = 0  # Lines written under the frame since it was drawn
+        self._repaint = True  # The screen no longer matches self._frame
+
+    def _out(self):
+        return self.stream or sys.stdout
+
+    def is_tty(self):
+        isatty = getattr(self._out(), "isatty", None)
+        return bool(isatty and isatty())
+
+    def write(self, text):
+        """Writes text below the current frame."""
+        if not self.color:
+            text = strip_ansi(text)
+        out = self._out()
+        out.write(text)
+        out.flush()
+        self._lines_below += text.count("\n")
+
+    def write_lines(self, lines):
+        """Writes several lines in one go."""
+        self.write("".join(f"{line}\n" for line in lines))
+
+    def show_prompt(self, text):
+        """Writes a prompt whose answer the caller reads itself."""
+        get_narrator().skipping = False
+        self.write(text)
+        self._lines_below += 1  # The echoed Enter moves the cursor down
+
+    def echo(self, answer):
+        """Writes an answer that was not typed, as a terminal would echo it."""
+        out = self._out()
+        out.write(f"{answer}\n")
+        out.flush()  # show_prompt() already counted the line
+
+    def prompt(self, text):
+        """Writes a prompt and reads a line of input."""
+        self.show_prompt(text)
+        return input()
+
+    def clear(self):
+        """Clears the screen and forgets the current frame."""
+        out = self._out()
+        out.write("\033[H\033[2J" if self.is_tty() else "\n")
+        out.flush()
+        self._frame = []
+        self._lines_below = 0
+        self._repaint = True
+
+    def present(self, lines):
+        """Draws a full frame with a single write, redrawing only changed lines."""
+        if not self.color:
+            lines = [strip_ansi(line) for line in lines]
+        out = self._out()
+        if not self.is_tty():
+            out.write("\n" + "".join(f"{line}\n" for line in lines))
+        else:
+            rows = shutil.get_terminal_size().lines
+            # If output below the frame scrolled it, the old lines have moved
+            if len(self._frame) + self._lines_below >= rows:
+                self._repaint = True
+
+            if self._repaint:
+                parts = ["\033[H\033[2J"]
+                parts.extend(f"{line}\n" for line in lines)
+            else:
+                parts = [
+                    f"\033[{row};1H{line}\033[K"
+                    for row, line in enumerate(lines, start=1)
+                    if row > len(self._frame) or self._frame[row - 1] != line
+                ]
+                parts.append(f"\033[{len(lines) + 1};1H\033[J")
+            out.write("".join(parts))
+        out.flush()
+        self._frame = list(lines)
+        self._lines_below = 0
+        self._repaint = False
+
+
+_default_screen = Screen()
+_screen = contextvars.ContextVar("screen", default=None)
+
+
+def get_screen():
+    """The Screen that output currently goes to."""
+    return _screen.get() or _default_screen
+
+
+def write_lines(lines):
+    """Writes rows of text to the current screen, unless running headless."""
+    if is_headless():
+        return
+    get_screen().write_lines(lines)
+
+
+# --- Narration ---
+
+# Multiplier applied to every authored delay (typing speed and pauses)
+NARRATION_SPEEDS = {
+    "instant": 0.0,
+    "fast": 0.25,
+    "cinematic": 1.0,
+}
+
+
+class Clock:
+    """The single source of time for narration and dramatic pauses."""
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep_until(self, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+def _skip_key_pressed():
+    """True if the player pressed a key to skip (Enter on POSIX terminals)."""
+    stdin = sys.stdin
+    if stdin is None or not stdin.isatty():
+        return False
+    if msvcrt:
+        if msvcrt.kbhit():
+            msvcrt.getwch()
+            return True
+        return False
+    ready, _, _ = select.select([stdin], [], [], 0)
+    if ready:
+        stdin.readline()  # Swallow the keypress so it isn't read as a menu choice
+        return True
+    return False
+
+
+class Narrator:
+    """
+    Writes narration a display frame's worth of characters at a time, at a
+    global speed. A keypress skips the rest of the animation and every pause
+    until the next prompt.
+    """
+
+    FRAME = 1 / 60  # Seconds per display frame
+
+    def __init__(self, speed="cinematic", clock=None, skip_key=_skip_key_pressed):
+        self.scale = NARRATION_SPEEDS[speed]
+        self.clock = clock or Clock()
+        self.skip_key = skip_key  # Polled for a skip keypress; None disables it
+        self.skipping = False
+
+    def set_speed(self, speed):
+        """Takes a name from NARRATION_SPEEDS or a delay multiplier."""
+        self.scale = NARRATION_SPEEDS[speed] if isinstance(speed, str) else speed
+
+    def _check_skip(self):
+        if not self.skipping and self.skip_key and self.skip_key():
+            self.skipping = True
+        return self.skipping
+
+    def say(self, text, delay=0.03):
+        """Types out a line of text."""
+        screen = get_screen()
+        if not screen.color:  # Strip before chunking, which could split a code
+            text = strip_ansi(text)
+        per_char = delay * self.scale
+        if per_char <= 0 or self.skipping:
+            screen.write(f"{text}\n")
+            return
+
+        chunk = max(1, int(self.FRAME / per_char))
+        start = self.clock.now()
+        for written in range(0, len(text), chunk):
+            if self._check_skip():
+                screen.write(f"{text[written:]}\n")
+                return
+            screen.write(text[written : written + chunk])
+            self.clock.sleep_until(start + (written + chunk) * per_char)
+        screen.write("\n")
+
+    def pause(self, seconds):
+        """Waits for a scaled number of seconds, stopping early on a keypress."""
+        seconds *= self.scale
+        if seconds <= 0 or self.skipping:
+            return
+        deadline = self.clock.now() + seconds
+        while self.clock.now() < deadline and not self._check_skip():
+            self.clock.sleep_until(min(deadline, self.clock.now() + self.FRAME * 6))
+
+
+_env_speed = os.environ.get("EVIL_WIZARD_SPEED", "cinematic")
+_default_narrator = Narrator(
+    _env_speed if _env_speed in NARRATION_SPEEDS else "cinematic"
+)
+_narrator = contextvars.ContextVar("narrator", default=None)
+
+
+def get_narrator():
+    """The Narrator that currently paces output."""
+    return _narrator.get() or _default_narrator
+
+
+@contextlib.contextmanager
+def output_to(screen, narrator=None):
+    """
+    Sends output to `screen` (paced by `narrator`) for the duration of the
+    block. The binding is per context, so each asyncio task can have its own.
+    """
+    screen_token = _screen.set(screen)
+    narrator_token = _narrator.set(narrator)
+    try:
+        yield
+    finally:
+        _narrator.reset(narrator_token)
+        _screen.reset(screen_token)
+
+
+def set_narration_speed(speed):
+    """Sets the narration speed: "instant", "fast", "cinematic" or a multiplier."""
+    get_narrator().set_speed(speed)
+
+
+def prompt(text):
+    """Shows a prompt on the current screen and reads the player's answer."""
+    return get_screen().prompt(text)
+
+
+def run_dialog(steps):
+    """
+    Drives a dialog generator on the current screen. Interactive code is
+    written as generators that yield each prompt's text and receive the
+    player's answer, so the same code can be driven by input() here or by an
+    async front end. Returns the generator's return value.
+    """
+    answer = None
+    while True:
+        try:
+            text = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+        answer = prompt(text)
+
+
+def print_box(title, lines, width=54):
+    """Print a framed box with proper alignment for colored and emoji text."""
+    if is_headless():
+        return
+    write_lines(render_box(title, lines, width))
+
+
+def clear_screen():
+    """Clears the console screen."""
+    if is_headless():
+        return
+    get_screen().clear()
+
+
+def print_slow(text, delay=0.03, color=None):
+    """
+    Prints text with a slight delay for a more dramatic effect. `delay` is the
+    per-character delay at cinematic speed; the narration speed scales it.
+    """
+    if is_headless():
+        return
+    if color:
+        text = colorize(text, color)
+    get_narrator().say(text, delay)
+
+
+def print_header(title, color=Colors.BRIGHT_CYAN):
+    """Prints a styled header with color and nice spacing."""
+    write_lines(render_header(title, color))
+
+
+def print_section_break():
+    """Prints a visual break between sections."""
+    write_lines(render_section_break())
+
+
+def print_blank(lines=1):
+    """Prints empty lines for spacing."""
+    write_lines([""] * lines)
+
+
+def print_with_spacing(text, color=None, spacing_before=0, spacing_after=1):
+    """Print text with customizable spacing before and after."""
+    if color:
+        text = colorize(text, color)
+    write_lines([""] * spacing_before + [text] + [""] * spacing_after)
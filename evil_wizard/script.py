@@ -0,0 +1,102 @@
+"""
+Scripted play: full games driven by a list of answers instead of a player.
+
+Every prompt is answered with the next line of the script and the answer is
+echoed, so the transcript reads like a terminal session. A game that runs
+out of answers stops there and is reported as incomplete. run_games() plays
+the same script any number of times and returns a summary that can be
+written as JSON:
+
+    python -m evil_wizard --script moves.txt --games 1000 --quiet --seed 7
+"""
+
+import time
+
+from .engine import default_rng, derive_seed
+from .cli import Game
+from .rendering import get_screen
+
+
+def read_script(handle):
+    """The answers in an open script file, one per line (blank lines count)."""
+    return [line.rstrip("\r\n") for line in handle]
+
+
+def play_scripted(game, answers):
+    """
+    Plays `game` on the current screen, answering its prompts from `answers`
+    until it ends or the script runs out. Returns the number of answers used.
+    """
+    screen = get_screen()
+    steps = game.play()
+    used = 0
+    answer = None
+    while True:
+        try:
+            text = steps.send(answer)
+        except StopIteration:
+            return used
+        if used == len(answers):
+            steps.close()
+            return used
+        answer = answers[used]
+        used += 1
+        screen.show_prompt(text)
+        screen.echo(answer)
+
+
+def game_summary(game, used, seconds):
+    """One game's outcome as a JSON-ready dict."""
+    player, boss = game.player, game.boss
+    if boss is None or (player.is_alive() and game.enemies_remain()):
+        outcome = "incomplete"  # The script ran out before the battle ended
+    else:
+        outcome = "victory" if player.is_alive() else "defeat"
+    return {
+        "outcome": outcome,
+        "class": player.role if player else None,
+        "weapon": player.weapon.name if player and player.weapon else None,
+        "boss": game.boss_kind,
+        "encounter": game.encounter_kind,
+        "turns": game.turn,
+        "player_hp": player.hp if player else None,
+        "boss_hp": boss.hp if boss else None,
+        "answers": used,
+        "seconds": round(seconds, 6),
+    }
+
+
+def run_games(
+    answers,
+    games=1,
+    seed=None,
+    autopilot=None,
+    boss="hydra",
+    journal=None,
+    encounter=None,
+):
+    """
+    Plays the script `games` times. With a seed, game N's dice are seeded
+    from (seed, N), so a run can be repeated exactly. Returns the summary.
+    """
+    results = []
+    began = time.perf_counter()
+    for index in range(games):
+        if seed is not None:
+            default_rng.seed(derive_seed(seed, "script", index))
+        game = Game(autopilot, boss, journal, encounter)
+        started = time.perf_counter()
+        used = play_scripted(game, answers)
+        results.append(game_summary(game, used, time.perf_counter() - started))
+    seconds = time.perf_counter() - began
+
+    outcomes = [result["outcome"] for result in results]
+    return {
+        "games": games,
+        "victories": outcomes.count("victory"),
+        "defeats": outcomes.count("defeat"),
+        "incomplete": outcomes.count("incomplete"),
+        "seconds": round(seconds, 6),
+        "games_per_second": round(games / seconds, 1) if seconds else None,
+        "results": results,
+    }
@@ -0,0 +1,313 @@
+"""
+Opt-in instrumentation of the game loop.
+
+Instrumentation.install() wraps the game's phases (Game.play, which
+interactive, scripted and server games all drive, the player and boss
+turns, process_status_effects, take_damage), the renderer, narration sleeps
+and input prompts with timers, and counts crits, weapon procs and ability
+casts. uninstall() puts the original functions back, so code that
+never installs it runs exactly as before, at no cost.
+
+Phases nest: times are inclusive, so a player turn includes the damage it
+deals. input_wait, narration_sleep and render do not overlap (apart from
+writing the prompt text itself), and `logic` is what remains of the game's
+wall time once they are taken out.
+The player turn is timed only while it runs, not while it waits for input.
+
+    python starter.py --instrument stats.json   # or stats.prom
+    python instrument.py --battles 200 --prometheus
+"""
+
+import argparse
+import functools
+import json
+import sys
+import time
+
+import starter
+
+METRIC_PREFIX = "evil_wizard"
+
+
+class PhaseStats:
+    """Call count and total wall/CPU seconds of one phase."""
+
+    __slots__ = ("calls", "wall", "cpu", "_depth")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._depth = 0  # Recursive or nested calls are timed once
+
+    def as_dict(self):
+        return {"calls": self.calls, "wall_seconds": self.wall, "cpu_seconds": self.cpu}
+
+
+class Instrumentation:
+    """Per-phase timers and event counters, installed by wrapping game functions."""
+
+    def __init__(self):
+        self.phases = {}  # phase name -> PhaseStats
+        self.counters = {
+            "crits": 0,
+            "procs": 0,
+            "ability_casts": 0,
+            "potions": 0,
+            "boss_abilities": 0,
+            "effects_applied": 0,
+        }
+        self._originals = []  # (owner, attribute, original value)
+
+    # --- Installing ---
+
+    def install(self):
+        """Wraps the instrumented functions. Undo with uninstall()."""
+        if self._originals:
+            raise RuntimeError("Instrumentation is already installed")
+        self._wrap(starter.Game, "play", self._timed_generator, "game")
+        self._wrap(starter.Game, "_player_turn", self._timed_dialog, "player_turn")
+        self._wrap(starter.Game, "_boss_turn", self._timed, "boss_turn")
+        self._wrap_function("process_status_effects", self._timed, "status_effects")
+        self._wrap(starter.Character, "take_damage", self._timed, "take_damage")
+        self._wrap_function("render_box", self._timed, "render")
+        self._wrap(starter.Screen, "write", self._timed, "render")
+        self._wrap(starter.Screen, "present", self._timed, "render")
+        self._wrap(starter.Screen, "prompt", self._timed, "input_wait")
+        self._wrap(starter.Clock, "sleep_until", self._timed, "narration_sleep")
+        self._wrap(starter.Weapon, "apply_special_effect", self._count_procs)
+        self._wrap_function("emit", self._count_events)
+        return self
+
+    def uninstall(self):
+        """Restores every wrapped function."""
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def _wrap(self, owner, name, wrapper, *args):
+        original = getattr(owner, name)
+        self._originals.append((owner, name, original))
+        setattr(owner, name, functools.wraps(original)(wrapper(original, *args)))
+
+    def _wrap_function(self, name, wrapper, *args):
+        """
+        Wraps a module-level function in every game module that binds it:
+        `from .engine import emit` copies the function into the importing
+        module, and starter caches the names it hands out.
+        """
+        starter.Game  # Load the whole package first
+        getattr(starter, name)  # Cache the original in starter, not the wrapper
+        for module_name, module in list(sys.modules.items()):
+            if module_name == "starter" or module_name.startswith("evil_wizard."):
+                if callable(vars(module).get(name)):
+                    self._wrap(module, name, wrapper, *args)
+
+    def _phase(self, name):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    # --- Wrappers ---
+
+    def _timed(self, function, phase):
+        stats = self._phase(phase)
+
+        def timed(*args, **kwargs):
+            if stats._depth:
+                return function(*args, **kwargs)
+            stats.calls += 1
+            stats._depth = 1
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.wall += time.perf_counter() - wall
+                stats.cpu += time.process_time() - cpu
+                stats._depth = 0
+
+        return timed
+
+    def _timed_generator(self, function, phase):
+        """Times a generator from its first step until it finishes or is closed."""
+        stats = self._phase(phase)
+
+        def timed(*args, **kwargs):
+            if stats._depth:
+                return (yield from function(*args, **kwargs))
+            stats.calls += 1
+            stats._depth = 1
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return (yield from function(*args, **kwargs))
+            finally:
+                stats.wall += time.perf_counter() - wall
+                stats.cpu += time.process_time() - cpu
+                stats._depth = 0
+
+        return timed
+
+    def _timed_dialog(self, function, phase):
+        """Times a dialog generator only while it runs, not while it awaits input."""
+        stats = self._phase(phase)
+
+        def timed(*args, **kwargs):
+            stats.calls += 1
+            steps = function(*args, **kwargs)
+            answer = None
+            while True:
+                wall, cpu = time.perf_counter(), time.process_time()
+                try:
+                    text = steps.send(answer)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    stats.wall += time.perf_counter() - wall
+                    stats.cpu += time.process_time() - cpu
+                answer = yield text
+
+        return timed
+
+    def _count_procs(self, function):
+        counters = self.counters
+
+        def counted(weapon, wielder, target):
+            procced = function(weapon, wielder, target)
+            counters["procs"] += bool(procced)
+            return procced
+
+        return counted
+
+    def _count_events(self, function):
+        counters = self.counters
+
+        def counted(character, event, code=0, value=0, critical=False):
+            if event == starter.EVENT_DAMAGE:
+                counters["crits"] += critical
+            elif event == starter.EVENT_ACTION:
+                if isinstance(character, starter.Boss):
+                    counters["boss_abilities"] += 1
+                elif code == 4:
+                    counters["potions"] += 1
+                elif code > 30:  # See starter.action_id()
+                    counters["ability_casts"] += 1
+            elif event == starter.EVENT_EFFECT_APPLIED:
+                counters["effects_applied"] += 1
+            function(character, event, code, value, critical)
+
+        return counted
+
+    # --- Reporting ---
+
+    def breakdown(self):
+        """Wall seconds of the game split into input, sleeping, rendering and logic."""
+        seconds = {
+            name: self.phases[name].wall if name in self.phases else 0.0
+            for name in ("game", "input_wait", "narration_sleep", "render")
+        }
+        game = seconds.pop("game")
+        seconds["logic"] = max(0.0, game - sum(seconds.values()))
+        return seconds
+
+    def as_dict(self):
+        return {
+            "phases": {name: stats.as_dict() for name, stats in self.phases.items()},
+            "counters": dict(self.counters),
+            "breakdown": self.breakdown(),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self):
+        """The statistics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, help_text, kind, samples):
+            name = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        phases = sorted(self.phases.items())
+        metric(
+            "phase_calls_total",
+            "Calls of each instrumented phase.",
+            "counter",
+            [(f'phase="{name}"', stats.calls) for name, stats in phases],
+        )
+        metric(
+            "phase_wall_seconds_total",
+            "Wall-clock seconds spent in each phase (inclusive).",
+            "counter",
+            [(f'phase="{name}"', f"{stats.wall:.6f}") for name, stats in phases],
+        )
+        metric(
+            "phase_cpu_seconds_total",
+            "CPU seconds spent in each phase (inclusive).",
+            "counter",
+            [(f'phase="{name}"', f"{stats.cpu:.6f}") for name, stats in phases],
+        )
+        metric(
+            "events_total",
+            "Battle events by kind.",
+            "counter",
+            [(f'event="{name}"', count) for name, count in self.counters.items()],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes Prometheus text if `path` ends in .prom, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+
+    def format_report(self):
+        lines = [f"{'Phase':<18} {'Calls':>8} {'Wall s':>10} {'CPU s':>10}"]
+        for name, stats in sorted(self.phases.items()):
+            lines.append(
+                f"{name:<18} {stats.calls:>8} {stats.wall:>10.4f} {stats.cpu:>10.4f}"
+            )
+        lines.append("")
+        lines.extend(f"{name:<18} {count:>8}" for name, count in self.counters.items())
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--battles", type=int, default=100, help="per combination")
+    parser.add_argument("--policy", default="greedy", choices=starter.policy_names())
+    parser.add_argument("--seed", type=int, default=0)
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="print JSON")
+    output.add_argument(
+        "--prometheus", action="store_true", help="print Prometheus text"
+    )
+    args = parser.parse_args(argv)
+
+    with Instrumentation() as instrumentation:
+        for role in starter.class_names():
+            for weapon_key in starter.WEAPON_COLLECTIONS[role]:
+                for index in range(args.battles):
+                    seed = starter.derive_seed(args.seed, role, weapon_key, index)
+                    starter.simulate_battle(role, weapon_key, args.policy, seed)
+
+    if args.json:
+        print(instrumentation.to_json())
+    elif args.prometheus:
+        print(instrumentation.to_prometheus(), end="")
+    else:
+        print(instrumentation.format_report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,704 @@
+"""
+Compact binary battle journal.
+
+A journal file is the magic bytes b"EWJ3" followed by variable-length
+records: a header byte, then code, value and the HP of the combatant
+concerned after the event as varints (value zigzag-encoded). The header
+holds the side (bit 0: player or boss), a critical-hit bit (bit 1), turn
+bits (bit 2: the turn after the previous record's; bit 3: a varint turn
+follows the header) and the record kind (bits 4-7). HP is stored as its
+difference from what the record implies: the side's HP at its previous
+record, less the damage or plus the healing, so most records take 4 bytes.
+Kinds 1-7 are the starter.EVENT_* battle events, reported through each
+combatant's listener; BEGIN, SNAPSHOT and END records frame a battle and
+make it possible to start a replay at any turn. In an encounter, a JOIN
+record brings in each minion, numbering the enemies in the order they
+joined (the boss is enemy 0), and boss-side records are about the enemy
+the last ENEMY record named.
+
+A battle costs about 18 bytes per turn, framing included: the typical
+10-25 turn battle takes 200-450 bytes and a recording sweep averages about
+300 bytes per battle. 1 KB is a budget for that average, not a cap; a rare
+150-turn stalemate takes about 2 KB. Encounters record every enemy, so they
+cost more with each minion: 1-2 KB for the Hydra's brood, nearer 10 KB for
+a swarm of 50 rats.
+
+Classes, weapons, bosses, status effects and boss abilities are stored as
+ids into name tables that the journal itself defines: a NAME record (code:
+table, value: id, hp: length) followed by the name in UTF-8. Every writer
+session starts fresh tables with a TABLES record, so journals replay
+correctly however the game's rosters, catalogs and registries change later.
+
+    python journal.py record battles.ewj --battles 100 --policy greedy
+    python journal.py record brood.ewj --encounter hydra-brood
+    python journal.py list battles.ewj
+    python journal.py replay battles.ewj --battle 3 --turn 12 --speed fast
+    python starter.py --journal games.ewj
+"""
+
+import argparse
+import os
+import sys
+
+import starter
+
+MAGIC = b"EWJ3"
+
+PLAYER = 0
+BOSS = 1
+CRITICAL = 2  # Header bits
+NEXT_TURN = 4
+NEW_TURN = 8
+KIND_SHIFT = 4
+
+# Record kinds besides the starter.EVENT_* events
+BEGIN = 0  # Player: code class, value weapon, hp max HP; boss: code kind,
+# value the class the player's abilities come from, hp max HP
+SNAPSHOT = 8  # Player: code potions, value mana; boss: code phase
+SNAPSHOT_EFFECT = 9  # An effect active at a snapshot: code effect, value turns
+END = 10  # code: winner (see WINNERS), turn: turns taken
+NAME = 11  # Defines a name: code table, value id, hp length of the name
+TABLES = 12  # Forgets every name defined so far
+JOIN = 13  # Boss side: a minion joins the battle; code kind, hp max HP
+ENEMY = 14  # Boss side: code the enemy the boss-side records after it are about
+
+WINNERS = (None, "player", "boss")
+
+# Name tables, and how many ids each can hold
+CLASSES = 0
+WEAPONS = 1
+BOSSES = 2
+EFFECTS = 3
+BOSS_ABILITIES = 4
+MINIONS = 5
+TABLE_SIZES = (0x100, 0x8000, 0x100, 0x100, 0x100, 0x100)
+
+# Events whose code is a status effect's order in starter.STATUS_EFFECTS
+_EFFECT_EVENTS = (
+    starter.EVENT_EFFECT_APPLIED,
+    starter.EVENT_EFFECT_TICK,
+    starter.EVENT_EFFECT_EXPIRED,
+)
+
+
+def _put_varint(buffer, number):
+    """Appends a non-negative integer, 7 bits per byte, low bits first."""
+    while number > 0x7F:
+        buffer.append(number & 0x7F | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+def _put_signed(buffer, number):
+    _put_varint(buffer, number << 1 if number >= 0 else ~number << 1 | 1)
+
+
+def _get_varint(data, offset):
+    """The varint at `offset` and the offset after it. IndexError if torn."""
+    number = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+def _get_signed(data, offset):
+    number, offset = _get_varint(data, offset)
+    return (~(number >> 1) if number & 1 else number >> 1), offset
+
+
+def _expected_hp(kind, value, hp):
+    """The HP a record implies, given the side's HP at its previous record."""
+    if kind == starter.EVENT_DAMAGE:
+        return hp - value
+    if kind == starter.EVENT_HEAL:
+        return hp + value
+    return hp
+
+
+def _ability_table_name(character_class):
+    """The role whose ability table a (possibly variant) class uses."""
+    return next(
+        role
+        for role, table in starter.ABILITY_TABLES.items()
+        if table is character_class.abilities
+    )
+
+
+class BattleRecorder:
+    """
+    Listens to the events of one battle and encodes them as records. The
+    battle's records are buffered and handed to the writer as a whole when it
+    finishes, so battles recorded side by side never interleave. Minions
+    that fight alongside the boss are recorded once add_enemy() has been
+    called for them.
+    """
+
+    def __init__(self, writer, player, boss, snapshot_every=10):
+        self.writer = writer
+        self.player = player
+        self.boss = boss
+        self.snapshot_every = snapshot_every
+        self.turn = 0
+        self._records = bytearray()
+        self._enemies = [boss]  # In the order they joined
+        self._indexes = {boss: 0}  # enemy -> index
+        self._enemy = 0  # The enemy boss-side records are about
+        self._turn = 0  # Turn and HP (player, then each enemy) as of the last record
+        self._hp = [0, 0]
+        self._effect_names = tuple(starter.STATUS_EFFECTS)
+        name_id = writer.name_id
+        weapon = player.weapon.name if player.weapon else ""
+        self._add(
+            BEGIN,
+            PLAYER,
+            name_id(CLASSES, player.role),
+            name_id(WEAPONS, weapon),
+            player.max_hp,
+        )
+        self._add(
+            BEGIN,
+            BOSS,
+            name_id(BOSSES, boss.kind),
+            name_id(CLASSES, _ability_table_name(player.character_class)),
+            boss.max_hp,
+        )
+        starter.add_listener(player, self)
+        starter.add_listener(boss, self)
+
+    def _add(self, kind, side, code, value, hp, critical=False):
+        records, turn = self._records, self.turn
+        header = kind << KIND_SHIFT | critical << 1 | side
+        if turn == self._turn + 1:
+            header |= NEXT_TURN
+        elif turn != self._turn:
+            header |= NEW_TURN
+        records.append(header)
+        if header & NEW_TURN:
+            _put_varint(records, turn)
+        _put_varint(records, code)
+        _put_signed(records, value)
+        slot = self._enemy + 1 if side == BOSS else 0
+        _put_signed(records, hp - _expected_hp(kind, value, self._hp[slot]))
+        self._turn = turn
+        self._hp[slot] = hp
+
+    def _select(self, index):
+        """Makes the boss-side records that follow about enemy `index`."""
+        if index != self._enemy:
+            self._enemy = index
+            self._add(ENEMY, BOSS, index, 0, self._enemies[index].hp)
+
+    def add_enemy(self, minion):
+        """Records a minion joining the battle, and listens to it from now on."""
+        self._enemy = len(self._enemies)
+        self._indexes[minion] = self._enemy
+        self._enemies.append(minion)
+        self._hp.append(0)
+        code = self.writer.name_id(MINIONS, minion.kind)
+        self._add(JOIN, BOSS, code, 0, minion.max_hp)
+        starter.add_listener(minion, self)
+
+    def _effect_id(self, order):
+        return self.writer.name_id(EFFECTS, self._effect_names[order])
+
+    def __call__(self, character, event, code, value, critical):
+        if character is self.player:
+            side = PLAYER
+        else:
+            side = BOSS
+            self._select(self._indexes[character])
+        if event in _EFFECT_EVENTS:
+            code = self._effect_id(code)
+        elif event == starter.EVENT_ACTION and side == BOSS:
+            handler = character.behavior.abilities[code]
+            code = self.writer.name_id(BOSS_ABILITIES, _BOSS_ABILITY_NAMES[handler])
+        self._add(event, side, code, value, character.hp, critical)
+
+    def begin_turn(self, turn):
+        """Marks the start of a turn, taking a snapshot every `snapshot_every` turns."""
+        self.turn = turn
+        if (turn - 1) % self.snapshot_every == 0:
+            player = self.player
+            self._add(SNAPSHOT, PLAYER, player.potions, player.mana, player.hp)
+            self._snapshot_effects(PLAYER, player)
+            for index, enemy in enumerate(self._enemies):
+                if index == 0 or enemy.is_alive():  # The dead stay dead
+                    self._select(index)
+                    self._add(SNAPSHOT, BOSS, enemy.phase, 0, enemy.hp)
+                    self._snapshot_effects(BOSS, enemy)
+
+    def _snapshot_effects(self, side, character):
+        for effect in character.status_effects.values():
+            code = self._effect_id(effect.kind.order)
+            self._add(SNAPSHOT_EFFECT, side, code, effect.turns, character.hp)
+
+    def finish(self, winner, turns):
+        """Ends the battle ("player", "boss" or None) and writes it out."""
+        self.turn = turns
+        self._add(END, PLAYER, WINNERS.index(winner), 0, self.player.hp)
+        for character in (self.player, *self._enemies):
+            starter.remove_listener(character, self)
+        self.writer.write_battle(self._records)
+
+
+class JournalWriter:
+    """
+    Appends battles to a journal file through an in-memory buffer that is
+    written out once it holds `buffer_size` bytes, and on flush() or close().
+    Raises ValueError if the file exists but is not a journal of this format.
+    """
+
+    def __init__(self, path, buffer_size=1 << 16, snapshot_every=10):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.snapshot_every = snapshot_every
+        self.battles = 0
+        self._buffer = bytearray()
+        self._names = {}  # (table, name) -> id
+        self._sizes = [0] * len(TABLE_SIZES)  # Ids handed out, per table
+        self._file = open(path, "a+b")
+        if self._file.tell() == 0:
+            self._buffer += MAGIC
+        else:
+            self._file.seek(0)
+            magic = self._file.read(len(MAGIC))
+            if magic != MAGIC:
+                self._file.close()
+                raise ValueError(f"{path} is not a battle journal of this format")
+        self._buffer += bytes((TABLES << KIND_SHIFT, 0, 0, 0))
+
+    def name_id(self, table, name):
+        """The id of `name` in `table`, defining it in the journal on first use."""
+        ident = self._names.get((table, name))
+        if ident is None:
+            ident = self._sizes[table]
+            if ident == TABLE_SIZES[table]:
+                raise ValueError(f"too many distinct names in journal table {table}")
+            self._sizes[table] += 1
+            self._names[table, name] = ident
+            data = name.encode("utf-8")
+            buffer = self._buffer
+            buffer.append(NAME << KIND_SHIFT)
+            _put_varint(buffer, table)
+            _put_signed(buffer, ident)
+            _put_signed(buffer, len(data))
+            buffer += data
+        return ident
+
+    def start_battle(self, player, boss):
+        """Starts recording a battle between two freshly created combatants."""
+        return BattleRecorder(self, player, boss, self.snapshot_every)
+
+    def write_battle(self, records):
+        self._buffer += records
+        self.battles += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Reading ---
+
+
+class Record:
+    """
+    One decoded journal record. `name` is the name its code stands for, for
+    records that refer to a status effect, a boss ability or a minion kind.
+    `enemy` is the enemy a boss-side record is about (0: the boss).
+    """
+
+    __slots__ = (
+        "turn",
+        "kind",
+        "side",
+        "critical",
+        "code",
+        "value",
+        "hp",
+        "name",
+        "enemy",
+    )
+
+    def __init__(self, turn, header, code, value, hp, name=None, enemy=0):
+        self.turn = turn
+        self.kind = header >> KIND_SHIFT
+        self.side = header & 1
+        self.critical = bool(header & CRITICAL)
+        self.code = code
+        self.value = value
+        self.hp = hp
+        self.name = name
+        self.enemy = enemy
+
+
+class JournalBattle:
+    """The records of one battle read back from a journal."""
+
+    def __init__(self, records, names, size):
+        self.records = records
+        self.size = size  # Bytes the battle's records take, names aside
+        player, boss = records[0], records[1]
+        self.role = names[CLASSES][player.code]
+        self.weapon = names[WEAPONS][player.value]  # The weapon's name
+        self.boss = names[BOSSES][boss.code]
+        self.abilities = names[CLASSES][boss.value]  # Class the abilities are from
+        self.player_max_hp = player.hp
+        self.boss_max_hp = boss.hp
+        # The minions that joined an encounter, in order: (kind, max HP)
+        self.minions = [(r.name, r.hp) for r in records if r.kind == JOIN]
+        end = records[-1]
+        self.finished = end.kind == END  # False if recording stopped mid-battle
+        self.winner = WINNERS[end.code] if self.finished else None
+        self.turns = end.turn
+
+
+def read_journal(path):
+    """Reads every battle from a journal file. Raises ValueError if it is not one."""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a battle journal of this format")
+
+    names = [{} for _ in TABLE_SIZES]  # table -> {id: name}
+    battles, current, size = [], [], 0
+    turn, enemy, hps = 0, 0, [0, 0]  # HP of the player, then of each enemy
+    offset = len(MAGIC)
+    while offset < len(data):
+        start = offset
+        header = data[offset]
+        kind, side = header >> KIND_SHIFT, header & 1
+        if kind == BEGIN and side == PLAYER:
+            turn, enemy, hps = 0, 0, [0, 0]
+        try:
+            if header & NEW_TURN:
+                record_turn, offset = _get_varint(data, offset + 1)
+            else:
+                record_turn, offset = turn + bool(header & NEXT_TURN), offset + 1
+            code, offset = _get_varint(data, offset)
+            value, offset = _get_signed(data, offset)
+            hp, offset = _get_signed(data, offset)
+        except IndexError:
+            break  # A torn last record is dropped
+        if kind == NAME:
+            if offset + hp > len(data):
+                break
+            names[code][value] = data[offset : offset + hp].decode("utf-8")
+            offset += hp
+            continue
+        if kind == TABLES:  # A new writer session
+            if current:
+                battles.append(JournalBattle(current, names, size))
+                current, size = [], 0
+            names = [{} for _ in TABLE_SIZES]
+            continue
+        turn = record_turn
+        if kind == JOIN:
+            enemy = len(hps) - 1
+            hps.append(0)
+        elif kind == ENEMY:
+            enemy = code
+        slot = enemy + 1 if side == BOSS else 0
+        hp += _expected_hp(kind, value, hps[slot])
+        hps[slot] = hp
+        name = None
+        if kind in _EFFECT_EVENTS or kind == SNAPSHOT_EFFECT:
+            name = names[EFFECTS][code]
+        elif kind == starter.EVENT_ACTION and side == BOSS:
+            name = names[BOSS_ABILITIES][code]
+        elif kind == JOIN:
+            name = names[MINIONS][code]
+        if kind == BEGIN and side == PLAYER and current:
+            battles.append(JournalBattle(current, names, size))
+            current, size = [], 0
+        current.append(
+            Record(turn, header, code, value, hp, name, enemy if side == BOSS else 0)
+        )
+        size += offset - start
+    if current:
+        battles.append(JournalBattle(current, names, size))
+    return battles
+
+
+# --- Replay ---
+
+_BOSS_ABILITY_NAMES = {
+    handler: name for name, handler in starter.BOSS_ABILITIES.items()
+}
+_PLAYER_ACTIONS = {1: "attacks", 2: "takes a defensive stance", 4: "drinks a potion"}
+
+
+def _action_text(actor, record):
+    if record.side == BOSS:
+        return f"{actor.name} uses {record.name.replace('_', ' ').title()}!"
+    code = record.code
+    if code in _PLAYER_ACTIONS:
+        return f"{actor.name} {_PLAYER_ACTIONS[code]}."
+    ability = actor.abilities[str(code - 30)]
+    return f"{actor.name} casts {ability.name}!"
+
+
+def _apply(record, player, enemies):
+    """Updates the stand-in combatants with one record."""
+    character = enemies[record.enemy] if record.side == BOSS else player
+    kind = record.kind
+    if kind == SNAPSHOT:
+        character.status_effects = starter.StatusEffects()
+        if character is player:
+            player.potions, player.mana = record.code, record.value
+        else:
+            character.phase = record.code
+    elif kind == SNAPSHOT_EFFECT or kind == starter.EVENT_EFFECT_APPLIED:
+        effect_kind = starter.STATUS_EFFECTS[record.name]
+        character.status_effects[effect_kind.name] = starter.StatusEffect(
+            effect_kind, record.value
+        )
+    elif kind == starter.EVENT_EFFECT_TICK:
+        character.status_effects[record.name].turns = record.value
+    elif kind == starter.EVENT_EFFECT_EXPIRED:
+        character.status_effects.pop(record.name, None)
+    elif kind == starter.EVENT_ACTION and character is player:
+        player.mana = record.value
+        player.potions -= record.code == 4
+    elif kind == starter.EVENT_PHASE:
+        character.phase = record.code
+    if kind != END:
+        character.hp = record.hp
+
+
+def _narrate(record, player, enemies):
+    """Describes one record, after _apply() has taken it into account."""
+    character = enemies[record.enemy] if record.side == BOSS else player
+    kind = record.kind
+    if kind == starter.EVENT_ACTION:
+        starter.print_slow(_action_text(character, record), color=starter.Colors.BOLD)
+    elif kind == starter.EVENT_DAMAGE:
+        if record.critical:
+            starter.print_slow("*** CRITICAL HIT! ***", color=starter.Colors.BRIGHT_RED)
+        starter.print_slow(
+            f"{character.name} takes {record.value} damage!", color=starter.Colors.RED
+        )
+    elif kind == starter.EVENT_HEAL:
+        starter.print_slow(
+            f"{character.name} heals for {record.value} HP!",
+            color=starter.Colors.BRIGHT_GREEN,
+        )
+    elif kind == starter.EVENT_EFFECT_APPLIED:
+        starter.print_slow(
+            f"{character.name} is {record.name} ({record.value} turns).",
+            color=starter.Colors.PURPLE,
+        )
+    elif kind == starter.EVENT_EFFECT_EXPIRED:
+        starter.print_slow(
+            f"{character.name} is no longer {record.name}.",
+            color=starter.Colors.GRAY,
+        )
+    elif kind == starter.EVENT_PHASE:
+        message = character.behavior.phases[record.code].message
+        if message:
+            starter.print_slow(
+                message.format(name=character.name), color=starter.Colors.BRIGHT_RED
+            )
+    elif kind == JOIN:
+        starter.print_slow(
+            f"{character.name} joins the battle!", color=starter.Colors.BRIGHT_RED
+        )
+    else:
+        return
+    starter.pause(0.5)
+
+
+def _combatants(battle):
+    """
+    Stand-ins for a journalled battle's combatants. A class or weapon the
+    game no longer has (or a variant, such as balance.py tries) is stood in
+    for by the class its abilities came from, and by a weapon of the same
+    name without bonuses; HP always comes from the journal. Returns the
+    player and the enemies: the boss, then any minions in the order they
+    joined, numbered among those of their kind as in the encounter.
+    """
+    role = battle.role if battle.role in starter.class_names() else battle.abilities
+    player = starter.create_player(role)
+    weapons = starter.WEAPON_COLLECTIONS[player.character_class.weapon_pool]
+    weapon = next(
+        (weapon for weapon in weapons.values() if weapon.name == battle.weapon),
+        None,
+    )
+    if weapon is None and battle.weapon:
+        weapon = starter.Weapon(battle.weapon, 0, 0, 0.0, None)
+    if weapon is not None:
+        player.equip_weapon(weapon)
+    player.max_hp = player.hp = battle.player_max_hp
+    boss = starter.create_boss(kind=battle.boss)
+    boss.max_hp = boss.hp = battle.boss_max_hp
+    enemies, counts = [boss], {}
+    for kind, max_hp in battle.minions:
+        behavior = starter.minion_behavior(kind)
+        number = counts[kind] = counts.get(kind, 0) + 1
+        enemies.append(
+            starter.Boss(
+                f"{behavior.name} {number}",
+                max_hp,
+                behavior.attack,
+                behavior.defense,
+                behavior=behavior,
+            )
+        )
+    return player, enemies
+
+
+def replay(battle, start_turn=1):
+    """
+    Re-renders a journalled battle on the current screen, at the current
+    narration speed. Starting after turn 1 restores the last snapshot before
+    `start_turn` and silently applies the records that follow it.
+    """
+    player, enemies = _combatants(battle)
+    boss = enemies[0]
+    records = battle.records
+
+    start = 2  # After the BEGIN records
+    for index, record in enumerate(records):
+        if record.turn > start_turn:
+            break
+        if record.kind == SNAPSHOT and record.side == PLAYER:
+            start = index
+    while start < len(records) and records[start].turn < start_turn:
+        _apply(records[start], player, enemies)
+        start += 1
+
+    turn = None
+    for record in records[start:]:
+        if record.kind == END:
+            break
+        if record.turn != turn:
+            turn = record.turn
+            starter.print_header(f"Turn {turn}")
+            player.display_status()
+            boss.display_status()
+            starter.pause(1)
+        _apply(record, player, enemies)
+        _narrate(record, player, enemies)
+
+    outcome = {"player": "Victory", "boss": "Defeat", None: "No winner"}[battle.winner]
+    starter.print_box(
+        "Battle Result",
+        [
+            f"{outcome} after {battle.turns} turns"
+            + ("" if battle.finished else " (recording incomplete)"),
+            f"{player.name} ({player.role}): {player.hp}/{player.max_hp} HP",
+            f"{boss.name}: {boss.hp}/{boss.max_hp} HP",
+        ],
+    )
+
+
+def _parse_speed(text):
+    return text if text in starter.NARRATION_SPEEDS else float(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record headless battles")
+    record.add_argument("path")
+    record.add_argument("--battles", type=int, default=10, help="per combination")
+    record.add_argument("--policy", default="greedy", choices=starter.policy_names())
+    record.add_argument("--boss", default="hydra", choices=starter.boss_kinds())
+    record.add_argument(
+        "--encounter",
+        choices=starter.encounter_kinds(),
+        help="record this encounter instead of battles against --boss",
+    )
+    record.add_argument("--seed", type=int, default=0)
+
+    listing = commands.add_parser("list", help="list the battles in a journal")
+    listing.add_argument("path")
+
+    show = commands.add_parser("replay", help="re-render a battle")
+    show.add_argument("path")
+    show.add_argument("--battle", type=int, default=0, help="index from `list`")
+    show.add_argument("--turn", type=int, default=1, help="turn to start from")
+    show.add_argument(
+        "--speed",
+        type=_parse_speed,
+        default="fast",
+        help="instant, fast, cinematic or a delay multiplier (default: fast)",
+    )
+    show.add_argument(
+        "--color",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="color output (default: auto, off unless writing to a terminal "
+        "or if $NO_COLOR is set)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        with JournalWriter(args.path) as writer:
+            for role in starter.class_names():
+                for weapon_key in starter.WEAPON_COLLECTIONS[role]:
+                    for index in range(args.battles):
+                        seed = starter.derive_seed(args.seed, role, weapon_key, index)
+                        if args.encounter:
+                            starter.simulate_encounter(
+                                role,
+                                weapon_key,
+                                args.encounter,
+                                args.policy,
+                                seed,
+                                journal=writer,
+                            )
+                        else:
+                            starter.simulate_battle(
+                                role,
+                                weapon_key,
+                                args.policy,
+                                seed,
+                                boss=args.boss,
+                                journal=writer,
+                            )
+        battles = writer.battles
+        size = os.path.getsize(args.path)
+        print(f"{battles} battles, {size} bytes ({size / battles:.0f} per battle)")
+    elif args.command == "list":
+        print(
+            f"{'#':>5} {'Role':<12} {'Weapon':<22} {'Boss':<24} {'Winner':<7} "
+            f"{'Turns':>5} {'Bytes':>6}"
+        )
+        for index, battle in enumerate(read_journal(args.path)):
+            print(
+                f"{index:>5} {battle.role:<12} {battle.weapon:<22} {battle.boss:<24} "
+                f"{battle.winner or '-':<7} {battle.turns:>5} {battle.size:>6}"
+            )
+    else:
+        starter.set_narration_speed(args.speed)
+        if args.color == "never" or (
+            args.color == "auto"
+            and (not sys.stdout.isatty() or "NO_COLOR" in os.environ)
+        ):
+            starter.get_screen().color = False
+        replay(read_journal(args.path)[args.battle], args.turn)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+"""
+Asyncio game server: many players, one process.
+
+Every connection plays its own Game, driven as a dialog (see
+starter.run_dialog()). Between two prompts the game code runs straight
+through against a virtual clock, which records the text it writes and the
+pauses its Narrator asks for; the session then plays that back with
+`await asyncio.sleep()`. A player waiting at a prompt or watching narration
+costs a suspended coroutine, not a thread, so thousands of mostly idle
+sessions fit in one process. As on a terminal, pressing Enter during
+narration skips the rest of it.
+
+    python server.py --port 4000        # then: telnet localhost 4000
+    python server.py --load-test 1000   # simulated players, turn latency
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import re
+import sys
+import time
+
+import starter
+from journal import JournalWriter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+GA = b"\xff\xf9"  # Telnet Go Ahead: sent after every prompt
+# Telnet commands a client may send: option negotiation, subnegotiation, others
+TELNET_COMMAND = re.compile(
+    rb"\xff(?:[\xfb-\xfe].|\xfa.*?\xff\xf0|[\xf0-\xf9\xff])", re.S
+)
+
+MAX_LINE = 1024  # Longest input line accepted, in bytes
+PLAYBACK_TICK = 0.05  # Shorter narration delays are merged into longer sleeps
+
+
+class SessionOutput:
+    """
+    The stream and clock of one session's Screen and Narrator.
+
+    Written text and the delays asked for through sleep_until() are queued in
+    order until take() hands them to the session for playback. Time is
+    virtual: sleep_until() returns at once and moves now() forward.
+    """
+
+    def __init__(self):
+        self._items = []  # Text (str) and delays in seconds (float)
+        self._now = 0.0
+
+    # Stream interface used by starter.Screen
+    def write(self, text):
+        if self._items and isinstance(self._items[-1], str):
+            self._items[-1] += text
+        else:
+            self._items.append(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    # Clock interface used by starter.Narrator
+    def now(self):
+        return self._now
+
+    def sleep_until(self, deadline):
+        if deadline <= self._now:
+            return
+        delay = deadline - self._now
+        self._now = deadline
+        if self._items and isinstance(self._items[-1], float):
+            self._items[-1] += delay
+        else:
+            self._items.append(delay)
+
+    def take(self):
+        """Removes and returns everything queued so far."""
+        items, self._items = self._items, []
+        return items
+
+
+class ServerStats:
+    """
+    What the sessions of one server share: how many are connected and, per
+    turn, the seconds spent running game code and the seconds of narration
+    delay played back. The load test reads them to tell the server's own
+    latency apart from pacing; a long-running server does without.
+    """
+
+    def __init__(self):
+        self.active = 0  # Sessions connected right now
+        self.processing = []  # Seconds of game code per turn
+        self.narration = []  # Seconds of narration delay per turn (virtual clock)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _encode(text):
+    return text.replace("\n", "\r\n").encode("utf-8")
+
+
+class GameSession:
+    """One connected player and their game."""
+
+    def __init__(
+        self,
+        reader,
+        writer,
+        speed="fast",
+        boss="hydra",
+        idle_timeout=900,
+        journal=None,
+        stats=None,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.speed = speed
+        self.boss = boss
+        self.journal = journal  # journal.JournalWriter shared by all sessions
+        self.idle_timeout = idle_timeout
+        self.stats = stats  # ServerStats to record timings in, if any
+        self._lines = asyncio.Queue()  # Answers; None once the client is gone
+        self._playing = False
+        self._skipping = False
+        self._waker = None  # Future a skip resolves to cut a delay short
+
+    async def run(self):
+        """Plays a whole game over the connection, then closes it."""
+        reader_task = asyncio.create_task(self._read_lines())
+        output = SessionOutput()
+        screen = starter.Screen(output)
+        narrator = starter.Narrator(self.speed, clock=output, skip_key=None)
+        stats = self.stats
+        if stats:
+            stats.active += 1
+        try:
+            with starter.output_to(screen, narrator):
+                steps = starter.Game(boss=self.boss, journal=self.journal).play()
+                answer = None
+                while True:
+                    began = time.perf_counter()
+                    try:
+                        text = steps.send(answer)
+                    except StopIteration:
+                        break
+                    screen.show_prompt(text)
+                    items = output.take()
+                    if stats:
+                        stats.processing.append(time.perf_counter() - began)
+                        stats.narration.append(
+                            sum(item for item in items if isinstance(item, float))
+                        )
+                    await self._play(items)
+                    self.writer.write(GA)
+                    await self.writer.drain()
+                    answer = await self._next_line()
+                    if answer is None:
+                        return
+                await self._play(output.take())
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            if stats:
+                stats.active -= 1
+            reader_task.cancel()
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_lines(self):
+        """Reads the client's lines; one sent during narration skips it instead."""
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                line = TELNET_COMMAND.sub(b"", line)
+                if self._playing:
+                    self._skip()
+                    continue
+                self._lines.put_nowait(line.decode("utf-8", "replace").strip("\r\n"))
+        except (ConnectionError, ValueError):  # ValueError: line too long
+            pass
+        self._lines.put_nowait(None)
+        self._skip()
+
+    async def _next_line(self):
+        return await asyncio.wait_for(self._lines.get(), self.idle_timeout)
+
+    def _skip(self):
+        self._skipping = True
+        if self._waker is not None:
+            _wake(self._waker)
+
+    async def _play(self, items):
+        """Sends queued output, waiting out its delays unless the player skips."""
+        self._playing, self._skipping = True, False
+        try:
+            text, delay = [], 0.0
+            for item in items:
+                if isinstance(item, str):
+                    text.append(item)
+                    continue
+                delay += item
+                if delay >= PLAYBACK_TICK and not self._skipping:
+                    await self._send("".join(text))
+                    text = []
+                    await self._sleep(delay)
+                    delay = 0.0
+            await self._send("".join(text))
+        finally:
+            self._playing = False
+
+    async def _send(self, text):
+        if text:
+            self.writer.write(_encode(text))
+            await self.writer.drain()
+
+    async def _sleep(self, seconds):
+        loop = asyncio.get_running_loop()
+        self._waker = loop.create_future()
+        timer = loop.call_later(seconds, _wake, self._waker)
+        try:
+            await self._waker
+        finally:
+            timer.cancel()
+            self._waker = None
+
+
+async def serve(
+    host="127.0.0.1",
+    port=4000,
+    speed="fast",
+    boss="hydra",
+    journal=None,
+    stats=None,
+):
+    """
+    Starts the server and returns the asyncio Server. Finished battles are
+    recorded to `journal` (a journal.JournalWriter) if one is given, and
+    sessions record their timings in `stats` (a ServerStats) if one is given.
+    """
+
+    async def on_connect(reader, writer):
+        await GameSession(
+            reader, writer, speed, boss, journal=journal, stats=stats
+        ).run()
+
+    return await asyncio.start_server(
+        on_connect, host, port, limit=MAX_LINE, backlog=4096
+    )
+
+
+# --- Load Test ---
+
+
+class LoadReport:
+    """Outcome of a load test."""
+
+    def __init__(self):
+        self.latencies = []  # Seconds from sending an answer to the next prompt
+        self.stats = None  # The in-process server's ServerStats, if it ran one
+        self.games = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def percentile(self, fraction, times=None):
+        times = sorted(self.latencies if times is None else times)
+        return times[min(len(times) - 1, int(len(times) * fraction))]
+
+    def _summary(self, label, times):
+        return (
+            f"{label}: p50 {self.percentile(0.50, times) * 1000:.2f} ms, "
+            f"p99 {self.percentile(0.99, times) * 1000:.2f} ms, "
+            f"max {max(times) * 1000:.2f} ms"
+        )
+
+    def format(self):
+        lines = [
+            f"{self.games} games finished, {self.errors} errors, "
+            f"{len(self.latencies)} turns in {self.seconds:.1f}s "
+            f"({len(self.latencies) / self.seconds:.0f} turns/s)"
+        ]
+        if self.latencies:
+            lines.append(self._summary("turn latency (client)", self.latencies))
+        if self.stats and self.stats.processing:
+            # The rest of a client's latency is narration and waiting its turn
+            # for the event loop behind other sessions
+            lines.append(self._summary("  game code", self.stats.processing))
+            lines.append(self._summary("  narration", self.stats.narration))
+        return "\n".join(lines)
+
+
+async def _simulated_player(host, port, think, report, connecting):
+    """Answers "1" to every prompt until the game ends."""
+    async with connecting:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await reader.readuntil(GA)
+        while True:
+            if think:
+                await asyncio.sleep(random.uniform(0, 2 * think))
+            writer.write(b"1\r\n")
+            sent = time.perf_counter()
+            await writer.drain()
+            try:
+                await reader.readuntil(GA)
+            except asyncio.IncompleteReadError:  # Game over, connection closed
+                report.games += 1
+                return
+            report.latencies.append(time.perf_counter() - sent)
+    finally:
+        writer.close()
+
+
+def _raise_file_limit():
+    """Lifts the open file limit to its maximum: every session is a socket."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def load_test(players, host=None, port=None, think=0.0, boss="hydra"):
+    """
+    Plays `players` simultaneous games against the server at host:port, or
+    against an in-process server with instant narration if host is None.
+    Returns a LoadReport.
+    """
+    _raise_file_limit()
+    report = LoadReport()
+    server = None
+    if host is None:
+        report.stats = ServerStats()
+        server = await serve("127.0.0.1", 0, "instant", boss, stats=report.stats)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    connecting = asyncio.Semaphore(256)  # Don't overrun the listen backlog
+    began = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            _simulated_player(host, port, think, report, connecting)
+            for _ in range(players)
+        ),
+        return_exceptions=True,
+    )
+    report.seconds = time.perf_counter() - began
+    report.errors = sum(isinstance(result, Exception) for result in results)
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port to listen on (default: 4000)")
+    parser.add_argument(
+        "--speed", choices=list(starter.NARRATION_SPEEDS), default="fast"
+    )
+    parser.add_argument(
+        "--boss", default="hydra", choices=starter.boss_kinds(), metavar="KIND"
+    )
+    parser.add_argument(
+        "--load-test",
+        type=int,
+        metavar="N",
+        help="play N simulated games (against --host/--port if --port is given, "
+        "otherwise an in-process server) and report turn latency; an "
+        "in-process server also reports its game code and narration time",
+    )
+    parser.add_argument(
+        "--journal", metavar="PATH", help="append a record of every battle to PATH"
+    )
+    parser.add_argument(
+        "--think",
+        type=float,
+        default=0.0,
+        help="mean seconds simulated players wait before answering",
+    )
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        target = (args.host, args.port) if args.port else (None, None)
+        report = asyncio.run(load_test(args.load_test, *target, args.think, args.boss))
+        print(report.format())
+        return 1 if report.errors else 0
+
+    async def run_server(journal):
+        port = args.port or 4000
+        server = await serve(args.host, port, args.speed, args.boss, journal)
+        print(f"Listening on {args.host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    with contextlib.ExitStack() as stack:
+        journal = None
+        if args.journal:
+            journal = stack.enter_context(JournalWriter(args.journal))
+        try:
+            asyncio.run(run_server(journal))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
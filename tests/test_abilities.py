@@ -0,0 +1,92 @@
+"""Every class's ability table resolves and casts with the right targets."""
+
+import pytest
+
+from evil_wizard import engine
+
+ABILITIES = [
+    (role, key)
+    for role in engine.class_names()
+    for key in engine.character_class(role).abilities
+]
+
+
+def _spy(ability, calls):
+    """A copy of `ability` whose handler records the arguments it gets."""
+    return engine.Ability(
+        ability.key,
+        ability.name,
+        ability.cost,
+        lambda *args: calls.append(args),
+        ability.targeted,
+        ability.area,
+        ability.value,
+    )
+
+
+def test_every_class_has_three_abilities():
+    for role in engine.class_names():
+        table = engine.character_class(role).abilities
+        assert table is engine.ABILITY_TABLES[role]
+        assert sorted(table) == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("role, key", ABILITIES)
+def test_table_entries_resolve(role, key):
+    ability = engine.ABILITY_TABLES[role][key]
+    assert ability.key == key
+    assert getattr(engine.Player, ability.handler.__name__) is ability.handler
+    argcount = ability.handler.__code__.co_argcount
+    assert argcount == (2 if ability.targeted else 1)
+    assert not ability.area or ability.targeted  # Area handlers take a list
+    # Only abilities that hit an enemy are weighed against a basic attack
+    assert (ability.value is not None) == ability.targeted
+    if ability.value:
+        player = engine.create_player(role)
+        worth = ability.value(player, engine.create_boss(kind="hydra"))
+        assert isinstance(worth, (int, float)) and worth >= 0
+
+
+@pytest.mark.parametrize("role, key", ABILITIES)
+def test_cast_dispatches_with_the_handler_arity(role, key):
+    player = engine.create_player(role)
+    ability = engine.ABILITY_TABLES[role][key]
+    with engine.headless():
+        fight = engine.Encounter("lich-court")
+    target = fight.roster.members[2]
+    calls = []
+    spy = _spy(ability, calls)
+    spy.cast(player, target)
+    spy.cast(player, target, fight.roster)
+    if ability.area:
+        assert calls == [(player, [target]), (player, fight.roster.living())]
+    elif ability.targeted:
+        assert calls == [(player, target)] * 2
+    else:
+        assert calls == [(player,)] * 2
+
+
+@pytest.mark.parametrize("role, key", ABILITIES)
+def test_cast_spends_mana_and_acts(role, key):
+    player = engine.create_player(role, rng=engine.BattleRandom(7))
+    boss = engine.create_boss(kind="hydra")
+    ability = player.abilities[key]
+    mana = player.mana
+    events = []
+    engine.add_listener(player, lambda *event: events.append(event[1:4]))
+    with engine.headless():
+        assert engine.cast_ability(player, key, boss)
+    # Reported once the cost is paid; some abilities then restore mana
+    action = (engine.EVENT_ACTION, engine.action_id("3", key), mana - ability.cost)
+    assert events[0] == action
+
+
+def test_cast_refuses_unknown_keys_and_missing_mana():
+    player = engine.create_player("Mage")
+    boss = engine.create_boss(kind="hydra")
+    player.mana = player.abilities["1"].cost - 1
+    with engine.headless():
+        assert not engine.cast_ability(player, "9", boss)
+        assert not engine.cast_ability(player, "1", boss)
+    assert player.mana == player.abilities["1"].cost - 1
+    assert boss.hp == boss.max_hp
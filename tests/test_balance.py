@@ -0,0 +1,42 @@
+"""The auto-balancer's search improves the error and reuses cached scores."""
+
+import balance
+
+
+def test_search_lowers_the_error_from_the_cache():
+    balancer = balance.Balancer({"Mage": 0.9}, tolerance=0.02, battles=8, seed=1)
+    params = balance.parameters(["Mage"], "hydra", ["class"])
+    (start,) = balancer.evaluate([{}])
+    errors = [balancer.error(start)]
+    values, rates, error, rounds = balance.compass_search(
+        balancer,
+        params,
+        max_rounds=3,
+        progress=lambda rounds, error: errors.append(error),
+    )
+    assert errors[0] > 0
+    assert rounds == len(errors) - 1 >= 1
+    assert all(later <= earlier for earlier, later in zip(errors, errors[1:]))
+    assert error == errors[-1] < errors[0]
+    assert balancer.lookups - balancer.simulated > 0  # Cache hits
+    assert values != {param.name: param.start for param in params}
+
+
+def test_search_is_seeded():
+    def search():
+        balancer = balance.Balancer({"Warrior": 0.8}, battles=6, seed=2)
+        params = balance.parameters(["Warrior"], "hydra", ["class"])
+        return balance.compass_search(balancer, params, max_rounds=2)
+
+    assert search() == search()
+
+
+def test_progress_is_a_line_per_round_off_a_terminal(capsys):
+    argv = ["--roles", "Archer", "--battles", "4", "--max-rounds", "2"]
+    assert balance.main(argv + ["--workers", "1", "--target", "0.9"]) == 0
+    err = capsys.readouterr().err
+    assert "\r" not in err and "\033" not in err
+    assert err.splitlines() == [
+        f"round {n}: error {line.split('error ')[1]}"
+        for n, line in enumerate(err.splitlines(), start=1)
+    ]
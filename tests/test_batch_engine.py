@@ -0,0 +1,38 @@
+"""The NumPy batch engine agrees with the scalar engine."""
+
+import pytest
+
+import starter
+
+pytest.importorskip("numpy")
+
+import batch_engine  # noqa: E402
+
+TOLERANCE = 4.0  # Max |z|, as for batch_engine.py --check
+
+
+@pytest.mark.parametrize(
+    "role, weapon_key",
+    [
+        (role, weapon_key)
+        for role in starter.class_names()  # Every combination --check covers
+        for weapon_key in starter.WEAPON_COLLECTIONS[role]
+    ],
+)
+def test_win_rate_matches_scalar_engine(role, weapon_key):
+    scalar_rate, batch_rate, z = batch_engine.check_against_scalar(
+        role, weapon_key, battles=400, seed=0
+    )
+    assert abs(z) <= TOLERANCE, (scalar_rate, batch_rate)
+
+
+def test_models_the_attack_policy_against_the_hydra():
+    assert batch_engine.POLICY in starter.policy_names()
+    assert batch_engine.BOSS in starter.boss_kinds()
+
+
+def test_batch_is_seeded():
+    first = batch_engine.simulate_batch("Paladin", "1", 200, seed=5)
+    second = batch_engine.simulate_batch("Paladin", "1", 200, seed=5)
+    assert (first.winners == second.winners).all()
+    assert (first.turns == second.turns).all()
@@ -0,0 +1,42 @@
+"""The benchmark runner writes JSON results and flags regressions against them."""
+
+import json
+
+import benchmark
+
+FAST = ["--only", "take_damage", "--repeat", "1", "--min-time", "0.001"]
+
+
+def test_run_writes_json_and_flags_a_slower_run(tmp_path, capsys):
+    results = tmp_path / "run.json"
+    assert benchmark.main(FAST + ["--json", str(results)]) == 0
+    run = json.loads(results.read_text(encoding="utf-8"))
+    assert list(run["results"]) == ["take_damage"]
+    result = run["results"]["take_damage"]
+    assert result["unit"] == "calls/s" and result["higher_is_better"]
+    assert result["value"] > 0
+    assert "take_damage" in capsys.readouterr().out
+
+    result["value"] *= 10  # A baseline this run cannot keep up with
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(run), encoding="utf-8")
+    assert benchmark.main(FAST + ["--compare", str(baseline)]) == 1
+    assert "SLOWER" in capsys.readouterr().out
+
+    result["value"] /= 1000  # And one it easily beats
+    baseline.write_text(json.dumps(run), encoding="utf-8")
+    assert benchmark.main(FAST + ["--compare", str(baseline)]) == 0
+    assert "SLOWER" not in capsys.readouterr().out
+
+
+def test_compare_respects_the_direction_of_better():
+    def run(value, higher_is_better):
+        result = {"value": value, "unit": "", "higher_is_better": higher_is_better}
+        return {"results": {"x": result}}
+
+    ((_, change, regressed),) = benchmark.compare(run(80, True), run(100, True))
+    assert (round(change, 3), regressed) == (-0.2, True)
+    ((_, change, regressed),) = benchmark.compare(run(125, False), run(100, False))
+    assert (round(change, 3), regressed) == (-0.2, True)
+    ((_, change, regressed),) = benchmark.compare(run(95, True), run(100, True))
+    assert not regressed  # Inside the default 10% threshold
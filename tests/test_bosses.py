@@ -0,0 +1,167 @@
+"""Boss decision tables: cooldowns, conditional moves and phases."""
+
+import pytest
+
+from evil_wizard import engine
+
+DRAWS = 300
+
+
+def _behavior(phases):
+    return engine.BossBehavior(
+        "test",
+        {"name": "Test Boss", "hp": 200, "attack": 10, "defense": 2, "phases": phases},
+    )
+
+
+def _boss(behavior, seed=0):
+    return engine.Boss(
+        behavior.name,
+        behavior.hp,
+        behavior.attack,
+        behavior.defense,
+        rng=engine.BattleRandom(seed),
+        behavior=behavior,
+    )
+
+
+def _choices(boss, target, draws=DRAWS):
+    names = [handler.__name__ for handler in boss.behavior.abilities]
+    return [names[boss.behavior.choose(boss, target)] for _ in range(draws)]
+
+
+def test_move_on_cooldown_is_never_picked():
+    behavior = _behavior(
+        [{"abilities": {"stomp": {"weight": 100, "cooldown": 2}, "bite": 1}}]
+    )
+    boss = _boss(behavior)
+    choices = _choices(boss, engine.create_player("Warrior"))
+    for turn, name in enumerate(choices):
+        if name == "_stomp":
+            assert "_stomp" not in choices[turn + 1 : turn + 3]
+    # Heavily weighted, so it comes back as soon as it is ready
+    assert choices.count("_stomp") >= DRAWS // 3 - 5
+
+
+@pytest.mark.parametrize(
+    "kind",
+    [kind for kind in engine.boss_kinds() if any(engine.boss_behavior(kind).cooldowns)],
+)
+def test_roster_cooldowns_hold(kind):
+    behavior = engine.boss_behavior(kind)
+    boss = _boss(behavior, seed=3)
+    target = engine.create_player("Paladin")
+    for phase in range(len(behavior.phases)):
+        boss.phase = phase
+        last_used = {}
+        for turn in range(DRAWS):
+            chosen = behavior.choose(boss, target)
+            if chosen in last_used:
+                assert turn - last_used[chosen] > behavior.cooldowns[chosen]
+            last_used[chosen] = turn
+
+
+@pytest.mark.parametrize(
+    "condition, ready",
+    [
+        (
+            "target_defending",
+            lambda boss, target: setattr(target, "is_defending", True),
+        ),
+        ("target_wounded", lambda boss, target: setattr(target, "hp", 1)),
+        ("self_wounded", lambda boss, target: setattr(boss, "hp", 1)),
+        (
+            "target_has:poison",
+            lambda boss, target: engine.apply_status(target, "poison", 3),
+        ),
+    ],
+)
+def test_conditional_move_needs_its_condition(condition, ready):
+    behavior = _behavior(
+        [
+            {
+                "abilities": {
+                    "crushing_blow": {"weight": 100, "when": condition},
+                    "bite": 1,
+                }
+            }
+        ]
+    )
+    boss = _boss(behavior)
+    target = engine.create_player("Warrior")
+    assert set(_choices(boss, target)) == {"_bite"}
+    with engine.headless():
+        ready(boss, target)
+    assert _choices(boss, target).count("_crushing_blow") > DRAWS * 0.9
+
+
+def test_lacks_conditions_switch_off_once_met():
+    behavior = _behavior(
+        [
+            {
+                "abilities": {
+                    "venom_spit": {"weight": 100, "when": "target_lacks:poison"},
+                    "frenzy": {"weight": 100, "when": "self_lacks:hasted"},
+                    "bite": 1,
+                }
+            }
+        ]
+    )
+    boss = _boss(behavior)
+    target = engine.create_player("Warrior")
+    assert set(_choices(boss, target)) == {"_venom_spit", "_frenzy", "_bite"}
+    with engine.headless():
+        engine.apply_status(target, "poison", 3)
+        engine.apply_status(boss, "hasted", 3, 25)
+    assert set(_choices(boss, target)) == {"_bite"}
+
+
+def test_no_available_move_falls_back_to_the_whole_table():
+    behavior = _behavior(
+        [{"abilities": {"crushing_blow": {"weight": 1, "when": "target_defending"}}}]
+    )
+    boss = _boss(behavior)
+    assert set(_choices(boss, engine.create_player("Warrior"))) == {"_crushing_blow"}
+
+
+def test_decision_table_masks_abilities():
+    behavior = _behavior([{"abilities": {"stomp": 3, "bite": 2, "slash": 5}}])
+    phase = behavior.phases[0]
+    assert phase.all_available == 0b111
+    assert phase.table == ((0, 1, 2), (3, 5, 10))
+    assert phase.decision_table(0b101) == ((0, 2), (3, 8))
+    assert phase.decision_table(0b101) is phase.decision_table(0b101)  # Cached
+
+
+def test_phase_thresholds_switch_tables():
+    behavior = _behavior(
+        [
+            {"abilities": {"bite": 1}},
+            {"below": 0.6, "attack_bonus": 3, "message": "{name} rages!"},
+            {"below": 0.3, "defense_bonus": 2, "abilities": {"stomp": 1}},
+        ]
+    )
+    assert [phase.weights for phase in behavior.phases] == [(1, 0), (1, 0), (0, 1)]
+    boss = _boss(behavior)
+    target = engine.create_player("Paladin")
+    target.hp = target.max_hp = 10_000  # Survives whatever the boss does
+    phases = []
+    engine.add_listener(
+        boss,
+        lambda character, event, code, value, critical: event == engine.EVENT_PHASE
+        and phases.append(code),
+    )
+    attack, defense = boss.attack, boss.defense
+    with engine.headless():
+        boss.hp = 121  # Not below 60%
+        boss.choose_action(target)
+        assert boss.phase == 0
+        boss.hp = 119
+        boss.choose_action(target)
+        assert (boss.phase, boss.attack) == (1, attack + 3)
+        assert set(_choices(boss, target)) == {"_bite"}
+        boss.hp = 10  # Straight past the last threshold
+        boss.choose_action(target)
+    assert phases == [1, 2]
+    assert (boss.phase, boss.attack, boss.defense) == (2, attack + 3, defense + 2)
+    assert set(_choices(boss, target)) == {"_stomp"}
@@ -0,0 +1,80 @@
+"""The expectimax player keeps to its time budget and copes with variants,
+minions and aborted searches."""
+
+import time
+
+import bot
+import starter
+
+BUDGET = 0.006  # Seconds of search per move, the bot's default
+LATENCY_LIMIT = 0.010  # What a move may take, overheads included
+
+
+def test_expectimax_plays_balance_variants():
+    # What balance.py's workers build: copies of registered definitions
+    character_class = starter.character_class("Mage").variant("Mage", hp=100)
+    base = starter.WEAPON_COLLECTIONS["Mage"]["1"]
+    weapon = starter.Weapon(
+        base.name, base.attack_bonus + 2, base.defense_bonus, base.crit_chance
+    )
+    behavior = starter.boss_behavior("rat_king").variant(hp=60)
+    policy = bot.ExpectimaxPolicy(depth=2, budget=None)
+    result = starter.simulate_battle(
+        character_class, weapon, policy, seed=1, boss=behavior
+    )
+    assert result.winner in ("player", "boss")
+    assert (character_class, weapon, behavior) in policy._models
+
+
+def test_expectimax_plays_encounters():
+    for encounter in starter.encounter_kinds():
+        result = starter.simulate_encounter(
+            "Warrior", "1", encounter, policy=bot.ExpectimaxPolicy(budget=None), seed=3
+        )
+        assert result.winner in ("player", "enemies")
+
+
+def test_enumeration_recovers_from_an_aborted_run():
+    model = bot.SearchModel("Warrior", "1", "hydra")
+    key = model.initial_state()
+
+    def aborted():
+        model.rng.randint(1, 6)
+        raise ValueError
+
+    try:
+        model.enumerate(key, aborted)
+    except ValueError:
+        pass
+    outcomes = model.enumerate(key, lambda: model.rng.chance(0.25))
+    assert outcomes == {True: 0.25, False: 0.75}
+
+
+class _Timed:
+    def __init__(self, policy):
+        self.policy = policy
+        self.times = []
+
+    def __call__(self, player, boss):
+        began = time.perf_counter()
+        move = self.policy(player, boss)
+        self.times.append(time.perf_counter() - began)
+        return move
+
+
+def test_moves_stay_within_budget():
+    timed = _Timed(bot.ExpectimaxPolicy(budget=BUDGET))
+    for role in ("Warrior", "Mage", "Necromancer"):
+        for seed in range(2):
+            starter.simulate_battle(role, "1", timed, seed)
+    times = sorted(timed.times)
+    assert times[int(len(times) * 0.99)] < LATENCY_LIMIT
+
+
+def test_out_of_time_falls_back():
+    # A deadline that has passed before the first path is played out
+    policy = bot.ExpectimaxPolicy(budget=0.0, fallback="greedy")
+    player = starter.create_player("Warrior", weapon_key="1")
+    boss = starter.create_boss(kind="hydra")
+    starter.reset_player_state(player)
+    assert policy(player, boss) == starter.get_policy("greedy")(player, boss)
@@ -0,0 +1,124 @@
+"""The weapon catalog's indexes, validation, menus and loading."""
+
+import json
+import random
+
+import pytest
+
+from evil_wizard import catalog, cli, content
+
+ROLES = ["Warrior", "Mage", "Rogue"]
+
+
+@pytest.fixture(scope="module")
+def big():
+    return catalog.catalog_from_data(catalog.generate_catalog_data(ROLES, 60, seed=4))
+
+
+def test_with_effect_partitions_the_catalog(big):
+    seen = []
+    for effect in [None, *catalog.WEAPON_EFFECTS]:
+        entries = big.with_effect(effect)
+        assert all(entry.weapon.effect == effect for entry in entries)
+        seen.extend(entries)
+    assert sorted(map(id, seen)) == sorted(map(id, big))
+    assert big.with_effect("no such effect") == ()
+
+
+@pytest.mark.parametrize("stat", catalog.WEAPON_STATS)
+def test_in_range_matches_a_scan(big, stat):
+    rng = random.Random(stat)
+    values = sorted({getattr(entry.weapon, stat) for entry in big})
+    bounds = [None, *values, values[0] - 1, values[-1] + 1]
+    for _ in range(200):
+        low, high = rng.choice(bounds), rng.choice(bounds)
+        found = big.in_range(stat, low, high)
+        expected = [
+            entry
+            for entry in big
+            if (low is None or low <= getattr(entry.weapon, stat))
+            and (high is None or getattr(entry.weapon, stat) <= high)
+        ]
+        assert sorted(map(id, found)) == sorted(map(id, expected))
+        found_values = [getattr(entry.weapon, stat) for entry in found]
+        assert found_values == sorted(found_values)
+
+
+def test_in_range_bounds_are_inclusive(big):
+    value = big.in_range("attack_bonus")[0].weapon.attack_bonus
+    assert big.in_range("attack_bonus", value, value)
+    assert not big.in_range("attack_bonus", value + 0.5, value + 0.5)
+
+
+def test_collections_are_read_only(big):
+    with pytest.raises(TypeError):
+        big.for_role("Warrior")["99"] = None
+    assert list(big.for_role("Mage")) == [str(n) for n in range(1, 61)]
+
+
+VALID = {"name": "Stick", "attack_bonus": 1, "defense_bonus": 0, "crit_chance": 0.0}
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ([], "maps each role"),
+        ({"Warrior": ["Stick"]}, "maps each role"),
+        ({"Warrior": {"1": "Stick"}}, "Warrior weapon 1: expected an object"),
+        (
+            {"Warrior": {"1": {"name": "Stick", "attack_bonus": 1}}},
+            "Warrior weapon 1: missing defense_bonus, crit_chance",
+        ),
+        (
+            {"Mage": {"2": dict(VALID, attack_bonus="5")}},
+            "Mage weapon 2: bad attack_bonus '5'",
+        ),
+        ({"Mage": {"1": dict(VALID, crit_chance=True)}}, "bad crit_chance True"),
+        (
+            {"Rogue": {"1": dict(VALID, effect="sparkly")}},
+            "Rogue weapon 1: unknown effect 'sparkly'",
+        ),
+    ],
+)
+def test_malformed_catalogs_are_rejected(tmp_path, data, message):
+    path = tmp_path / "weapons.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match=message):
+        catalog.load_weapon_catalog(path)
+
+
+def test_invalid_json_is_rejected(tmp_path):
+    path = tmp_path / "weapons.json"
+    path.write_text('{"Warrior": {"1": ')
+    with pytest.raises(ValueError):
+        catalog.load_weapon_catalog(path)
+
+
+def test_weapon_menu_is_rendered_once_per_catalog(big):
+    cli.weapon_menu.cache_clear()
+    first = cli.weapon_menu(big, "Warrior")
+    assert cli.weapon_menu(big, "Warrior") is first
+    assert cli.weapon_menu.cache_info().hits == 1
+    other = catalog.catalog_from_data(catalog.generate_catalog_data(ROLES, 2, seed=4))
+    assert cli.weapon_menu(other, "Warrior") != first
+    assert cli.weapon_menu.cache_info().misses == 2
+    assert sum("Warrior Weapon" in row for row in first) == 60
+
+
+def test_catalog_comes_from_the_environment(tmp_path, monkeypatch):
+    path = tmp_path / "weapons.json"
+    path.write_text(json.dumps(catalog.generate_catalog_data(ROLES, 3, seed=9)))
+    monkeypatch.setenv("EVIL_WIZARD_WEAPONS", str(path))
+    monkeypatch.setattr(content, "_weapon_catalog", None)
+    loaded = content.weapon_catalog()
+    assert loaded.roles() == ROLES
+    assert content.weapon_catalog() is loaded  # Loaded once
+    assert content.WEAPON_COLLECTIONS["Rogue"]["3"].name == "Rogue Weapon 3"
+
+
+def test_default_catalog_covers_every_class(monkeypatch):
+    monkeypatch.delenv("EVIL_WIZARD_WEAPONS", raising=False)
+    monkeypatch.setattr(content, "_weapon_catalog", None)
+    loaded = content.weapon_catalog()
+    for role, definition in content.CLASS_DEFINITIONS.items():
+        assert loaded.for_role(definition.get("weapons", role))
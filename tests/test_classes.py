@@ -0,0 +1,108 @@
+"""Class definitions are validated into the registry, and variants override stats."""
+
+import pytest
+
+from evil_wizard import content, engine
+
+BASE = {"hp": 100, "attack": 10, "defense": 5, "mana": 50}
+
+
+def test_shipped_classes_are_all_registered():
+    assert engine.class_names() == list(content.CLASS_DEFINITIONS)
+
+
+def test_definition_defaults():
+    built = engine.CharacterClass.from_definition("Warrior", dict(BASE))
+    assert (built.hp, built.attack, built.defense, built.mana) == (100, 10, 5, 50)
+    assert built.speed == engine.DEFAULT_SPEED
+    assert built.color == "WHITE"
+    assert built.description == ""
+    assert built.abilities is engine.ABILITY_TABLES["Warrior"]
+    assert built.weapon_pool == "Warrior"
+
+
+def test_definition_borrows_abilities_and_weapons():
+    definition = dict(BASE, abilities="Mage", weapons="Rogue", color="PURPLE")
+    built = engine.CharacterClass.from_definition("Battlemage", definition)
+    assert built.abilities is engine.ABILITY_TABLES["Mage"]
+    assert built.weapon_pool == "Rogue"
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"hp": None}, "bad hp None"),
+        ({"hp": 0}, "bad hp 0"),
+        ({"attack": 2.5}, "bad attack 2.5"),
+        ({"mana": "50"}, "bad mana '50'"),
+        ({"defense": -1}, "bad defense -1"),
+        ({"hp": True}, "bad hp True"),
+        ({"speed": 0}, "bad speed 0"),
+        ({"speed": 100.0}, "bad speed 100.0"),
+        ({"color": "PLAID"}, "unknown color 'PLAID'"),
+        ({"color": "__class__"}, "unknown color '__class__'"),
+    ],
+)
+def test_invalid_fields_are_rejected(change, message):
+    with pytest.raises(ValueError, match=f"class Test: {message}"):
+        engine.CharacterClass.from_definition("Test", dict(BASE, **change))
+
+
+@pytest.mark.parametrize("field", engine.CLASS_STAT_FIELDS)
+def test_missing_stats_are_rejected(field):
+    definition = dict(BASE)
+    del definition[field]
+    with pytest.raises(ValueError, match=f"bad {field} None"):
+        engine.CharacterClass.from_definition("Warrior", definition)
+
+
+def test_unknown_ability_table_is_rejected():
+    with pytest.raises(ValueError, match="no ability table 'Bard'"):
+        engine.CharacterClass.from_definition("Bard", dict(BASE))
+
+
+def test_registry_rejects_a_class_without_weapons(monkeypatch):
+    definitions = dict(content.CLASS_DEFINITIONS)
+    definitions["Bard"] = dict(BASE, abilities="Monk")
+    monkeypatch.setattr(content, "CLASS_DEFINITIONS", definitions)
+    monkeypatch.setattr(engine, "_class_registry", None)
+    with pytest.raises(ValueError, match="class Bard: no weapons for 'Bard'"):
+        engine.class_registry()
+
+
+def test_variant_overrides_only_the_given_stats():
+    warrior = engine.character_class("Warrior")
+    variant = warrior.variant("Warrior+20", hp=warrior.hp + 20, speed=125)
+    assert variant.name == "Warrior+20"
+    assert (variant.hp, variant.speed) == (warrior.hp + 20, 125)
+    assert (variant.attack, variant.defense, variant.mana) == (
+        warrior.attack,
+        warrior.defense,
+        warrior.mana,
+    )
+    assert variant.abilities is warrior.abilities
+    assert (variant.color, variant.weapon_pool) == (warrior.color, warrior.weapon_pool)
+    assert warrior.speed == engine.DEFAULT_SPEED  # The original is untouched
+
+
+def test_variant_rejects_unknown_stats():
+    with pytest.raises(TypeError, match="unknown class stats: color, luck"):
+        engine.character_class("Mage").variant("Odd", luck=3, color="RED")
+
+
+def test_variant_plays_with_its_stats(monkeypatch):
+    monkeypatch.setattr(engine, "_class_registry", dict(engine.class_registry()))
+    variant = engine.character_class("Rogue").variant(
+        "Glass Rogue", hp=40, attack=30, defense=0, mana=10
+    )
+    assert engine.register_class(variant) is variant
+    assert engine.class_names()[-1] == "Glass Rogue"
+    player = engine.create_player("Glass Rogue", weapon_key="1")
+    assert (player.hp, player.max_hp, player.mana, player.base_defense) == (
+        40,
+        40,
+        10,
+        0,
+    )
+    assert player.attack == 30 + player.weapon.attack_bonus
+    assert player.weapon in content.WEAPON_COLLECTIONS["Rogue"].values()
@@ -0,0 +1,40 @@
+"""The command line: usage errors for missing tools, and autopilot narration."""
+
+import sys
+
+import pytest
+
+from evil_wizard import cli, engine
+
+
+@pytest.mark.parametrize(
+    "module, argv",
+    [
+        ("journal", ["--journal", "battle.ewj"]),
+        ("instrument", ["--instrument", "stats.json"]),
+        ("bot", ["--autopilot", "expectimax"]),
+    ],
+)
+def test_missing_tool_is_a_usage_error(monkeypatch, capsys, module, argv):
+    monkeypatch.setitem(sys.modules, module, None)  # Blocks the import
+    # Registered for good once bot.py has been imported by another test
+    monkeypatch.delitem(engine.POLICIES, "expectimax", raising=False)
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(argv + ["--script", "-", "--quiet"])
+    assert exit_info.value.code == 2
+    assert f"{module}.py is not importable" in capsys.readouterr().err
+
+
+def test_autopilot_names_its_actions(tmp_path, capsys):
+    script = tmp_path / "answers.txt"
+    script.write_text("1\nHero\n1\nn\n")
+    cli.main(["--autopilot", "greedy", "--script", str(script), "--seed", "1"])
+    choices = {
+        line.split("Autopilot chooses ", 1)[1].rstrip(".")
+        for line in capsys.readouterr().out.splitlines()
+        if "Autopilot chooses" in line
+    }
+    names = set(cli.ACTION_NAMES.values())
+    names.update(ability.name for ability in engine.ABILITY_TABLES["Warrior"].values())
+    assert choices and choices <= names
+    assert "Basic Attack" in choices and "Use Ability" not in choices
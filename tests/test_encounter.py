@@ -0,0 +1,102 @@
+"""Encounters: the roster of living enemies, area abilities and whole fights."""
+
+import pytest
+
+from evil_wizard import engine
+
+
+def _kill(enemy):
+    enemy.take_damage(enemy.hp + enemy.defense * 2 + 100)
+    assert not enemy.is_alive()
+
+
+def test_roster_drops_the_dead_in_any_order():
+    with engine.headless():
+        fight = engine.Encounter("lich-court")  # The Lich King and 3 skeletons
+        roster = fight.roster
+        members = roster.members
+        assert roster.alive == [0, 1, 2, 3]
+        _kill(members[2])
+        assert roster.alive == [0, 1, 3]
+        _kill(members[0])
+        assert roster.alive == [1, 3]
+        assert roster.living() == [members[1], members[3]]
+        fight.add_minion("skeleton")
+        assert roster.alive == [1, 3, 4]
+        members[3].take_damage(1)  # Hurt but alive: still counted
+        assert len(roster) == 3
+        for index in (4, 1, 3):
+            _kill(members[index])
+        assert roster.defeated()
+
+
+def test_roster_skips_members_that_join_dead():
+    rat = engine.Boss("Rat", 8, 4, 0, behavior=engine.minion_behavior("rat"))
+    rat.hp = 0
+    boss = engine.create_boss(kind="rat_king")
+    roster = engine.Roster([boss, rat])
+    assert roster.alive == [0]
+
+
+def test_roster_keeps_other_listeners():
+    events = []
+    boss = engine.create_boss(kind="hydra")
+    engine.add_listener(boss, lambda *event: events.append(event[1]))
+    roster = engine.Roster([boss])
+    with engine.headless():
+        _kill(boss)
+    assert events == [engine.EVENT_DAMAGE]
+    assert roster.defeated()
+    engine.remove_listener(boss, roster)
+    assert not isinstance(boss.listener, engine.Listeners)
+
+
+@pytest.mark.parametrize(
+    "role, key, effect",
+    [("Mage", "1", None), ("Barbarian", "2", "intimidated")],
+)
+def test_area_abilities_hit_every_living_enemy(role, key, effect):
+    player = engine.create_player(role, rng=engine.BattleRandom(3))
+    with engine.headless():
+        fight = engine.Encounter("lich-court", engine.BattleRandom(3))
+        members = fight.roster.members
+        _kill(members[1])
+        before = [enemy.hp for enemy in members]
+        assert engine.cast_ability(player, key, members[0], fight.roster)
+    for index, enemy in enumerate(members):
+        if index == 1:  # The dead are left alone
+            assert enemy.hp == 0 and not enemy.status_effects
+        elif effect is None:
+            assert enemy.hp < before[index]
+        else:
+            assert effect in enemy.status_effects
+
+
+def test_area_ability_without_roster_hits_the_target():
+    player = engine.create_player("Mage", rng=engine.BattleRandom(1))
+    boss = engine.create_boss(kind="hydra")
+    with engine.headless():
+        assert engine.cast_ability(player, "1", boss)
+    assert boss.hp < boss.max_hp
+
+
+@pytest.mark.parametrize("encounter", engine.encounter_kinds())
+@pytest.mark.parametrize("targeting", list(engine.TARGETING))
+def test_simulate_encounter(encounter, targeting):
+    results = [
+        engine.simulate_encounter(
+            "Paladin", "1", encounter, seed=seed, targeting=targeting
+        )
+        for seed in range(3)
+    ]
+    again = engine.simulate_encounter(
+        "Paladin", "1", encounter, seed=0, targeting=targeting
+    )
+    assert again.as_dict() == results[0].as_dict()
+    starting = 1 + len(engine.Encounter(encounter).roster.members[1:])
+    for result in results:
+        assert result.winner in ("player", "enemies", None)
+        assert starting <= result.enemies
+        assert 0 <= result.kills <= result.enemies
+        assert (result.winner == "player") == (result.kills == result.enemies)
+        assert result.damage_taken > 0
@@ -0,0 +1,19 @@
+"""Instrumentation times games whichever front end drives them."""
+
+import instrument
+import starter
+from evil_wizard import script
+
+ANSWERS = ["3", "Bob", "2", "3"] + ["1"] * 200
+
+
+def test_scripted_games_are_timed(capsys):
+    starter.set_narration_speed("instant")
+    with instrument.Instrumentation() as instrumentation:
+        script.run_games(ANSWERS, games=2, seed=1)
+    capsys.readouterr()
+    game = instrumentation.phases["game"]
+    assert game.calls == 2
+    assert game.wall > 0
+    assert instrumentation.phases["player_turn"].calls > 0
+    assert instrumentation.breakdown()["logic"] > 0
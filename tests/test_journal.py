@@ -0,0 +1,153 @@
+"""Journals record battles and read them back faithfully."""
+
+import io
+
+import pytest
+
+import journal
+import starter
+
+
+def _record(path, combos, seeds=3):
+    results = []
+    with journal.JournalWriter(str(path)) as writer:
+        for role, weapon, boss in combos:
+            for seed in range(seeds):
+                results.append(
+                    starter.simulate_battle(
+                        role, weapon, "greedy", seed, boss=boss, journal=writer
+                    )
+                )
+    return results
+
+
+def _replay_text(battle):
+    stream = io.StringIO()
+    screen = starter.Screen(stream, color=False)
+    with starter.output_to(screen, starter.Narrator("instant", skip_key=None)):
+        journal.replay(battle)
+    return stream.getvalue()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "battles.ewj"
+    combos = [("Rogue", "2", "hydra"), ("Mage", "1", "elder-lich")]
+    results = _record(path, combos)
+    battles = journal.read_journal(path)
+    assert len(battles) == len(results)
+    for battle, result in zip(battles, results):
+        assert battle.role == result.role
+        assert battle.boss == result.boss
+        assert battle.winner == result.winner
+        assert battle.turns == result.turns
+        assert battle.finished
+        boss_hp = [r.hp for r in battle.records if r.side == journal.BOSS][-1]
+        assert (boss_hp == 0) == (result.winner == "player")
+    weapon = starter.WEAPON_COLLECTIONS["Rogue"]["2"].name
+    assert battles[0].weapon == weapon
+
+
+def test_replay_reaches_recorded_outcome(tmp_path):
+    path = tmp_path / "battles.ewj"
+    (result,) = _record(path, [("Archer", "1", "hydra")], seeds=1)
+    (battle,) = journal.read_journal(path)
+    outcome = {"player": "Victory", "boss": "Defeat"}[result.winner]
+    assert f"{outcome} after {result.turns} turns" in _replay_text(battle)
+
+
+def test_sessions_append(tmp_path):
+    path = tmp_path / "battles.ewj"
+    _record(path, [("Warrior", "1", "hydra")], seeds=2)
+    _record(path, [("Druid", "2", "lich")], seeds=2)
+    battles = journal.read_journal(path)
+    assert [battle.role for battle in battles] == ["Warrior"] * 2 + ["Druid"] * 2
+    assert [battle.boss for battle in battles] == ["hydra"] * 2 + ["lich"] * 2
+
+
+def test_variants_are_recorded_by_name(tmp_path):
+    # Classes and weapons balance.py builds are in no registry or catalog
+    path = tmp_path / "battles.ewj"
+    role = starter.character_class("Warrior").variant("Warrior+20", hp=140)
+    weapon = starter.Weapon("Test Blade", 9, 1, 0.1, None)
+    behavior = starter.boss_behavior("hydra").variant(hp=200)
+    with journal.JournalWriter(str(path)) as writer:
+        result = starter.simulate_battle(
+            role, weapon, "greedy", 1, boss=behavior, journal=writer
+        )
+    (battle,) = journal.read_journal(path)
+    assert (battle.role, battle.weapon, battle.abilities) == (
+        "Warrior+20",
+        "Test Blade",
+        "Warrior",
+    )
+    assert (battle.player_max_hp, battle.boss_max_hp) == (140, 200)
+    assert f"after {result.turns} turns" in _replay_text(battle)
+
+
+@pytest.mark.parametrize("encounter", starter.encounter_kinds())
+def test_encounters_are_recorded(tmp_path, encounter):
+    path = tmp_path / "encounters.ewj"
+    with journal.JournalWriter(str(path)) as writer:
+        result = starter.simulate_encounter(
+            "Mage", "1", encounter, seed=2, journal=writer
+        )
+    (battle,) = journal.read_journal(path)
+    assert battle.winner == {"enemies": "boss"}.get(result.winner, result.winner)
+    assert battle.turns == result.turns
+    assert len(battle.minions) == result.enemies - 1
+    final_hp = {}
+    for record in battle.records:
+        if record.side == journal.BOSS:
+            final_hp[record.enemy] = record.hp
+    assert sorted(final_hp) == list(range(result.enemies))
+    assert list(final_hp.values()).count(0) == result.kills
+    assert f"after {result.turns} turns" in _replay_text(battle)
+
+
+def test_game_journals_encounters(tmp_path):
+    path = tmp_path / "game.ewj"
+    script = tmp_path / "answers.txt"
+    script.write_text("1\nHero\n1\nn\n")
+    argv = ["--encounter", "hydra-brood", "--journal", str(path)]
+    argv += ["--autopilot", "greedy", "--script", str(script), "--quiet"]
+    starter.main(argv + ["--seed", "1", "--summary", str(tmp_path / "summary.json")])
+    (battle,) = journal.read_journal(path)
+    assert battle.finished
+    assert battle.minions[:2] == [("hydra_head", 20)] * 2
+
+
+def test_battles_fit_the_size_budget(tmp_path):
+    # 1 KB per battle on average; long fights may go over it
+    path = tmp_path / "battles.ewj"
+    combos = [
+        (role, weapon, "hydra")
+        for role in starter.class_names()
+        for weapon in starter.WEAPON_COLLECTIONS[role]
+    ]
+    _record(path, combos, seeds=2)
+    battles = journal.read_journal(path)
+    sizes = [battle.size for battle in battles]
+    turns = sum(battle.turns for battle in battles)
+    assert sum(sizes) / len(sizes) < 1024
+    assert sum(sizes) / turns < 25
+    assert sum(sizes) < path.stat().st_size  # Sizes leave out names and headers
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    path = tmp_path / "battles.ewj"
+    _record(path, [("Paladin", "1", "hydra")], seeds=2)
+    whole = journal.read_journal(path)[1]
+    path.write_bytes(path.read_bytes()[:-1])  # Recording stopped mid-write
+    first, second = journal.read_journal(path)
+    assert first.finished
+    assert not second.finished
+    assert len(second.records) == len(whole.records) - 1
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "old.ewj"
+    path.write_bytes(b"EWJ1" + bytes(16))
+    with pytest.raises(ValueError):
+        journal.read_journal(path)
+    with pytest.raises(ValueError):
+        journal.JournalWriter(str(path))
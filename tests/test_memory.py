@@ -0,0 +1,12 @@
+"""Combatants stay small: simulations keep thousands of them alive."""
+
+import simulation
+
+# Bytes per live combatant (see measure_combatant_memory()). Raise it
+# deliberately, with the new figure in the commit, when a change needs to.
+COMBATANT_BYTES_BUDGET = 450
+
+
+def test_combatant_memory_within_budget():
+    used = simulation.measure_combatant_memory()
+    assert used <= COMBATANT_BYTES_BUDGET, f"{used:.0f} bytes per combatant"
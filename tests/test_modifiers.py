@@ -0,0 +1,104 @@
+"""The stat modifier stack: stacking, same-source refresh and expiry."""
+
+from evil_wizard import content, engine
+
+
+def _stats(character):
+    return character.attack, character.defense, character.speed
+
+
+def _warrior():
+    player = engine.create_player("Warrior", weapon_key="1")
+    return player, _stats(player)
+
+
+def test_sources_stack():
+    player, (attack, defense, speed) = _warrior()
+    player.add_modifier("rage", "attack", 5)
+    player.add_modifier("blessing", "attack", 3)
+    player.add_modifier("blessing", "defense", 2)
+    player.add_modifier("hasted", "speed", 25)
+    assert _stats(player) == (attack + 8, defense + 2, speed + 25)
+    player.remove_modifiers("blessing")  # Both of its stats
+    assert _stats(player) == (attack + 5, defense, speed + 25)
+
+
+def test_same_source_replaces_instead_of_stacking():
+    player, (attack, defense, speed) = _warrior()
+    player.add_modifier("rage", "attack", 5, turns=1)
+    player.add_modifier("rage", "attack", 7, turns=3)
+    assert player.attack == attack + 7
+    assert player.modifiers == (("rage", "attack", 7, 3),)
+    assert player.timed_modifiers == 1
+
+
+def test_refresh_restarts_the_duration():
+    player, base = _warrior()
+    player.add_modifier("shield", "defense", 4, turns=2)
+    player.tick_modifiers()
+    player.add_modifier("shield", "defense", 4, turns=2)  # Cast again
+    player.tick_modifiers()
+    assert _stats(player) != base
+    player.tick_modifiers()
+    assert _stats(player) == base
+
+
+def test_expiry_restores_base_stats():
+    player, base = _warrior()
+    player.add_modifier("frenzy", "attack", 6, turns=3)
+    player.add_modifier("armor", "defense", 5, turns=1)
+    player.add_modifier("curse", "attack", -2)  # Until removed
+    seen = []
+    for _ in range(3):
+        seen.append(_stats(player))
+        player.tick_modifiers()
+    attack, defense, speed = base
+    assert seen == [
+        (attack + 4, defense + 5, speed),
+        (attack + 4, defense, speed),
+        (attack + 4, defense, speed),
+    ]
+    assert _stats(player) == (attack - 2, defense, speed)
+    assert player.timed_modifiers == 0
+    player.remove_modifiers("curse")
+    assert _stats(player) == base
+
+
+def test_turn_start_ticks_timed_modifiers():
+    player, base = _warrior()
+    player.add_modifier("rage", "attack", 5, turns=1)
+    with engine.headless():
+        assert not engine.process_status_effects(player)
+    assert _stats(player) == base
+
+
+def test_clamped_stats_come_back_from_the_base():
+    player, base = _warrior()
+    player.add_modifier("hex", "attack", -1000)
+    player.add_modifier("sunder", "defense", -1000)
+    player.add_modifier("slowed", "speed", -1000)
+    assert _stats(player) == (1, 0, engine.MIN_SPEED)
+    for source in ("hex", "sunder", "slowed"):
+        player.remove_modifiers(source)
+    assert _stats(player) == base
+
+
+def test_weapon_bonuses_stay_under_modifiers():
+    player = engine.create_player("Warrior")
+    unarmed = player.attack
+    player.add_modifier("rage", "attack", 5)
+    weapon = content.WEAPON_COLLECTIONS["Warrior"]["1"]
+    player.equip_weapon(weapon)
+    assert player.attack == unarmed + weapon.attack_bonus + 5
+
+
+def test_recast_buff_does_not_stack():
+    player = engine.create_player("Mage", rng=engine.BattleRandom(1))
+    boss = engine.create_boss(kind="hydra")
+    defense = player.defense
+    with engine.headless():
+        engine.cast_ability(player, "3", boss)  # Arcane Shield: +5 for a turn
+        engine.cast_ability(player, "3", boss)
+        assert player.defense == defense + 5
+        engine.process_status_effects(player)
+    assert player.defense == defense
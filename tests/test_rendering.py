@@ -0,0 +1,292 @@
+"""Text measurement and wrapping, the screen and the narrator."""
+
+import os
+import random
+import unicodedata
+
+import pytest
+
+from evil_wizard import rendering
+
+# --- Display width ---
+
+
+def _reference_width(text):
+    """The per-character unicodedata measurement the width table stands in for."""
+    width = 0
+    for char in rendering.strip_ansi(text):
+        if unicodedata.combining(char) or unicodedata.category(char) == "Cf":
+            continue
+        if unicodedata.east_asian_width(char) in {"F", "W"}:
+            width += 2
+        else:
+            width += 1
+    return width
+
+
+def _reference_wrap(text, width):
+    """Wrapping by re-measuring each candidate line, as before the running total."""
+    if width <= 0 or _reference_width(text) <= width:
+        return [text]
+    words = text.split()
+    if not words:
+        return [text]
+    lines = []
+    current_line = words[0]
+    for word in words[1:]:
+        candidate = f"{current_line} {word}"
+        if _reference_width(candidate) > width:
+            lines.append(current_line)
+            current_line = word
+        else:
+            current_line = candidate
+    lines.append(current_line)
+    return lines
+
+
+CORPUS = [
+    "",
+    "plain ASCII",
+    "🐉 THE HYDRA AWAKENS 🐉",
+    "⚔️  Attack  🛡️  Defend  ✨ Ability  🧪 Potion",
+    "👨‍👩‍👧 family, 🏳️‍🌈 flag, 👍🏽 thumbs",
+    "漢字とかなカナ混じり、全角ＡＢＣ１２３",
+    "ﾊﾝｶｸｶﾀｶﾅ half-width katakana",
+    "한국어 텍스트",
+    "café naïve Z͑͒a͓l͔g͕o",
+    "हिन्दी देवनागरी",
+    "zero​width‍joiner⁠word﻿",
+    "\x1b[91m🔥 Burning\x1b[0m \x1b[1;36m漢字\x1b[0m é",
+    "Ω≈ç√∫ ¡™£¢∞§¶ •ªº–≠ ½ ←↑→↓ ┌─┐│└┘",
+]
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_width_matches_unicodedata(text):
+    rendering.get_display_width.cache_clear()
+    assert rendering.get_display_width(text) == _reference_width(text)
+
+
+def test_width_matches_unicodedata_on_random_text():
+    rng = random.Random(5)
+    ranges = [
+        (0x20, 0x7E),
+        (0x300, 0x36F),  # Combining diacritics
+        (0x900, 0x97F),  # Devanagari
+        (0x1100, 0x11FF),  # Hangul jamo
+        (0x2000, 0x206F),  # Punctuation, including format characters
+        (0x2E80, 0x9FFF),  # CJK
+        (0xAC00, 0xD7A3),  # Hangul syllables
+        (0xFE00, 0xFFEF),  # Variation selectors, half- and fullwidth forms
+        (0x1F300, 0x1FAFF),  # Emoji
+        (0x20000, 0x2A6DF),  # CJK extension B
+        (0xE0000, 0xE01EF),  # Tags and variation selectors supplement
+    ]
+    for _ in range(500):
+        text = "".join(
+            chr(rng.randint(*rng.choice(ranges))) for _ in range(rng.randint(1, 30))
+        )
+        assert rendering.get_display_width(text) == _reference_width(text), text
+
+
+@pytest.mark.parametrize("width", [8, 12, 13, 20, 31])
+def test_wrap_emoji_text_at_the_limit(width):
+    text = (
+        "🐉🐉🐉 breathes 🔥🔥 on 勇者 étienne 👨‍👩‍👧 and ⚔️⚔️ 🛡️🛡️🛡️ "
+        "\x1b[91m漢字漢字\x1b[0m 🧪🧪🧪🧪"
+    )
+    lines = rendering.wrap_text(text, width)
+    assert lines == _reference_wrap(text, width)
+    assert " ".join(lines).split() == text.split()
+    for line in lines:
+        # Only a single word wider than the limit may overflow it
+        assert rendering.get_display_width(line) <= width or " " not in line
+
+
+def test_wrap_fills_lines_exactly_to_the_limit():
+    # Each 🐉 is 2 columns: "🐉🐉 🐉🐉" is exactly 9 wide, one more word is not
+    text = "🐉🐉 🐉🐉 🐉🐉 🐉🐉"
+    assert rendering.wrap_text(text, 9) == ["🐉🐉 🐉🐉", "🐉🐉 🐉🐉"]
+    assert rendering.wrap_text(text, 8) == ["🐉🐉", "🐉🐉", "🐉🐉", "🐉🐉"]
+    assert rendering.wrap_text(text, 14) == ["🐉🐉 🐉🐉 🐉🐉", "🐉🐉"]
+
+
+# --- Screen ---
+
+
+class _FakeTerminal:
+    """A stream that records each write, and says whether it is a TTY."""
+
+    def __init__(self, tty=True):
+        self.writes = []
+        self.tty = tty
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return self.tty
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    size = os.terminal_size((80, 24))
+    monkeypatch.setattr(rendering.shutil, "get_terminal_size", lambda: size)
+    return _FakeTerminal()
+
+
+FRAME = ["Turn 1", "", "Hero: 120/120 HP", "Hydra: 250/250 HP", "🐉 ---"]
+
+
+def test_frame_is_one_write(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    (write,) = terminal.writes
+    assert write.startswith("\033[H\033[2J")
+    assert write.endswith("".join(f"{line}\n" for line in FRAME))
+
+
+def test_unchanged_redraw_sends_no_lines(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    screen.present(list(FRAME))
+    assert terminal.writes[1] == f"\033[{len(FRAME) + 1};1H\033[J"
+
+
+def test_redraw_sends_only_changed_lines(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    changed = list(FRAME)
+    changed[0] = "Turn 2"
+    changed[3] = "Hydra: 231/250 HP"
+    screen.present(changed)
+    assert len(terminal.writes) == 2
+    assert terminal.writes[1] == (
+        "\033[1;1HTurn 2\033[K"
+        "\033[4;1HHydra: 231/250 HP\033[K"
+        f"\033[{len(FRAME) + 1};1H\033[J"
+    )
+
+
+def test_longer_frame_adds_its_new_lines(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    screen.present(FRAME + ["Boss enraged!"])
+    assert terminal.writes[1] == (
+        f"\033[{len(FRAME) + 1};1HBoss enraged!\033[K\033[{len(FRAME) + 2};1H\033[J"
+    )
+
+
+def test_scrolled_frame_is_repainted(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    screen.write_lines(f"narration {n}" for n in range(24 - len(FRAME)))
+    terminal.writes.clear()
+    screen.present(FRAME)
+    (write,) = terminal.writes
+    assert write.startswith("\033[H\033[2J")
+
+
+def test_clear_forces_a_repaint(terminal):
+    screen = rendering.Screen(terminal)
+    screen.present(FRAME)
+    screen.clear()
+    terminal.writes.clear()
+    screen.present(FRAME)
+    assert terminal.writes[0].startswith("\033[H\033[2J")
+
+
+def test_pipe_gets_each_frame_appended():
+    stream = _FakeTerminal(tty=False)
+    screen = rendering.Screen(stream, color=False)
+    colored = ["\x1b[91mTurn 1\x1b[0m", "Hero"]
+    screen.present(colored)
+    screen.present(colored)
+    assert stream.writes == ["\nTurn 1\nHero\n"] * 2
+
+
+# --- Narrator ---
+
+
+class _FakeClock:
+    """A clock that only moves when slept on, adding up the time slept."""
+
+    def __init__(self):
+        self.time = 100.0
+        self.slept = 0.0
+
+    def now(self):
+        return self.time
+
+    def sleep_until(self, deadline):
+        if deadline > self.time:
+            self.slept += deadline - self.time
+            self.time = deadline
+
+
+def _narrate(speed, script, skip_key=None):
+    """Runs `script(narrator)`; returns the stream's writes and the time slept."""
+    stream = _FakeTerminal(tty=False)
+    clock = _FakeClock()
+    narrator = rendering.Narrator(speed, clock=clock, skip_key=skip_key)
+    with rendering.output_to(rendering.Screen(stream), narrator):
+        script(narrator)
+    return stream.writes, clock.slept
+
+
+LINE = "The Hydra rears all of its heads at once!!" + "." * 18  # 60 characters
+
+
+@pytest.mark.parametrize(
+    "speed, expected", [("instant", 0.0), ("fast", 0.25), ("cinematic", 1.0)]
+)
+def test_narration_sleeps_the_scaled_delays(speed, expected):
+    def script(narrator):
+        narrator.say(LINE, delay=0.03)
+        narrator.pause(1.5)
+        narrator.say(LINE, delay=0.05)
+
+    writes, slept = _narrate(speed, script)
+    assert slept == pytest.approx(expected * (60 * 0.03 + 1.5 + 60 * 0.05))
+    assert "".join(writes) == f"{LINE}\n{LINE}\n"
+    if speed == "instant":
+        assert writes == [f"{LINE}\n"] * 2
+
+
+def test_narration_writes_a_frame_of_characters_at_a_time():
+    writes, _ = _narrate("fast", lambda narrator: narrator.say(LINE, delay=0.03))
+    # 0.0075 s per character: two characters per 1/60 s frame
+    assert writes[:-1] == [LINE[i : i + 2] for i in range(0, 60, 2)]
+
+
+def test_skip_flushes_the_rest_at_once():
+    polls = []
+
+    def skip_key():
+        polls.append(None)
+        return len(polls) > 10
+
+    def script(narrator):
+        narrator.say(LINE)
+        narrator.pause(3)
+        narrator.say("Next line.")
+
+    writes, slept = _narrate("cinematic", script, skip_key)
+    # Ten characters typed, then the remaining 50 in one write
+    assert writes[:10] == list(LINE[:10])
+    assert writes[10] == f"{LINE[10:]}\n"
+    assert writes[11:] == ["Next line.\n"]
+    assert slept == pytest.approx(10 * 0.03)
+
+
+def test_prompt_ends_skipping():
+    def script(narrator):
+        narrator.skipping = True
+        rendering.get_screen().show_prompt("> ")
+        narrator.pause(1)
+
+    _, slept = _narrate("cinematic", script)
+    assert slept == pytest.approx(1)
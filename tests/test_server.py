@@ -0,0 +1,136 @@
+"""The game server plays concurrent sessions, skips narration and cleans up."""
+
+import asyncio
+
+import server
+
+TIMEOUT = 10.0  # Seconds any one step may take before the test fails
+
+
+class _Writer:
+    """Collects what a session sends, standing in for an asyncio.StreamWriter."""
+
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+async def _start(speed="instant"):
+    stats = server.ServerStats()
+    game_server = await server.serve("127.0.0.1", 0, speed, stats=stats)
+    host, port = game_server.sockets[0].getsockname()[:2]
+    return game_server, stats, host, port
+
+
+async def _stop(game_server):
+    game_server.close()
+    await game_server.wait_closed()
+
+
+async def _until_idle(stats):
+    while stats.active:
+        await asyncio.sleep(0.01)
+
+
+async def _play_to_the_end(host, port):
+    """Answers "1" to every prompt. Returns everything the server sent."""
+    reader, writer = await asyncio.open_connection(host, port)
+    received = b""
+    try:
+        while True:
+            try:
+                received += await reader.readuntil(server.GA)
+            except asyncio.IncompleteReadError as end:  # The game is over
+                return (received + end.partial).replace(server.GA, b"").decode("utf-8")
+            writer.write(b"1\r\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def test_concurrent_sessions_play_to_the_end():
+    async def scenario():
+        game_server, stats, host, port = await _start()
+        try:
+            games = await asyncio.wait_for(
+                asyncio.gather(
+                    _play_to_the_end(host, port), _play_to_the_end(host, port)
+                ),
+                TIMEOUT,
+            )
+            await asyncio.wait_for(_until_idle(stats), TIMEOUT)
+        finally:
+            await _stop(game_server)
+        return games
+
+    for output in asyncio.run(scenario()):
+        assert "VICTORY" in output or "DEFEAT" in output
+
+
+def test_line_during_narration_skips_it():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        session = server.GameSession(reader, _Writer())
+        reading = asyncio.create_task(session._read_lines())
+        playing = asyncio.create_task(session._play(["Once upon", 60.0, " a time"]))
+        await asyncio.sleep(0)  # Let the playback reach its delay
+        reader.feed_data(b"\r\n")
+        await asyncio.wait_for(playing, TIMEOUT)
+        reading.cancel()
+        return session
+
+    session = asyncio.run(scenario())
+    assert session.writer.data == b"Once upon a time"
+    assert session._lines.empty()  # The line skipped; it was not an answer
+
+
+def test_overlong_line_ends_the_session():
+    async def scenario():
+        game_server, stats, host, port = await _start()
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await asyncio.wait_for(reader.readuntil(server.GA), TIMEOUT)
+            writer.write(b"x" * (server.MAX_LINE * 2) + b"\r\n")
+            await writer.drain()
+            await asyncio.wait_for(reader.read(), TIMEOUT)  # Until it hangs up
+            writer.close()
+            await asyncio.wait_for(_until_idle(stats), TIMEOUT)
+        finally:
+            await _stop(game_server)
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_mid_game_ends_the_session():
+    async def scenario():
+        game_server, stats, host, port = await _start()
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await asyncio.wait_for(reader.readuntil(server.GA), TIMEOUT)
+            assert stats.active == 1
+            writer.close()
+            await asyncio.wait_for(_until_idle(stats), TIMEOUT)
+        finally:
+            await _stop(game_server)
+
+    asyncio.run(scenario())
+
+
+def test_load_test_reports_no_errors():
+    report = asyncio.run(server.load_test(8))
+    assert report.errors == 0
+    assert report.games == 8
+    assert report.stats.processing
+    assert len(report.stats.processing) == len(report.stats.narration)
+    assert "game code" in report.format()
@@ -0,0 +1,46 @@
+"""Seeded battles and sweeps replay exactly."""
+
+import pytest
+
+import simulation
+import starter
+
+
+def test_same_seed_same_battle():
+    first = starter.simulate_battle("Rogue", "2", "random", seed=41)
+    second = starter.simulate_battle("Rogue", "2", "random", seed=41)
+    assert first.as_dict() == second.as_dict()
+
+
+def test_seeds_give_different_battles():
+    results = {
+        repr(starter.simulate_battle("Rogue", "2", "random", seed).as_dict())
+        for seed in range(10)
+    }
+    assert len(results) > 1
+
+
+def test_derive_seed_is_stable():
+    # A sweep's seeds must not change between runs, processes or releases
+    assert starter.derive_seed(0, "Rogue", "2", 41) == starter.derive_seed(
+        0, "Rogue", "2", 41
+    )
+    assert starter.derive_seed(0, "Rogue", "2", 41) != starter.derive_seed(
+        0, "Rogue", "2", 42
+    )
+    assert starter.derive_seed(7, "Warrior", "1", 0) == 11428968393398888380
+
+
+@pytest.mark.parametrize("boss", ["hydra", "lich"])
+def test_replay_matches_sweep(boss):
+    swept = simulation.run_chunk("Warrior", "1", "greedy", 3, 0, 5, boss)
+    replayed = simulation.ComboStats("Warrior", "1", boss)
+    for index in range(5):
+        replayed.add(simulation.replay_battle(3, "Warrior", "1", index, "greedy", boss))
+    assert replayed.as_dict() == swept.as_dict()
+
+
+def test_replay_rejects_all_bosses(capsys):
+    with pytest.raises(SystemExit):
+        simulation.main(["--replay", "Warrior", "1", "0", "--boss", "all"])
+    assert "--replay" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+"""The exact solver agrees with Monte Carlo simulation."""
+
+import math
+
+import pytest
+
+import solver
+import starter
+
+BATTLES = 2000
+TOLERANCE = 4.0  # Standard errors
+
+# Warrior/1 under the attack policy against the default Hydra
+HYDRA_WIN_PROBABILITY = 0.038898330985059286
+HYDRA_SECONDS = 20.0  # About 5 s on one core; generous for slow CI machines
+
+
+def test_solver_matches_monte_carlo():
+    solution = solver.solve("Barbarian", "1", "attack", prune=1e-5, boss="rat_king")
+    wins = sum(
+        starter.simulate_battle(
+            "Barbarian", "1", "attack", seed, boss="rat_king"
+        ).winner
+        == "player"
+        for seed in range(BATTLES)
+    )
+    rate = wins / BATTLES
+    error = TOLERANCE * math.sqrt(rate * (1 - rate) / BATTLES)
+    # Pruning makes the answer a range: win_probability <= exact <= upper bound
+    assert solution.win_probability - error <= rate
+    assert rate <= solution.win_upper_bound + error
+
+
+def test_solver_rejects_other_speeds():
+    fast = starter.boss_behavior("hydra").variant(speed=150)
+    with pytest.raises(ValueError):
+        solver.BattleSolver("Warrior", "1", "attack", boss=fast)
+
+
+def test_solver_rejects_speed_effects():
+    model = solver.BattleSolver("Warrior", "1", "attack")
+    starter.apply_status(model.boss, "slowed", 2, magnitude=40)
+    with pytest.raises(ValueError):
+        model._key(solver.PLAYER_PHASE)
+
+
+def test_solver_solves_the_hydra_exactly_in_seconds():
+    solution = solver.solve("Warrior", "1", "attack")
+    assert solution.win_probability == pytest.approx(HYDRA_WIN_PROBABILITY, abs=1e-12)
+    assert solution.win_upper_bound == solution.win_probability
+    assert solution.seconds < HYDRA_SECONDS
@@ -0,0 +1,122 @@
+"""Each status effect ticks, stacks, refreshes and expires as registered."""
+
+import pytest
+
+from evil_wizard import engine
+
+TURNS = 3
+MAGNITUDE = 4
+
+# name -> (HP lost per tick, stat it changes while active, by how much,
+# refreshes on re-application, skips the turn)
+EXPECTED = {
+    "poison": (5, None, 0, False, False),
+    "burning": (4, None, 0, False, False),
+    "stunned": (0, None, 0, True, True),
+    "cursed": (0, "attack", -MAGNITUDE, False, False),
+    "intimidated": (0, "attack", -MAGNITUDE, False, False),
+    "entangled": (0, None, 0, True, False),
+    "frozen": (0, "attack", -MAGNITUDE, False, False),
+    "hasted": (0, "speed", MAGNITUDE, False, False),
+    "slowed": (0, "speed", -MAGNITUDE, False, False),
+}
+
+
+def _target():
+    boss = engine.create_boss(kind="hydra")
+    events = []
+    engine.add_listener(
+        boss, lambda character, event, code, value, critical: events.append(event)
+    )
+    return boss, events
+
+
+def test_every_effect_is_covered():
+    assert set(EXPECTED) == set(engine.STATUS_EFFECTS)
+
+
+@pytest.mark.parametrize("name", list(EXPECTED))
+def test_effect_ticks_then_expires(name):
+    damage, stat, change, _, skips = EXPECTED[name]
+    boss, events = _target()
+    base = {"attack": boss.attack, "speed": boss.speed}
+    with engine.headless():
+        assert engine.apply_status(boss, name, TURNS, MAGNITUDE)
+        if stat:
+            assert getattr(boss, stat) == base[stat] + change
+        for turn in range(1, TURNS + 1):
+            hp = boss.hp
+            assert engine.process_status_effects(boss) is skips
+            assert boss.hp == hp - damage
+            if turn < TURNS:
+                assert boss.status_effects[name].turns == TURNS - turn
+                if stat:
+                    assert getattr(boss, stat) == base[stat] + change
+        assert name not in boss.status_effects
+        assert engine.process_status_effects(boss) is False
+    assert {"attack": boss.attack, "speed": boss.speed} == base
+    assert events == (
+        [engine.EVENT_EFFECT_APPLIED]
+        + [engine.EVENT_EFFECT_TICK] * (TURNS - 1)
+        + [engine.EVENT_EFFECT_EXPIRED]
+    )
+
+
+@pytest.mark.parametrize("name", list(EXPECTED))
+def test_reapplying_refreshes_or_is_refused(name):
+    _, stat, change, refresh, _ = EXPECTED[name]
+    boss, events = _target()
+    base = {"attack": boss.attack, "speed": boss.speed}
+    with engine.headless():
+        engine.apply_status(boss, name, TURNS, MAGNITUDE)
+        engine.process_status_effects(boss)
+        assert engine.apply_status(boss, name, TURNS + 2, MAGNITUDE) is refresh
+    effect = boss.status_effects[name]
+    assert effect.turns == (TURNS + 2 if refresh else TURNS - 1)
+    if stat:  # Never stacks
+        assert getattr(boss, stat) == base[stat] + change
+    assert events.count(engine.EVENT_EFFECT_APPLIED) == 1 + refresh
+
+
+@pytest.mark.parametrize("name", [n for n in EXPECTED if EXPECTED[n][1]])
+def test_removing_early_restores_stats(name):
+    boss, events = _target()
+    base = {"attack": boss.attack, "speed": boss.speed}
+    with engine.headless():
+        engine.apply_status(boss, name, TURNS, MAGNITUDE)
+        assert engine.remove_status(boss, name)
+        assert not engine.remove_status(boss, name)
+    assert {"attack": boss.attack, "speed": boss.speed} == base
+    assert events[-1] == engine.EVENT_EFFECT_EXPIRED
+
+
+def test_effects_tick_in_registration_order():
+    boss, _ = _target()
+    with engine.headless():
+        for name in reversed(EXPECTED):
+            engine.apply_status(boss, name, TURNS, MAGNITUDE)
+    assert list(boss.status_effects) == list(engine.STATUS_EFFECTS)
+
+
+def test_stun_stops_later_effects_ticking():
+    boss, _ = _target()
+    with engine.headless():
+        engine.apply_status(boss, "cursed", TURNS, MAGNITUDE)  # Ticks after a stun
+        engine.apply_status(boss, "stunned", 1)
+        engine.apply_status(boss, "poison", TURNS)  # Ticks before it
+        hp = boss.hp
+        assert engine.process_status_effects(boss)
+    assert boss.hp == hp - 5
+    assert "stunned" not in boss.status_effects
+    assert boss.status_effects["poison"].turns == TURNS - 1
+    assert boss.status_effects["cursed"].turns == TURNS
+
+
+def test_ticks_never_take_hp_below_zero():
+    boss, _ = _target()
+    boss.hp = 3
+    with engine.headless():
+        engine.apply_status(boss, "poison", TURNS)
+        engine.apply_status(boss, "burning", TURNS)
+        engine.process_status_effects(boss)
+    assert boss.hp == 0
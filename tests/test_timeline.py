@@ -0,0 +1,54 @@
+"""The one-on-one fast path hands over to the Timeline it stands in for."""
+
+import pytest
+
+from evil_wizard import engine
+
+
+def _queue(timeline):
+    return sorted(
+        (entry[0], entry[3].name) for entry in timeline._heap if entry[3] is not None
+    )
+
+
+@pytest.mark.parametrize("acting", ["player", "boss"])
+@pytest.mark.parametrize("shifted", ["player", "boss"])
+def test_handoff_matches_the_timeline(acting, shifted):
+    rounds = 4
+    player = engine.create_player("Warrior", weapon_key="1")
+    boss = engine.create_boss(kind="hydra")
+    expected = engine.Timeline((player, boss))
+    for _ in range(rounds - 1):
+        for actor in (player, boss):
+            assert expected.pop() is actor
+            expected.done(actor)
+    assert expected.pop() is player
+    if acting == "boss":
+        expected.done(player)
+        assert expected.pop() is boss
+    ticks = -engine.TURN_TICKS // 3
+    expected.shift({"player": player, "boss": boss}[shifted], ticks)
+
+    player = engine.create_player("Warrior", weapon_key="1")
+    boss = engine.create_boss(kind="hydra")
+    alternation = engine._Alternation(player, boss)
+    alternation.round = rounds
+    combatants = {"player": player, "boss": boss}
+    alternation.actor = combatants[acting]
+    engine.delay_actor(combatants[shifted], ticks)
+    timeline = alternation.timeline
+
+    assert (timeline.now, timeline.round) == (expected.now, expected.round)
+    assert _queue(timeline) == _queue(expected)
+    assert player.timeline is boss.timeline is timeline
+
+
+def test_fast_path_hands_over_when_a_speed_changes():
+    # Skeletons haste themselves, so some of these battles leave the fast path
+    behavior = engine.minion_behavior("skeleton").variant(hp=250, attack=12)
+    handed_over = 0
+    for seed in range(40):
+        result = engine.simulate_battle("Mage", "1", "attack", seed, boss=behavior)
+        assert result.winner in ("player", "boss")
+        handed_over += result.effects_applied.get("hasted", 0) > 0
+    assert handed_over